@@ -1,27 +1,85 @@
+import threading
+from collections import Counter
+
 import streamlit as st
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import select, text
+from db.schemas import Job, JobProfile
 from scraper.settings import settings
+from scraper.pipeline import facets
+from scraper.pipeline.filters import filter_clauses
+from scraper.pipeline.history import weekly_additions
+from scraper.pipeline.storage import make_engine
+from scraper.pipeline.audiences import FILTER_PROFILES, TARGET_FILTERS
 
 
 st.set_page_config(page_title="Internship Finder (CS/AI/ML)", layout="wide")
 st.title("🎓 Internship Finder – France startups & tech")
 
 
-engine = create_engine(settings.DB_URL, future=True)
+@st.cache_resource
+def _engine():
+    # Read-only; on SQLite (WAL) it reads alongside a running scrape without blocking it
+    return make_engine(settings.DB_URL, readonly=True)
+
+
+engine = _engine()
+
+
+@st.cache_resource
+def _ranker():
+    # Shared by every session and updated in place: updates and scoring hold the lock
+    from scraper.pipeline.ranking import RankingIndex
+    return RankingIndex.load() or RankingIndex(), threading.Lock()
 
 
 # Sidebar filters
 q = st.sidebar.text_input("Keyword (title/desc)")
 loc = st.sidebar.text_input("Location contains")
 source = st.sidebar.multiselect("Sources", ["greenhouse","lever","ashby"], default=["greenhouse","lever","ashby"])
-sort = st.sidebar.selectbox("Sort by", ["Newest scraped","Title A-Z"])
+sort = st.sidebar.selectbox("Sort by", ["Newest scraped","Title A-Z","Relevance"])
+skills = st.sidebar.text_area("Your profile (skills, keywords)") if sort == "Relevance" else ""
 
 
 with engine.connect() as conn:
-    rows = conn.execute(text("SELECT id, source, title, company, location, apply_url, tags, posted_at, scraped_at FROM jobs"))
-    data = [dict(r._mapping) for r in rows]
+    country_options = [r[0] for r in conn.execute(text(
+        "SELECT DISTINCT country_code FROM jobs WHERE country_code IS NOT NULL ORDER BY country_code"
+    ))]
+countries = st.sidebar.multiselect("Country", country_options)
+remote_only = st.sidebar.checkbox("Remote only")
+
+
+# Audience filters run on precomputed, indexed columns (every posting is stored)
+st.sidebar.subheader("Audience")
+profile = st.sidebar.selectbox("Profile", ["(custom)", *FILTER_PROFILES])
+if profile == "(custom)":
+    audience = {
+        key: st.sidebar.checkbox(label, value=TARGET_FILTERS[key])
+        for key, label in [
+            ("intern_only", "Internships only"),
+            ("cs_only", "CS / AI / ML / Data only"),
+            ("france_only", "France only"),
+            ("lang_fr_en_only", "French / English only"),
+        ]
+    }
+    where = filter_clauses(audience)
+else:
+    # Memberships were computed at ingest (job_profiles, see pipeline/profiles.py)
+    where = [Job.id.in_(select(JobProfile.job_id).where(JobProfile.profile == profile))]
+
+# Country/remote are parsed at ingest (indexed columns) → filter in SQL
+if countries:
+    where.append(Job.country_code.in_(countries))
+if remote_only:
+    where.append(Job.is_remote.is_(True))
+stmt = select(
+    Job.id, Job.source, Job.title, Job.company, Job.location, Job.country_code, Job.is_remote,
+    Job.apply_url, Job.tags, Job.posted_at, Job.scraped_at,
+).where(*where)
 
+with engine.connect() as conn:
+    rows = conn.execute(stmt)
+    data = [dict(r._mapping) for r in rows]
 
 df = pd.DataFrame(data)
 
@@ -37,7 +95,44 @@ if not df.empty:
         df = df[df["source"].isin(source)]
 
 
-if sort == "Title A-Z":
+# Tag filter and counts from the facet bitsets (pipeline/facets.py), among the results so far.
+# The index is refreshed by the scraper (facets.refresh) and scripts/build_facet_index.py;
+# postings stored since (ids above its max id) are matched on their tags column instead
+if not df.empty:
+    facet_index = facets.FacetIndex.open()
+    if facet_index is None:
+        st.sidebar.info("Tag filters are faster with the facet index: run `python scripts/build_facet_index.py`.")
+    row_tags = df["tags"].fillna("").str.split(",").map(lambda ts: {t for t in ts if t})
+    fresh = df["id"] > (facet_index.max_id if facet_index is not None else 0)
+    tag_counts = Counter(t for ts in row_tags[fresh] for t in ts)
+    if facet_index is not None:
+        within = facets.from_ids(df.loc[~fresh, "id"])
+        tag_counts.update(facet_index.counts("tag", within))
+    tag_counts = dict(sorted(tag_counts.items(), key=lambda kv: (-kv[1], kv[0])))
+    tags = st.sidebar.multiselect("Tags (any of)", list(tag_counts), format_func=lambda t: f"{t} ({tag_counts[t]})")
+    if tags:
+        keep = fresh & row_tags.map(lambda ts: not ts.isdisjoint(tags))
+        if facet_index is not None:
+            keep |= df["id"].isin(facets.to_ids(facet_index.match({"tag": tags}) & within))
+        df = df[keep]
+
+
+ranker = None
+if sort == "Relevance" and skills.strip() and not df.empty:
+    try:
+        ranker, ranker_lock = _ranker()
+    except RuntimeError as e:  # numpy/scipy not installed
+        st.warning(f"Relevance sort is unavailable: {e}")
+
+if ranker is not None:
+    # TF-IDF cosine of every posting with the profile (pipeline/ranking.py), index kept up to date here
+    with ranker_lock:
+        with engine.connect() as conn:
+            if any(ranker.update(conn)):
+                ranker.save()
+        relevance = ranker.scores_for(skills, df["id"].to_numpy())
+    df = df.assign(relevance=relevance).sort_values("relevance", ascending=False)
+elif sort == "Title A-Z":
     df = df.sort_values("title", ascending=True)
 else:
     df = df.sort_values("scraped_at", ascending=False)
@@ -52,6 +147,8 @@ for _, row in df.iterrows():
         cols = st.columns([5,3,2,2])
         with cols[0]:
             st.markdown(f"**{row['title']}**")
+            if "relevance" in row:
+                st.caption(f"Relevance {row['relevance']:.2f}")
             if row.get("company"):
                 st.write(row["company"])
             if row.get("tags"):
@@ -66,4 +163,13 @@ for _, row in df.iterrows():
 
 
 st.divider()
+with st.expander("New postings per week (from the job_versions log)"):
+    with engine.connect() as conn:
+        added = pd.DataFrame(weekly_additions(conn))
+    if added.empty:
+        st.write("No history yet.")
+    else:
+        st.bar_chart(added.pivot(index="week", columns="source", values="added").fillna(0))
+
+
 st.info("Tip: Add more companies/adapters in `scraper/pipeline/orchestrator.py` → SOURCES list, then re-run the scraper.")
\ No newline at end of file
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Integer, Text, UniqueConstraint
+from sqlalchemy import Column, String, Boolean, DateTime, Float, Integer, Text, UniqueConstraint, Index, ForeignKey
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from db.base import Base
 
@@ -19,6 +20,161 @@ class Job(Base):
     scraped_at = Column(DateTime(timezone=True), server_default=func.now())
     language = Column(String(10), nullable=True)
     tags = Column(Text, nullable=True)  # comma-separated
+    # Precomputed classification (scraper/pipeline/normalize.classify) → filters are WHERE clauses
+    internship_score = Column(Integer, nullable=True)
+    cs_mask = Column(Integer, nullable=True)  # bit per CS bucket (normalize.CS_BUCKET_BITS)
+    cs_score = Column(Integer, nullable=True)
+    is_france = Column(Boolean, nullable=True)
+    # Change tracking (scraper/pipeline/history.py): hash of the source content, last run that saw it
+    content_hash = Column(String(40), nullable=True)
+    last_seen_at = Column(DateTime(timezone=True), nullable=True)
+    # Board that last listed it (pipeline/probes.board_key): unchanged boards bump only their own
+    board = Column(String(200), nullable=True)
+    # Filter profiles it belongs to, comma-separated; mirrors job_profiles so an upsert only
+    # touches that table when they change (NULL: stored before it was kept)
+    profiles = Column(Text, nullable=True)
+    # storage.change_seq of the last write that changed it (pipeline/facets.py reads
+    # changes since the one it last saw); NULL: not written since the column was added
+    change_seq = Column(Integer, nullable=True)
     __table_args__ = (
         UniqueConstraint("source", "source_job_id", name="uq_source_jobid"),
+        Index("ix_jobs_country_remote", "country_code", "is_remote"),
+        Index("ix_jobs_scores", "internship_score", "cs_score", "is_france"),
+        Index("ix_jobs_language", "language"),
+        Index("ix_jobs_board_seen", "board", "last_seen_at"),
+        Index("ix_jobs_change_seq", "change_seq"),
     )
+
+
+class JobVersion(Base):
+    """Append-only change log of `jobs`: one row per distinct content_hash a posting had."""
+    __tablename__ = "job_versions"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
+    source = Column(String(50), nullable=False)
+    kind = Column(String(10), nullable=False)  # created|changed|baseline
+    content_hash = Column(String(40), nullable=False)
+    changed_at = Column(DateTime(timezone=True), nullable=False)
+    # Snapshot of the posting as of this version
+    title = Column(String(300), nullable=False)
+    company = Column(String(200), nullable=True)
+    location = Column(String(200), nullable=True)
+    apply_url = Column(String(1000), nullable=False)
+    description_text = Column(Text, nullable=True)
+    posted_at = Column(String(100), nullable=True)
+    tags = Column(Text, nullable=True)
+    internship_score = Column(Integer, nullable=True)
+    cs_score = Column(Integer, nullable=True)
+    is_france = Column(Boolean, nullable=True)
+    job = relationship(Job)
+    __table_args__ = (
+        Index("ix_job_versions_job", "job_id", "changed_at"),
+        Index("ix_job_versions_changed", "changed_at"),
+        Index("ix_job_versions_source", "source", "changed_at"),
+    )
+
+
+class JobProfile(Base):
+    """Membership of a posting in a named filter profile (scraper/pipeline/profiles.py)."""
+    __tablename__ = "job_profiles"
+    job_id = Column(Integer, ForeignKey("jobs.id"), primary_key=True)
+    profile = Column(String(50), primary_key=True)
+    job = relationship(Job)
+    __table_args__ = (
+        Index("ix_job_profiles_profile", "profile", "job_id"),
+    )
+
+
+class SourceSignature(Base):
+    """Change-probe signature of a board at its last full fetch (scraper/pipeline/probes.py)."""
+    __tablename__ = "source_signatures"
+    label = Column(String(200), primary_key=True)  # probes.board_key
+    signature = Column(String(40), nullable=False)
+    fetched_at = Column(DateTime(timezone=True), nullable=False)  # start of that full fetch
+    checked_at = Column(DateTime(timezone=True), nullable=True)   # last probe
+    unchanged_runs = Column(Integer, nullable=False, default=0)    # skips since fetched_at
+
+
+class ScrapeRun(Base):
+    """One board scraped by one run: outcome, yield and request timings (scraper/pipeline/health.py)."""
+    __tablename__ = "scrape_runs"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    label = Column(String(200), nullable=False)
+    source = Column(String(50), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    duration_s = Column(Float, nullable=False)
+    status = Column(String(20), nullable=False)  # ok|error|unchanged|deferred
+    seen = Column(Integer, nullable=False, default=0)
+    kept = Column(Integer, nullable=False, default=0)
+    requests = Column(Integer, nullable=False, default=0)
+    bytes = Column(Integer, nullable=True)       # when the adapter accounts for it
+    failures = Column(Integer, nullable=False, default=0)  # transport errors, 429/5xx
+    timeouts = Column(Integer, nullable=False, default=0)
+    p50_ms = Column(Float, nullable=True)
+    p99_ms = Column(Float, nullable=True)
+    hosts = Column(Text, nullable=True)          # JSON {host: {n, p50, p99, max, errors, timeouts}}
+    error = Column(Text, nullable=True)
+    http_mode = Column(String(10), nullable=True)  # HTTP_MODE of the run (NULL: recorded before it was kept)
+    __table_args__ = (
+        Index("ix_scrape_runs_label", "label", "started_at"),
+        Index("ix_scrape_runs_started", "started_at"),
+    )
+
+
+class ScrapeTask(Base):
+    """One SOURCES entry queued for a worker (see scraper/pipeline/workqueue.py)."""
+    __tablename__ = "scrape_tasks"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    batch_id = Column(String(40), nullable=False)
+    label = Column(String(200), nullable=False)
+    config = Column(Text, nullable=False)  # JSON-encoded SOURCES entry
+    status = Column(String(20), nullable=False, default="pending")  # pending|leased|done|failed
+    attempts = Column(Integer, nullable=False, default=0)
+    worker_id = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    seen = Column(Integer, nullable=False, default=0)
+    kept = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    enqueued_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    __table_args__ = (
+        Index("ix_scrape_tasks_claim", "status", "lease_expires_at"),
+        Index("ix_scrape_tasks_batch", "batch_id", "status"),
+    )
+
+
+class SavedSearch(Base):
+    """A query new postings are matched against as they are stored (scraper/pipeline/alerts.py)."""
+    __tablename__ = "saved_searches"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(100), nullable=False, unique=True)
+    keywords = Column(Text, nullable=True)   # comma-separated phrases, all required (title/description)
+    tags = Column(Text, nullable=True)       # comma-separated, any of
+    location = Column(Text, nullable=True)   # comma-separated phrases, any of
+    sources = Column(Text, nullable=True)    # comma-separated, any of
+    profile = Column(String(50), nullable=True)  # FILTER_PROFILES name the posting must belong to
+    active = Column(Boolean, nullable=False, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class AlertOutbox(Base):
+    """A new posting that matched a saved search, until written to ALERTS_OUTBOX_PATH."""
+    __tablename__ = "alert_outbox"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    search_id = Column(Integer, ForeignKey("saved_searches.id"), nullable=False)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    delivered_at = Column(DateTime(timezone=True), nullable=True)
+    search = relationship(SavedSearch)
+    job = relationship(Job)
+    __table_args__ = (
+        UniqueConstraint("search_id", "job_id", name="uq_alert_search_job"),
+        Index("ix_alert_outbox_pending", "delivered_at", "id"),
+    )
+
+
+class Counter(Base):
+    """Named counters handed out in commit order (storage.change_seq)."""
+    __tablename__ = "counters"
+    name = Column(String(50), primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
@@ -1,14 +1,12 @@
-from typing import Iterable, Optional
-import json
+from typing import AsyncIterator, Optional
 from urllib.parse import urljoin
-from bs4 import BeautifulSoup
 
-from scraper.adapters.base import BaseAdapter
-from scraper.client.http import get_client
-from scraper.models.job import JobModel
-from scraper.pipeline.normalize import normalize_tags
+from scraper.adapters.base import AsyncBaseAdapter
+from scraper.adapters.extract import find_next_data, iter_job_anchors, iter_ldjson, parse_html
+from scraper.client.http import get_async_client
+from scraper.models.record import JobRecord
 
-class AshbyAdapter(BaseAdapter):
+class AshbyAdapter(AsyncBaseAdapter):
     """
     Robust Ashby adapter:
       1) Parse __NEXT_DATA__ JSON to enumerate jobs (preferred)
@@ -22,11 +20,10 @@ class AshbyAdapter(BaseAdapter):
         self.base = f"https://jobs.ashbyhq.com/{org_slug}"
         self.company = company
 
-    def _from_next_data(self, soup: BeautifulSoup):
-        script = soup.find("script", id="__NEXT_DATA__", type="application/json")
-        if not script or not script.string:
+    def _from_next_data(self, html: str):
+        data = find_next_data(html)
+        if not data:
             return []
-        data = json.loads(script.string)
         # common paths observed; keep defensive
         jobs = []
         try:
@@ -42,27 +39,23 @@ class AshbyAdapter(BaseAdapter):
             pass
         return jobs
 
-    def _from_ldjson(self, soup: BeautifulSoup):
+    def _from_ldjson(self, html: str):
         jobs = []
-        for tag in soup.find_all("script", type="application/ld+json"):
-            try:
-                obj = json.loads(tag.string or "{}")
-            except Exception:
-                continue
+        for obj in iter_ldjson(html):
             if isinstance(obj, dict) and obj.get("@type") == "JobPosting":
                 jobs.append(obj)
             elif isinstance(obj, list):
                 jobs.extend([o for o in obj if isinstance(o, dict) and o.get("@type") == "JobPosting"])
         return jobs
 
-    def discover(self) -> Iterable[JobModel]:
-        with get_client() as client:
-            r = client.get(self.base)
+    async def adiscover(self) -> AsyncIterator[JobRecord]:
+        async with get_async_client() as client:
+            r = await client.get(self.base)
             r.raise_for_status()
-            soup = BeautifulSoup(r.text, "lxml")
+            html = r.text
 
         # Strategy 1: __NEXT_DATA__
-        jobs = self._from_next_data(soup)
+        jobs = self._from_next_data(html)
         if jobs:
             for j in jobs:
                 title = (j.get("title") or j.get("name") or "").strip()
@@ -70,7 +63,7 @@ class AshbyAdapter(BaseAdapter):
                 url = j.get("jobUrl") or j.get("absoluteUrl") or urljoin(self.base, j.get("canonicalPath") or "")
                 desc = j.get("description") or j.get("descriptionText") or ""
                 jid = j.get("id") or j.get("slug")
-                yield JobModel(
+                job = self.make_job(
                     source=self.source_name,
                     source_job_id=str(jid) if jid else None,
                     title=title,
@@ -79,12 +72,13 @@ class AshbyAdapter(BaseAdapter):
                     apply_url=url or self.base,
                     description_text=desc,
                     posted_at=j.get("publishedAt") or j.get("createdAt"),
-                    tags=normalize_tags(title, desc),
                 )
+                if job is not None:
+                    yield job
             return
 
         # Strategy 2: LD+JSON
-        ld = self._from_ldjson(soup)
+        ld = self._from_ldjson(html)
         if ld:
             for j in ld:
                 title = (j.get("title") or "").strip()
@@ -100,7 +94,7 @@ class AshbyAdapter(BaseAdapter):
                 url = j.get("hiringOrganization", {}).get("sameAs") or j.get("url") or self.base
                 desc = j.get("description") or ""
                 jid = j.get("identifier", {}).get("value") if isinstance(j.get("identifier"), dict) else None
-                yield JobModel(
+                job = self.make_job(
                     source=self.source_name,
                     source_job_id=str(jid) if jid else None,
                     title=title,
@@ -109,22 +103,14 @@ class AshbyAdapter(BaseAdapter):
                     apply_url=url,
                     description_text=desc,
                     posted_at=j.get("datePosted") or j.get("validThrough"),
-                    tags=normalize_tags(title, desc),
                 )
+                if job is not None:
+                    yield job
             return
 
         # Strategy 3: anchor fallback
-        seen = set()
-        for a in soup.select("a[href*='/jobs/'], a[href*='/job/']"):
-            href = a.get("href", "")
-            title = a.get_text(strip=True)
-            if len(title) < 3:
-                continue
-            job_url = urljoin(self.base, href)
-            if job_url in seen:
-                continue
-            seen.add(job_url)
-            yield JobModel(
+        for job_url, title in iter_job_anchors(parse_html(html), self.base, include_singular=True):
+            job = self.make_job(
                 source=self.source_name,
                 source_job_id=None,
                 title=title,
@@ -133,5 +119,6 @@ class AshbyAdapter(BaseAdapter):
                 apply_url=job_url,
                 description_text=None,
                 posted_at=None,
-                tags=normalize_tags(title, None),
             )
+            if job is not None:
+                yield job
@@ -1,11 +1,10 @@
-from typing import Iterable, Optional
+from typing import AsyncIterator, Optional
 from urllib.parse import urljoin
-from scraper.adapters.base import BaseAdapter
-from scraper.client.http import get_client
-from scraper.models.job import JobModel
-from scraper.pipeline.normalize import normalize_tags
+from scraper.adapters.base import AsyncBaseAdapter
+from scraper.client.http import get_async_client
+from scraper.models.record import JobRecord
 
-class BambooHRAdapter(BaseAdapter):
+class BambooHRAdapter(AsyncBaseAdapter):
     """
     BambooHR public careers list JSON:
     https://<company>.bamboohr.com/careers/list
@@ -17,9 +16,9 @@ class BambooHRAdapter(BaseAdapter):
         self.base = f"https://{company_slug}.bamboohr.com/careers/"
         self.company = company
 
-    def discover(self) -> Iterable[JobModel]:
-        with get_client() as client:
-            r = client.get(urljoin(self.base, "list"), headers={"Accept": "application/json"})
+    async def adiscover(self) -> AsyncIterator[JobRecord]:
+        async with get_async_client() as client:
+            r = await client.get(urljoin(self.base, "list"), headers={"Accept": "application/json"})
             r.raise_for_status()
             data = r.json() or {}
         positions = data.get("positions") or data.get("result") or []
@@ -32,7 +31,7 @@ class BambooHRAdapter(BaseAdapter):
             pid = p.get("jobOpeningId") or p.get("id")
             desc = p.get("jobDescription") or p.get("description")
 
-            yield JobModel(
+            job = self.make_job(
                 source=self.source_name,
                 source_job_id=str(pid) if pid else None,
                 title=title,
@@ -41,5 +40,6 @@ class BambooHRAdapter(BaseAdapter):
                 apply_url=apply_url,
                 description_text=desc,
                 posted_at=p.get("dateOpening") or p.get("postedOn"),
-                tags=normalize_tags(title, desc or ""),
             )
+            if job is not None:
+                yield job
@@ -1,8 +1,103 @@
-from typing import Iterable
-from scraper.models.job import JobModel
+import asyncio
+import hashlib
+import json
+from typing import AsyncIterator, Iterable, Iterator, Optional
+from scraper.models.record import JobRecord, make_record
 
 
 class BaseAdapter:
     source_name: str
-    def discover(self) -> Iterable[JobModel]:
-        raise NotImplementedError
\ No newline at end of file
+    invalid = 0  # postings make_job rejected in this adapter's runs
+
+    def discover(self) -> Iterable[JobRecord]:
+        raise NotImplementedError
+
+    def make_job(self, **fields) -> Optional[JobRecord]:
+        """
+        Build a posting from JobModel-style keyword arguments (see models/record.py).
+        One that fails validation (no title, no absolute apply URL, ...) is logged,
+        counted in `self.invalid` and None is returned: adapters skip it and go on with
+        the board instead of losing the postings after it.
+        """
+        try:
+            return make_record(**fields)
+        except ValueError as e:  # pydantic's ValidationError included
+            self.invalid += 1
+            print(f"[skip] {self.source_name} posting: {e}")
+            return None
+
+    def probe(self) -> Optional[str]:
+        """
+        Cheap change signature of the board (see pipeline/probes.py), or None when the
+        adapter has no probe. Equal signatures mean the full fetch can be skipped.
+        """
+        return None
+
+
+class AsyncBaseAdapter(BaseAdapter):
+    """
+    Adapter whose I/O is async: implement `adiscover()` as an async generator, using
+    client.http.get_async_client(), so requests inside one board can overlap (pages,
+    detail calls, racing fallback endpoints). `discover()` stays the sync entry point
+    for the orchestrator / work queue and steps the generator on a private event loop,
+    so postings still stream out one by one.
+    """
+
+    async def adiscover(self) -> AsyncIterator[JobRecord]:
+        raise NotImplementedError
+        yield
+
+    def discover(self) -> Iterator[JobRecord]:
+        return iter_sync(self.adiscover())
+
+    async def aprobe(self) -> Optional[str]:
+        return None
+
+    def probe(self) -> Optional[str]:
+        return run_sync(self.aprobe())
+
+    # Optional network accounting, reported by the orchestrator when `self.stats` is set
+    @staticmethod
+    def new_stats() -> dict:
+        return {"requests": 0, "bytes": 0, "seconds": 0.0}
+
+    def count_response(self, r) -> None:
+        self.stats["requests"] += 1
+        # wire bytes (compressed); transports that don't stream (replay, mocks) report 0
+        # downloaded bytes, so count the decoded body instead
+        self.stats["bytes"] += r.num_bytes_downloaded or len(r.content)
+
+
+def board_signature(*parts) -> str:
+    """Stable digest of whatever a probe read (counts, ids, update markers)."""
+    blob = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def run_sync(coro):
+    """Run one coroutine to completion on a private event loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+def iter_sync(agen: AsyncIterator) -> Iterator:
+    """Drive an async iterator from synchronous code (must not be called from a running loop)."""
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(agen.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        try:
+            aclose = getattr(agen, "aclose", None)
+            if aclose is not None:
+                loop.run_until_complete(aclose())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
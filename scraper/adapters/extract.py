@@ -0,0 +1,122 @@
+# scraper/adapters/extract.py
+"""
+Lightweight HTML extraction shared by the HTML-backed adapters.
+
+The career pages we scrape are mostly a single JSON blob (`__NEXT_DATA__`, LD+JSON)
+or a list of job anchors. Building a full BeautifulSoup tree for that is wasteful, so:
+  - script blobs are located by scanning the raw text with precompiled regexes and
+    only that slice is handed to `json.loads` (no tree at all),
+  - anchors are collected with precompiled XPath over an `lxml.html` tree.
+See scripts/bench_html_parse.py for the comparison with the BeautifulSoup path.
+"""
+import json
+import re
+from typing import Any, Iterable, Iterator, Optional
+from urllib.parse import urljoin
+
+import lxml.html
+from lxml import etree
+
+# ---------------------------
+# Script blobs (no tree)
+# ---------------------------
+
+# Opening tag of <script id="__NEXT_DATA__" ...>, attributes in any order
+_NEXT_DATA_OPEN_RE = re.compile(
+    r"<script\b[^>]*\bid\s*=\s*[\"']__NEXT_DATA__[\"'][^>]*>", re.I
+)
+_LDJSON_RE = re.compile(
+    r"<script\b[^>]*\btype\s*=\s*[\"']application/ld\+json[\"'][^>]*>(.*?)</script\s*>",
+    re.I | re.S,
+)
+_SCRIPT_CLOSE_RE = re.compile(r"</script\s*>", re.I)
+
+
+def find_next_data(html: str) -> Optional[dict]:
+    """Return the decoded `__NEXT_DATA__` JSON, or None when absent/invalid."""
+    m = _NEXT_DATA_OPEN_RE.search(html)
+    if not m:
+        return None
+    end = _SCRIPT_CLOSE_RE.search(html, m.end())
+    if not end:
+        return None
+    try:
+        data = json.loads(html[m.end():end.start()])
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def iter_ldjson(html: str) -> Iterator[Any]:
+    """Yield every decodable `application/ld+json` payload in document order."""
+    for m in _LDJSON_RE.finditer(html):
+        try:
+            yield json.loads(m.group(1) or "{}")
+        except ValueError:
+            continue
+
+# ---------------------------
+# Anchors & page text (lxml + XPath)
+# ---------------------------
+
+_JOBS_ANCHORS = etree.XPath("//a[contains(@href, '/jobs/')]")
+_JOB_OR_JOBS_ANCHORS = etree.XPath("//a[contains(@href, '/jobs/') or contains(@href, '/job/')]")
+
+_META_DESCRIPTION = etree.XPath(
+    "//meta[@name='description' or @property='og:description']/@content"
+)
+_MAIN_CONTENT = etree.XPath("//main | //article | //*[@role='main']")
+_NOISE = etree.XPath("//script | //style | //noscript | //nav | //header | //footer")
+
+
+def parse_html(html: str):
+    """Parse a page into an lxml element tree (much cheaper than a soup)."""
+    return lxml.html.document_fromstring(html)
+
+
+def _anchor_text(a) -> str:
+    # Same result as BeautifulSoup's get_text(strip=True): stripped pieces, no separator
+    return "".join(piece.strip() for piece in a.itertext())
+
+
+def iter_job_anchors(doc, base_url: str, include_singular: bool = False) -> Iterable[tuple[str, str]]:
+    """
+    Yield (absolute_url, title) for job links, de-duplicated on URL.
+    Links with fewer than 3 characters of text are skipped (icons, "→", ...).
+    """
+    xpath = _JOB_OR_JOBS_ANCHORS if include_singular else _JOBS_ANCHORS
+    seen = set()
+    for a in xpath(doc):
+        title = _anchor_text(a)
+        if len(title) < 3:
+            continue
+        url = urljoin(base_url, a.get("href", ""))
+        if url in seen:
+            continue
+        seen.add(url)
+        yield url, title
+
+
+def html_to_text(fragment: str) -> str:
+    """Flatten an HTML fragment (e.g. an LD+JSON description) to whitespace-normalized text."""
+    if not fragment or "<" not in fragment:
+        return " ".join((fragment or "").split())
+    try:
+        root = lxml.html.fragment_fromstring(fragment, create_parent="div")
+    except (etree.ParserError, ValueError):
+        return " ".join(fragment.split())
+    return " ".join(" ".join(root.itertext()).split())
+
+
+def page_text(doc, max_chars: int = 20000) -> Optional[str]:
+    """Readable text of a detail page: <main>/<article> when present, else <body>, minus chrome."""
+    for node in _NOISE(doc):
+        node.drop_tree()
+    nodes = _MAIN_CONTENT(doc) or [doc.body if doc.find("body") is not None else doc]
+    text = " ".join(" ".join(" ".join(n.itertext()) for n in nodes).split())
+    return text[:max_chars] or None
+
+
+def meta_description(doc) -> Optional[str]:
+    hits = _META_DESCRIPTION(doc)
+    return (hits[0].strip() or None) if hits else None
@@ -0,0 +1,212 @@
+import asyncio
+from typing import Any, AsyncIterator, Optional
+from urllib.parse import urlencode, urljoin, urlsplit, urlunsplit, parse_qsl
+import json
+
+import httpx
+from lxml import etree
+from pydantic import ValidationError
+
+from scraper.adapters.base import AsyncBaseAdapter
+from scraper.adapters.extract import parse_html
+from scraper.client.http import get_async_client
+from scraper.models.job import JobModel
+from scraper.models.record import JobRecord, as_record
+from scraper.settings import settings
+
+
+FIELDS = ("title", "url", "location", "description", "posted_at", "id")
+
+
+class ExtractionPlan:
+    """
+    A selector config compiled once: XPath objects for the item and each field,
+    plus the pagination rule. Plans are cached per config (see `compile_plan`), so
+    every page of every run of the same board reuses the compiled selectors.
+    """
+
+    def __init__(self, config: dict):
+        self.list_urls: list[str] = list(config.get("list_urls") or [])
+        if not self.list_urls:
+            raise ValueError("generic_html config needs at least one entry in 'list_urls'")
+        fields = config.get("fields") or {}
+        if "title" not in fields or "url" not in fields:
+            raise ValueError("generic_html config needs 'title' and 'url' field selectors")
+
+        self.item = etree.XPath(config["item"])
+        self.fields: dict[str, etree.XPath] = {
+            name: etree.XPath(expr) for name, expr in fields.items() if name in FIELDS and expr
+        }
+
+        pag = config.get("pagination") or {}
+        self.page_param: Optional[str] = pag.get("param")
+        self.page_start: int = int(pag.get("start", 1))
+        self.next_xpath: Optional[etree.XPath] = etree.XPath(pag["next"]) if pag.get("next") else None
+        self.max_pages: int = int(pag.get("max_pages", 1 if not pag else 10))
+
+    # ---------- extraction ----------
+    @staticmethod
+    def _value(result: Any) -> Optional[str]:
+        """First XPath hit as text (elements are flattened, attributes/strings kept)."""
+        if isinstance(result, list):
+            if not result:
+                return None
+            result = result[0]
+        if result is None:
+            return None
+        if isinstance(result, bool):  # boolean(...), comparisons
+            return "true" if result else "false"
+        if isinstance(result, float):  # count(...), number(...)
+            return None if result != result else str(int(result)) if result.is_integer() else str(result)
+        if isinstance(result, str):  # attribute values, text() and string() results
+            text = str(result)
+        else:
+            text = " ".join(" ".join(result.itertext()).split())
+        return text.strip() or None
+
+    def extract(self, doc) -> list[dict[str, Optional[str]]]:
+        return [
+            {name: self._value(xp(node)) for name, xp in self.fields.items()}
+            for node in self.item(doc)
+        ]
+
+    def next_url(self, doc, page_url: str) -> Optional[str]:
+        if self.next_xpath is None:
+            return None
+        href = self._value(self.next_xpath(doc))
+        return urljoin(page_url, href) if href else None
+
+    def page_url(self, list_url: str, page: int) -> str:
+        """URL of page number `page` for query-parameter pagination."""
+        parts = urlsplit(list_url)
+        query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != self.page_param]
+        query.append((self.page_param, str(page)))
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+_PLANS: dict[str, ExtractionPlan] = {}
+
+
+def compile_plan(config: dict) -> ExtractionPlan:
+    key = json.dumps(config, sort_keys=True)
+    plan = _PLANS.get(key)
+    if plan is None:
+        plan = _PLANS[key] = ExtractionPlan(config)
+    return plan
+
+
+class GenericHTMLAdapter(AsyncBaseAdapter):
+    """
+    Config-driven adapter for small custom careers pages.
+
+    SOURCES entry:
+        {"type": "generic_html", "slug": "acme", "company": "Acme", "config": {
+            "list_urls": ["https://acme.com/careers"],
+            "item": "//li[contains(@class, 'job')]",
+            "fields": {                                   # XPath, relative to the item
+                "title": ".//h3", "url": ".//a/@href",    # required
+                "location": ".//*[@class='location']",    # optional: description, posted_at, id
+            },
+            # optional, either numbered pages ...
+            "pagination": {"param": "page", "start": 1, "max_pages": 5},
+            # ... or a "next" link: {"next": "//a[@rel='next']/@href", "max_pages": 10}
+        }}
+
+    Numbered pages are fetched concurrently (GENERIC_HTML_CONCURRENCY at a time) until a
+    page comes back empty or with no posting URL not seen on an earlier page; "next" chains are followed per list URL, list URLs in parallel.
+    Postings missing a title/URL or failing JobModel validation are skipped and counted in
+    `self.invalid`.
+    """
+    source_name = "generic_html"
+
+    def __init__(self, slug: str, config: dict, company: Optional[str] = None):
+        self.slug = slug
+        self.company = company
+        self.plan = compile_plan(config)
+        self.concurrency = max(1, settings.GENERIC_HTML_CONCURRENCY)
+        self.invalid = 0
+
+    # ---------- fetching ----------
+    async def _fetch(self, client: httpx.AsyncClient, url: str):
+        r = await client.get(url)
+        if r.status_code == 404:
+            return None
+        r.raise_for_status()
+        return parse_html(r.text) if r.text.strip() else None
+
+    async def _pages_numbered(self, client: httpx.AsyncClient, list_url: str):
+        plan = self.plan
+        end = plan.page_start + plan.max_pages
+        page = plan.page_start
+        seen: set[str] = set()
+        while page < end:
+            window = [plan.page_url(list_url, n) for n in range(page, min(page + self.concurrency, end))]
+            docs = await asyncio.gather(*(self._fetch(client, u) for u in window))
+            for url, doc in zip(window, docs):
+                rows = plan.extract(doc) if doc is not None else []
+                links = {urljoin(url, r["url"]) for r in rows if r.get("url")}
+                if not rows or links <= seen:
+                    return  # empty, or the server ignores the page parameter and repeats a page
+                seen |= links
+                yield url, rows
+            page += len(window)
+
+    async def _pages_chained(self, client: httpx.AsyncClient, sem: asyncio.Semaphore, list_url: str) -> list:
+        out, url, seen = [], list_url, set()
+        async with sem:
+            while url and url not in seen and len(out) < self.plan.max_pages:
+                seen.add(url)
+                doc = await self._fetch(client, url)
+                if doc is None:
+                    break
+                out.append((url, self.plan.extract(doc)))
+                url = self.plan.next_url(doc, url)
+        return out
+
+    async def _pages(self, client: httpx.AsyncClient):
+        if self.plan.page_param:
+            for list_url in self.plan.list_urls:
+                async for page in self._pages_numbered(client, list_url):
+                    yield page
+        else:
+            sem = asyncio.Semaphore(self.concurrency)
+            chains = await asyncio.gather(*(self._pages_chained(client, sem, u) for u in self.plan.list_urls))
+            for chain in chains:
+                for page in chain:
+                    yield page
+
+    # ---------- main ----------
+    async def adiscover(self) -> AsyncIterator[JobRecord]:
+        seen = set()
+        async with get_async_client() as client:
+            async for page_url, rows in self._pages(client):
+                for row in rows:
+                    title = row.get("title")
+                    href = row.get("url")
+                    if not title or not href:
+                        self.invalid += 1
+                        continue
+                    url = urljoin(page_url, href)
+                    if urlsplit(url).scheme not in ("http", "https"):
+                        self.invalid += 1  # mailto:, javascript:, ...
+                        continue
+                    if url in seen:
+                        continue
+                    seen.add(url)
+                    desc = row.get("description")
+                    # Scraped-by-selector data is the least trustworthy: always validate
+                    try:
+                        model = JobModel(
+                            source=self.source_name,
+                            source_job_id=row.get("id"),
+                            title=title,
+                            company=self.company,
+                            location=row.get("location"),
+                            apply_url=url,
+                            description_text=desc,
+                            posted_at=row.get("posted_at"),
+                        )
+                    except ValidationError:
+                        self.invalid += 1
+                        continue
+                    yield as_record(model)
@@ -1,40 +1,112 @@
-from typing import Iterable
-from scraper.adapters.base import BaseAdapter
-from scraper.client.http import get_client
-from scraper.models.job import JobModel
-from scraper.pipeline.normalize import normalize_tags
+import asyncio
+import time
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from scraper.adapters.base import AsyncBaseAdapter, board_signature
+from scraper.client.http import get_async_client
+from scraper.models.record import JobRecord
+from scraper.pipeline.normalize import passes_title_prefilter
+from scraper.settings import settings
 
 
 API_BASE = "https://boards-api.greenhouse.io/v1/boards"
 
 
-class GreenhouseAdapter(BaseAdapter):
+class GreenhouseAdapter(AsyncBaseAdapter):
+    """
+    Greenhouse job board API.
+
+    two_phase (default GREENHOUSE_TWO_PHASE): fetch the list without content, then
+    `jobs/{id}` only for postings whose title passes the internship/CS prefilter,
+    ADAPTER_CONCURRENCY at a time. Other postings, and those whose detail request
+    fails, are still yielded (every posting is stored), without a description; the run
+    loop then gives them their stored one (storage.fill_from_stored), so they are
+    classified on it. Otherwise one `jobs?content=true` request.
+    Network use of the last run is in `self.stats` (requests, bytes, seconds).
+    Probe: the content-less list, as (id, updated_at) pairs. When the board changed, the
+    two-phase fetch reuses that response instead of requesting the list again.
+    """
     source_name = "greenhouse"
 
 
-    def __init__(self, board_slug: str, company: str | None = None):
+    def __init__(self, board_slug: str, company: str | None = None, two_phase: Optional[bool] = None):
         self.board_slug = board_slug
         self.company = company
+        self.two_phase = settings.GREENHOUSE_TWO_PHASE if two_phase is None else two_phase
+        self.stats = self.new_stats()
+        self._listing = None  # content-less list read by the probe, for the next adiscover
+
+
+    def _job(self, j: dict, desc: Optional[str]) -> Optional[JobRecord]:
+        title = (j.get("title") or "").strip()
+        loc = (j.get("location") or {}).get("name")
+        return self.make_job(
+            source=self.source_name,
+            source_job_id=str(j.get("id")) if j.get("id") else None,
+            title=title,
+            company=self.company,
+            location=loc,
+            apply_url=j.get("absolute_url") or "",
+            description_text=desc,
+            posted_at=j.get("updated_at") or j.get("created_at"),
+        )
+
 
+    async def _content(self, client, sem: asyncio.Semaphore, j: dict) -> tuple[dict, Optional[str]]:
+        # A failed detail (timeout, non-JSON answer) costs that description, not the board
+        try:
+            async with sem:
+                r = await client.get(f"{API_BASE}/{self.board_slug}/jobs/{j['id']}")
+            self.count_response(r)
+            if r.status_code != 200:
+                return j, None
+            return j, (r.json() or {}).get("content")
+        except (httpx.HTTPError, ValueError):
+            return j, None
 
-    def discover(self) -> Iterable[JobModel]:
-        url = f"{API_BASE}/{self.board_slug}/jobs?content=true"
-        with get_client() as client:
-            r = client.get(url)
+
+    async def aprobe(self) -> Optional[str]:
+        async with get_async_client() as client:
+            r = await client.get(f"{API_BASE}/{self.board_slug}/jobs")
             r.raise_for_status()
-            data = r.json()
-            for j in data.get("jobs", []):
-                title = (j.get("title") or "").strip()
-                loc = (j.get("location") or {}).get("name")
-                desc = (j.get("content") or "")
-                yield JobModel(
-                    source=self.source_name,
-                    source_job_id=str(j.get("id")) if j.get("id") else None,
-                    title=title,
-                    company=self.company,
-                    location=loc,
-                    apply_url=j.get("absolute_url") or "",
-                    description_text=desc,
-                    posted_at=j.get("updated_at") or j.get("created_at"),
-                    tags=normalize_tags(title, desc),
-                )
\ No newline at end of file
+        self._listing = r
+        jobs = r.json().get("jobs", [])
+        return board_signature(sorted((str(j.get("id")), j.get("updated_at") or "") for j in jobs))
+
+
+    async def adiscover(self) -> AsyncIterator[JobRecord]:
+        self.stats = self.new_stats()
+        t0 = time.perf_counter()
+        try:
+            async with get_async_client() as client:
+                if not self.two_phase:
+                    self._listing = None
+                    r = await client.get(f"{API_BASE}/{self.board_slug}/jobs?content=true")
+                    self.count_response(r)
+                    r.raise_for_status()
+                    for j in r.json().get("jobs", []):
+                        if (job := self._job(j, j.get("content") or "")) is not None:
+                            yield job
+                    return
+
+                r, self._listing = self._listing, None
+                if r is None:
+                    r = await client.get(f"{API_BASE}/{self.board_slug}/jobs")
+                self.count_response(r)
+                r.raise_for_status()
+                wanted = []
+                for j in r.json().get("jobs", []):
+                    if j.get("id") is not None and passes_title_prefilter(j.get("title") or ""):
+                        wanted.append(j)
+                    elif (job := self._job(j, None)) is not None:
+                        yield job
+
+                sem = asyncio.Semaphore(max(1, settings.ADAPTER_CONCURRENCY))
+                for fut in asyncio.as_completed([self._content(client, sem, j) for j in wanted]):
+                    j, desc = await fut
+                    if (job := self._job(j, desc)) is not None:
+                        yield job
+        finally:
+            self.stats["seconds"] += time.perf_counter() - t0
@@ -1,9 +1,11 @@
-from typing import Iterable, Optional
+import asyncio
+import time
+from typing import AsyncIterator, Optional
 from datetime import datetime, timezone
-from scraper.adapters.base import BaseAdapter
-from scraper.client.http import get_client
-from scraper.models.job import JobModel
-from scraper.pipeline.normalize import normalize_tags
+from scraper.adapters.base import AsyncBaseAdapter
+from scraper.client.http import get_async_client
+from scraper.models.record import JobRecord
+from scraper.settings import settings
 
 def _ms_to_iso(value) -> Optional[str]:
     """Lever uses epoch milliseconds; return RFC3339 string."""
@@ -13,33 +15,82 @@ def _ms_to_iso(value) -> Optional[str]:
         return value
     return None
 
-class LeverAdapter(BaseAdapter):
+class LeverAdapter(AsyncBaseAdapter):
+    """
+    Lever postings API, paged with skip/limit.
+
+    The first window of LEVER_PAGE_SIZE postings is requested alone; only if it comes
+    back full are the next windows requested ADAPTER_CONCURRENCY at a time, each
+    window's postings yielded as soon as it arrives. Paging stops after the first
+    short window. `filters` are passed through as Lever query parameters to
+    narrow the board server-side, e.g. {"commitment": ["Internship", "Stage"]} or
+    {"team": "Engineering"} (a list repeats the parameter, which Lever ORs).
+    """
     source_name = "lever"
 
-    def __init__(self, company_slug: str, company: Optional[str] = None):
+    def __init__(self, company_slug: str, company: Optional[str] = None, filters: Optional[dict] = None):
         self.company_slug = company_slug
         self.company = company
+        self.filters = dict(filters or {})
+        self.stats = self.new_stats()
+
+    def _job(self, j: dict) -> Optional[JobRecord]:
+        title = (j.get("text") or "").strip()
+        loc = (j.get("categories") or {}).get("location")
+        desc = j.get("descriptionPlain") or j.get("description")
+        posted = _ms_to_iso(j.get("createdAt") or j.get("updatedAt"))
+
+        return self.make_job(
+            source=self.source_name,
+            source_job_id=j.get("id"),
+            title=title,
+            company=self.company,
+            location=loc,
+            apply_url=j.get("hostedUrl") or j.get("applyUrl") or "",
+            description_text=desc,
+            posted_at=posted,
+        )
+
+    async def _window(self, client, skip: int, limit: int) -> tuple[int, list]:
+        params = {**self.filters, "mode": "json", "skip": skip, "limit": limit}
+        r = await client.get(f"https://api.lever.co/v0/postings/{self.company_slug}", params=params)
+        self.count_response(r)
+        r.raise_for_status()
+        return skip, r.json() or []
 
-    def discover(self) -> Iterable[JobModel]:
-        url = f"https://api.lever.co/v0/postings/{self.company_slug}?mode=json"
-        with get_client() as client:
-            r = client.get(url)
-            r.raise_for_status()
-            data = r.json()
-        for j in data:
-            title = (j.get("text") or "").strip()
-            loc = (j.get("categories") or {}).get("location")
-            desc = j.get("descriptionPlain") or j.get("description")
-            posted = _ms_to_iso(j.get("createdAt") or j.get("updatedAt"))
-
-            yield JobModel(
-                source=self.source_name,
-                source_job_id=j.get("id"),
-                title=title,
-                company=self.company,
-                location=loc,
-                apply_url=j.get("hostedUrl") or j.get("applyUrl") or "",
-                description_text=desc,
-                posted_at=posted,
-                tags=normalize_tags(title, desc),
-            )
+    async def adiscover(self) -> AsyncIterator[JobRecord]:
+        self.stats = self.new_stats()
+        t0 = time.perf_counter()
+        limit = max(1, settings.LEVER_PAGE_SIZE)
+        width = max(1, settings.ADAPTER_CONCURRENCY)
+        try:
+            async with get_async_client() as client:
+                # Most boards fit in one window: only fan out once the first comes back full
+                _, postings = await self._window(client, 0, limit)
+                for j in postings:
+                    if (job := self._job(j)) is not None:
+                        yield job
+                if len(postings) < limit:
+                    return
+                skip = limit
+                while True:
+                    batch = [asyncio.ensure_future(self._window(client, skip + k * limit, limit))
+                             for k in range(width)]
+                    last = False
+                    try:
+                        for fut in asyncio.as_completed(batch):
+                            _, postings = await fut
+                            for j in postings:
+                                if (job := self._job(j)) is not None:
+                                    yield job
+                            last = last or len(postings) < limit
+                    finally:
+                        # still pending if a window failed or the consumer stopped early
+                        for t in batch:
+                            t.cancel()
+                        await asyncio.gather(*batch, return_exceptions=True)
+                    if last:
+                        return
+                    skip += width * limit
+        finally:
+            self.stats["seconds"] += time.perf_counter() - t0
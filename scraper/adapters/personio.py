@@ -1,13 +1,16 @@
-from typing import Iterable, Optional
+from typing import AsyncIterator, Optional
 from urllib.parse import urljoin
-from scraper.adapters.base import BaseAdapter
-from scraper.client.http import get_client
-from scraper.models.job import JobModel
-from scraper.pipeline.normalize import normalize_tags
 
-class PersonioAdapter(BaseAdapter):
+import httpx
+
+from scraper.adapters.base import AsyncBaseAdapter
+from scraper.client.http import first_valid, get_async_client
+from scraper.models.record import JobRecord
+
+class PersonioAdapter(AsyncBaseAdapter):
     """
-    Personio careers search JSON (tries en → fr → default).
+    Personio careers search JSON. English first; only if it fails are the fr and default
+    feeds requested, at once, and the first valid one wins.
     Some tenants return a LIST; others return a dict with "jobs"/"positions".
     """
     source_name = "personio"
@@ -17,21 +20,26 @@ class PersonioAdapter(BaseAdapter):
         self.base = f"https://{company_slug}.jobs.personio.de/"
         self.company = company
 
-    def _fetch(self):
+    async def _fetch(self):
         endpoints = ["search.json?language=en", "search.json?language=fr", "search.json"]
-        with get_client() as client:
-            for ep in endpoints:
-                url = urljoin(self.base, ep)
-                r = client.get(url)
-                if r.status_code == 200:
-                    try:
-                        return r.json()
-                    except Exception:
+
+        async with get_async_client() as client:
+            async def attempt(ep):
+                try:
+                    r = await client.get(urljoin(self.base, ep))
+                    if r.status_code != 200:
                         return None
-        return None
+                    return r.json() or None
+                except (httpx.HTTPError, ValueError):
+                    return None
+
+            data = await attempt(endpoints[0])
+            if data is not None:
+                return data
+            return await first_valid([lambda ep=ep: attempt(ep) for ep in endpoints[1:]])
 
-    def discover(self) -> Iterable[JobModel]:
-        data = self._fetch()
+    async def adiscover(self) -> AsyncIterator[JobRecord]:
+        data = await self._fetch()
         if not data:
             return
 
@@ -57,7 +65,7 @@ class PersonioAdapter(BaseAdapter):
             desc = j.get("description") or j.get("descriptionText")
             jid = j.get("id") or j.get("positionId")
 
-            yield JobModel(
+            job = self.make_job(
                 source=self.source_name,
                 source_job_id=str(jid) if jid else None,
                 title=title,
@@ -66,5 +74,6 @@ class PersonioAdapter(BaseAdapter):
                 apply_url=apply_url or self.base,
                 description_text=desc,
                 posted_at=j.get("publishedAt") or j.get("createdAt") or j.get("created_at"),
-                tags=normalize_tags(title, desc or ""),
             )
+            if job is not None:
+                yield job
@@ -1,14 +1,16 @@
-from typing import Iterable, Optional
+from typing import AsyncIterator, Optional
 from urllib.parse import urljoin
-from scraper.adapters.base import BaseAdapter
-from scraper.client.http import get_client
-from scraper.models.job import JobModel
-from scraper.pipeline.normalize import normalize_tags
+from scraper.adapters.base import AsyncBaseAdapter, board_signature
+from scraper.client.http import get_async_client
+from scraper.models.record import JobRecord
 
-class RecruiteeAdapter(BaseAdapter):
+class RecruiteeAdapter(AsyncBaseAdapter):
     """
     Public Recruitee offers JSON.
     Typical endpoint: https://<company>.recruitee.com/api/offers/?limit=100
+    Probe: the offer count and (id, updated_at) of every offer. The endpoint has no
+    lighter form, so the probe keeps the offers it read and the full fetch reuses them:
+    an unchanged board is skipped, a changed one costs no extra request.
     """
     source_name = "recruitee"
 
@@ -16,15 +18,25 @@ class RecruiteeAdapter(BaseAdapter):
         self.company_slug = company_slug
         self.base = f"https://{company_slug}.recruitee.com/"
         self.company = company
+        self._probed: Optional[list] = None  # offers read by the probe, for the next adiscover
 
-    def discover(self) -> Iterable[JobModel]:
+    async def _offers(self) -> list:
         url = urljoin(self.base, "api/offers/")
         params = {"limit": 200}
-        with get_client() as client:
-            r = client.get(url, params=params)
+        async with get_async_client() as client:
+            r = await client.get(url, params=params)
             r.raise_for_status()
             data = r.json() or {}
-        offers = data.get("offers") or data.get("items") or []
+        return data.get("offers") or data.get("items") or []
+
+    async def aprobe(self) -> Optional[str]:
+        offers = self._probed = await self._offers()
+        return board_signature(len(offers), sorted((str(o.get("id")), o.get("updated_at") or "") for o in offers))
+
+    async def adiscover(self) -> AsyncIterator[JobRecord]:
+        offers, self._probed = self._probed, None
+        if offers is None:
+            offers = await self._offers()
         for o in offers:
             title = (o.get("title") or o.get("name") or "").strip()
 
@@ -43,7 +55,7 @@ class RecruiteeAdapter(BaseAdapter):
             desc = o.get("description") or o.get("description_preview")
             oid = o.get("id")
 
-            yield JobModel(
+            job = self.make_job(
                 source=self.source_name,
                 source_job_id=str(oid) if oid else None,
                 title=title,
@@ -52,5 +64,6 @@ class RecruiteeAdapter(BaseAdapter):
                 apply_url=apply_url,
                 description_text=desc,
                 posted_at=o.get("created_at") or o.get("updated_at"),
-                tags=normalize_tags(title, desc or ""),
             )
+            if job is not None:
+                yield job
@@ -1,34 +1,80 @@
-from typing import Iterable, Optional
-from scraper.adapters.base import BaseAdapter
-from scraper.client.http import get_client
-from scraper.models.job import JobModel
-from scraper.pipeline.normalize import normalize_tags
+import asyncio
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from scraper.adapters.base import AsyncBaseAdapter, board_signature
+from scraper.client.http import get_async_client
+from scraper.models.record import JobRecord
+from scraper.settings import settings
 
 # API docs: https://api.smartrecruiters.com/v1/companies/{company}/postings
 API_BASE = "https://api.smartrecruiters.com/v1/companies/{company}/postings"
 DETAIL_BASE = "https://api.smartrecruiters.com/v1/companies/{company}/postings/{posting_id}"
+# Public posting page, used when the detail call fails
+POSTING_URL = "https://jobs.smartrecruiters.com/{company}/{posting_id}"
 
-class SmartRecruitersAdapter(BaseAdapter):
-    """Public SmartRecruiters postings API with pagination + detail fetch for apply URL/description."""
+class SmartRecruitersAdapter(AsyncBaseAdapter):
+    """
+    Public SmartRecruiters postings API with pagination + detail fetch for apply URL/description.
+    Detail calls of a page run concurrently (ADAPTER_CONCURRENCY); postings are yielded per page.
+    A failed detail call only loses that posting's description: it keeps the list data.
+    Probe: totalFound plus the ids/release dates of the newest PROBE_SIZE postings.
+    """
     source_name = "smartrecruiters"
 
+    PROBE_SIZE = 20
+
     def __init__(self, company_slug: str, company: Optional[str] = None):
         self.company_slug = company_slug
         self.company = company
 
-    def discover(self) -> Iterable[JobModel]:
+    async def _detail(self, client, sem: asyncio.Semaphore, pid) -> tuple[Optional[str], Optional[str]]:
+        if not pid:
+            return None, None
+        try:
+            async with sem:
+                rd = await client.get(DETAIL_BASE.format(company=self.company_slug, posting_id=pid))
+            if rd.status_code != 200:
+                return None, None
+            jd = rd.json() or {}
+        except (httpx.HTTPError, ValueError):  # timeout, bad JSON: keep the list data
+            return None, None
+        apply_url = (
+            jd.get("applyUrl")
+            or (jd.get("jobAd") or {}).get("applyUrl")
+        )
+        desc = (jd.get("jobAd") or {}).get("sections", {}).get("jobDescription", {}).get("text")
+        return apply_url, desc
+
+    async def aprobe(self) -> Optional[str]:
+        async with get_async_client() as client:
+            r = await client.get(API_BASE.format(company=self.company_slug), params={"limit": self.PROBE_SIZE})
+            r.raise_for_status()
+        data = r.json() or {}
+        if "totalFound" not in data:
+            return None
+        items = data.get("content") or []
+        return board_signature(data["totalFound"], [(it.get("id"), it.get("releasedDate")) for it in items])
+
+    async def adiscover(self) -> AsyncIterator[JobRecord]:
         params = {"limit": 100}
         next_page = None
-        with get_client() as client:
+        sem = asyncio.Semaphore(max(1, settings.ADAPTER_CONCURRENCY))
+        async with get_async_client() as client:
             while True:
                 if next_page:
                     params["nextPageId"] = next_page
-                r = client.get(API_BASE.format(company=self.company_slug), params=params)
+                r = await client.get(API_BASE.format(company=self.company_slug), params=params)
                 r.raise_for_status()
                 data = r.json() or {}
                 items = data.get("content") or data.get("data") or data.get("postings") or []
-                for it in items:
-                    pid = it.get("id") or it.get("identifier") or it.get("refNumber")
+                pids = [it.get("id") or it.get("identifier") or it.get("refNumber") for it in items]
+
+                # Detail calls to get apply_url & description, the whole page at once
+                details = await asyncio.gather(*(self._detail(client, sem, pid) for pid in pids))
+
+                for it, pid, (apply_url, desc) in zip(items, pids, details):
                     title = (it.get("name") or it.get("title") or "").strip()
 
                     # Location string
@@ -40,20 +86,9 @@ class SmartRecruitersAdapter(BaseAdapter):
                         country = loc_obj.get("countryCode") or loc_obj.get("country") or ""
                         loc = ", ".join([x for x in [city, region, country] if x]) or None
 
-                    # Detail call to get apply_url & description
-                    apply_url, desc = None, None
-                    if pid:
-                        rd = client.get(DETAIL_BASE.format(company=self.company_slug, posting_id=pid))
-                        if rd.status_code == 200:
-                            jd = rd.json() or {}
-                            apply_url = (
-                                jd.get("applyUrl")
-                                or (jd.get("jobAd") or {}).get("applyUrl")
-                            )
-                            desc = (jd.get("jobAd") or {}).get("sections", {}).get("jobDescription", {}).get("text")
-
-                    apply_url = apply_url or it.get("applyUrl") or ""
-                    yield JobModel(
+                    apply_url = apply_url or it.get("applyUrl") or (
+                        POSTING_URL.format(company=self.company_slug, posting_id=pid) if pid else "")
+                    job = self.make_job(
                         source=self.source_name,
                         source_job_id=str(pid) if pid else None,
                         title=title,
@@ -62,8 +97,9 @@ class SmartRecruitersAdapter(BaseAdapter):
                         apply_url=apply_url,
                         description_text=desc,
                         posted_at=it.get("releasedDate") or it.get("createdOn") or it.get("updatedOn"),
-                        tags=normalize_tags(title, desc or ""),
                     )
+                    if job is not None:
+                        yield job
                 next_page = data.get("nextPageId")
                 if not next_page:
                     break
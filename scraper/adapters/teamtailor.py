@@ -1,12 +1,11 @@
-from typing import Iterable, Optional
+from typing import AsyncIterator, Optional
 from urllib.parse import urljoin
-from bs4 import BeautifulSoup
-from scraper.adapters.base import BaseAdapter
-from scraper.client.http import get_client
-from scraper.models.job import JobModel
-from scraper.pipeline.normalize import normalize_tags
+from scraper.adapters.base import AsyncBaseAdapter
+from scraper.adapters.extract import iter_job_anchors, parse_html
+from scraper.client.http import get_async_client
+from scraper.models.record import JobRecord
 
-class TeamtailorAdapter(BaseAdapter):
+class TeamtailorAdapter(AsyncBaseAdapter):
     """HTML adapter for Teamtailor career sites (public pages)."""
     source_name = "teamtailor"
 
@@ -15,24 +14,15 @@ class TeamtailorAdapter(BaseAdapter):
         self.base = f"https://{company_slug}.teamtailor.com/"
         self.company = company
 
-    def discover(self) -> Iterable[JobModel]:
+    async def adiscover(self) -> AsyncIterator[JobRecord]:
         list_url = urljoin(self.base, "jobs")
-        with get_client() as client:
-            r = client.get(list_url)
+        async with get_async_client() as client:
+            r = await client.get(list_url)
             r.raise_for_status()
-            soup = BeautifulSoup(r.text, "lxml")
+            doc = parse_html(r.text)
 
-        seen = set()
-        for a in soup.select("a[href*='/jobs/']"):
-            href = a.get("href", "")
-            title = a.get_text(strip=True)
-            if len(title) < 3:
-                continue
-            url = urljoin(self.base, href)
-            if url in seen:
-                continue
-            seen.add(url)
-            yield JobModel(
+        for url, title in iter_job_anchors(doc, self.base):
+            job = self.make_job(
                 source=self.source_name,
                 source_job_id=None,
                 title=title,
@@ -41,5 +31,6 @@ class TeamtailorAdapter(BaseAdapter):
                 apply_url=url,
                 description_text=None,
                 posted_at=None,
-                tags=normalize_tags(title, None),
             )
+            if job is not None:
+                yield job
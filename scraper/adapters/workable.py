@@ -1,12 +1,10 @@
-from typing import Iterable, Optional
-from urllib.parse import urljoin
-from bs4 import BeautifulSoup
-from scraper.adapters.base import BaseAdapter
-from scraper.client.http import get_client
-from scraper.models.job import JobModel
-from scraper.pipeline.normalize import normalize_tags
+from typing import AsyncIterator, Optional
+from scraper.adapters.base import AsyncBaseAdapter
+from scraper.adapters.extract import iter_job_anchors, parse_html
+from scraper.client.http import get_async_client
+from scraper.models.record import JobRecord
 
-class WorkableAdapter(BaseAdapter):
+class WorkableAdapter(AsyncBaseAdapter):
     """
     Workable public jobs API v3 with HTML fallback.
     API: https://apply.workable.com/api/v3/accounts/{account}/jobs?state=published&limit=100
@@ -17,11 +15,11 @@ class WorkableAdapter(BaseAdapter):
         self.account_slug = account_slug
         self.company = company
 
-    def discover(self) -> Iterable[JobModel]:
+    async def adiscover(self) -> AsyncIterator[JobRecord]:
         api = f"https://apply.workable.com/api/v3/accounts/{self.account_slug}/jobs"
         params = {"state": "published", "limit": 100}
-        with get_client() as client:
-            r = client.get(api, params=params)
+        async with get_async_client() as client:
+            r = await client.get(api, params=params)
             if r.status_code == 200:
                 data = r.json() or {}
                 for it in data.get("results", []) or []:
@@ -31,7 +29,7 @@ class WorkableAdapter(BaseAdapter):
                     jid = it.get("id") or it.get("shortcode")
                     desc = it.get("description")
 
-                    yield JobModel(
+                    job = self.make_job(
                         source=self.source_name,
                         source_job_id=str(jid) if jid else None,
                         title=title,
@@ -40,27 +38,19 @@ class WorkableAdapter(BaseAdapter):
                         apply_url=url,
                         description_text=desc,
                         posted_at=it.get("published_on") or it.get("created_at"),
-                        tags=normalize_tags(title, desc or ""),
                     )
+                    if job is not None:
+                        yield job
                 return  # API worked; stop here
 
         # Fallback to HTML
         base = f"https://apply.workable.com/{self.account_slug}/"
-        with get_client() as client:
-            r = client.get(base)
+        async with get_async_client() as client:
+            r = await client.get(base)
             r.raise_for_status()
-            soup = BeautifulSoup(r.text, "lxml")
-        seen = set()
-        for a in soup.select("a[href*='/jobs/']"):
-            href = a.get("href", "")
-            title = a.get_text(strip=True)
-            if len(title) < 3:
-                continue
-            url = urljoin(base, href)
-            if url in seen:
-                continue
-            seen.add(url)
-            yield JobModel(
+            doc = parse_html(r.text)
+        for url, title in iter_job_anchors(doc, base):
+            job = self.make_job(
                 source=self.source_name,
                 source_job_id=None,
                 title=title,
@@ -69,5 +59,6 @@ class WorkableAdapter(BaseAdapter):
                 apply_url=url,
                 description_text=None,
                 posted_at=None,
-                tags=normalize_tags(title, None),
             )
+            if job is not None:
+                yield job
@@ -1,26 +1,27 @@
-from typing import Iterable, Optional
+from typing import AsyncIterator, Optional
 from urllib.parse import urljoin
 import httpx
 
-from scraper.adapters.base import BaseAdapter
-from scraper.client.http import get_client
-from scraper.models.job import JobModel
-from scraper.pipeline.normalize import normalize_tags
+from scraper.adapters.base import AsyncBaseAdapter, board_signature
+from scraper.client.http import first_valid, get_async_client
+from scraper.models.record import JobRecord
 
 
-class WorkdayAdapter(BaseAdapter):
+class WorkdayAdapter(AsyncBaseAdapter):
     """
     Generic Workday adapter.
 
     slug must be a dict: {"tenant": "...", "site": "CareersSiteName"}.
 
-    Strategy:
-      1) Try Candidate Experience Service (CXS):
+    Endpoints:
+      1) Candidate Experience Service (CXS):
          POST https://{tenant}.wd{N}.myworkdayjobs.com/wday/cxs/{tenant}/{site}/jobs
-      2) Fallback to legacy:
+      2) Legacy:
          POST https://{tenant}.wd{N}.myworkdayjobs.com/{site}/search
 
-    We try root host (no wdN) then wd1, wd2, wd3, wd5. Skips non-JSON or DNS failures.
+    The first page is requested in both modes on the root host (no wdN) and wd1, wd2,
+    wd3, wd5 at once; the first host/mode returning postings wins and is paged through.
+    Non-JSON answers and DNS failures just lose the race.
     """
     source_name = "workday"
 
@@ -28,7 +29,7 @@ class WorkdayAdapter(BaseAdapter):
         self.tenant = slug.get("tenant")
         self.site = slug.get("site")
         self.company = company
-        self.suffixes = [None, "1", "2", "3", "5"]  # try root first
+        self.suffixes = [None, "1", "2", "3", "5"]  # candidate hosts, root first
 
     # ---------- host helpers ----------
     def _host_for(self, suffix: Optional[str]) -> str:
@@ -45,9 +46,13 @@ class WorkdayAdapter(BaseAdapter):
                       "(KHTML, like Gecko) Chrome/123.0 Safari/537.36",
     }
 
-    def _post_json(self, client: httpx.Client, url: str, payload: dict) -> Optional[dict]:
+    PAGE_SIZE = 50
+    PROBE_SIZE = 20
+    MODES = ("cxs", "legacy")
+
+    async def _post_json(self, client: httpx.AsyncClient, url: str, payload: dict) -> Optional[dict]:
         try:
-            r = client.post(url, json=payload, headers=self._HDRS, timeout=20.0)
+            r = await client.post(url, json=payload, headers=self._HDRS)
         except (httpx.ConnectError, httpx.ReadTimeout, httpx.HTTPError):
             return None
         if r.status_code != 200:
@@ -61,107 +66,85 @@ class WorkdayAdapter(BaseAdapter):
         except Exception:
             return None
 
-    # ---------- CXS mode ----------
-    def _discover_cxs(self, client: httpx.Client, host: str) -> Iterable[JobModel]:
-        url = f"{host}wday/cxs/{self.tenant}/{self.site}/jobs"
-        offset = 0
-        page = 0
-        while True:
-            payload = {"appliedFacets": {}, "limit": 50, "offset": offset, "searchText": ""}
-            data = self._post_json(client, url, payload)
-            if not data:
-                break
-            items = data.get("jobPostings") or []
-            if not items:
-                break
-            for it in items:
-                title = (it.get("title") or it.get("title_friendly") or "").strip()
-                loc = it.get("locationsText") or it.get("locations") or it.get("location")
-                # CXS usually gives 'externalPath' relative to site base
-                path = it.get("externalPath") or it.get("externalUrlPath") or it.get("url") or ""
-                base = urljoin(host, f"{self.site}/")
-                job_url = urljoin(base, path)
-                jid = it.get("id") or it.get("bulletFields")
-                desc = it.get("shortDescription")
-                yield JobModel(
-                    source=self.source_name,
-                    source_job_id=str(jid) if jid else None,
-                    title=title,
-                    company=self.company,
-                    location=loc,
-                    apply_url=job_url or base,
-                    description_text=desc,
-                    posted_at=it.get("postedOn") or it.get("publicationDate"),
-                    tags=normalize_tags(title, desc or ""),
-                )
-            if len(items) < 50:
-                break
-            page += 1
-            offset = page * 50
-
-    # ---------- legacy /search mode ----------
-    def _discover_legacy(self, client: httpx.Client, host: str) -> Iterable[JobModel]:
+    # ---------- endpoints ----------
+    def _endpoint(self, host: str, mode: str) -> tuple[str, str]:
+        """(search URL, site base for job links) for CXS or legacy /search mode."""
         base = urljoin(host, f"{self.site}/")
-        url = urljoin(base, "search")
-        offset = 0
-        page = 0
-        while True:
-            payload = {"appliedFacets": {}, "limit": 50, "offset": offset, "searchText": ""}
-            data = self._post_json(client, url, payload)
-            if not data:
-                break
-            items = data.get("jobPostings") or data.get("items") or []
-            if not items:
-                break
-            for it in items:
-                title = (it.get("title") or it.get("title_friendly") or "").strip()
-                loc = it.get("locationsText") or it.get("locations") or it.get("location")
-                path = it.get("externalPath") or it.get("externalUrlPath") or it.get("url") or ""
-                job_url = urljoin(base, path)
-                jid = it.get("id") or it.get("bulletFields")
-                desc = it.get("shortDescription")
-                yield JobModel(
-                    source=self.source_name,
-                    source_job_id=str(jid) if jid else None,
-                    title=title,
-                    company=self.company,
-                    location=loc,
-                    apply_url=job_url or base,
-                    description_text=desc,
-                    posted_at=it.get("postedOn") or it.get("publicationDate"),
-                    tags=normalize_tags(title, desc or ""),
-                )
-            if len(items) < 50:
-                break
-            page += 1
-            offset = page * 50
-
-    # ---------- main ----------
-    def discover(self) -> Iterable[JobModel]:
-        with get_client() as client:
-            for suffix in self.suffixes:
-                host = self._host_for(suffix)
-                got_any = False
-
-                # 1) Try CXS
-                try:
-                    for job in self._discover_cxs(client, host):
-                        got_any = True
-                        yield job
-                except Exception:
-                    # swallow and try legacy
-                    pass
+        if mode == "cxs":
+            return f"{host}wday/cxs/{self.tenant}/{self.site}/jobs", base
+        return urljoin(base, "search"), base
+
+    @staticmethod
+    def _items(data: Optional[dict], mode: str) -> list:
+        if not data:
+            return []
+        if mode == "cxs":
+            return data.get("jobPostings") or []
+        return data.get("jobPostings") or data.get("items") or []
+
+    async def _page(self, client: httpx.AsyncClient, url: str, mode: str, offset: int) -> list:
+        payload = {"appliedFacets": {}, "limit": self.PAGE_SIZE, "offset": offset, "searchText": ""}
+        return self._items(await self._post_json(client, url, payload), mode)
+
+    async def _first_page(self, client: httpx.AsyncClient, host: str, mode: str):
+        url, base = self._endpoint(host, mode)
+        items = await self._page(client, url, mode, 0)
+        return (url, base, mode, items) if items else None
+
+    def _to_job(self, it: dict, base: str) -> Optional[JobRecord]:
+        title = (it.get("title") or it.get("title_friendly") or "").strip()
+        loc = it.get("locationsText") or it.get("locations") or it.get("location")
+        # CXS usually gives 'externalPath' relative to site base
+        path = it.get("externalPath") or it.get("externalUrlPath") or it.get("url") or ""
+        job_url = urljoin(base, path)
+        jid = it.get("id") or it.get("bulletFields")
+        desc = it.get("shortDescription")
+        return self.make_job(
+            source=self.source_name,
+            source_job_id=str(jid) if jid else None,
+            title=title,
+            company=self.company,
+            location=loc,
+            apply_url=job_url or base,
+            description_text=desc,
+            posted_at=it.get("postedOn") or it.get("publicationDate"),
+        )
+
+    # ---------- probe ----------
+    async def _probe_host(self, client: httpx.AsyncClient, host: str) -> Optional[tuple]:
+        url, _ = self._endpoint(host, "cxs")
+        payload = {"appliedFacets": {}, "limit": self.PROBE_SIZE, "offset": 0, "searchText": ""}
+        data = await self._post_json(client, url, payload)
+        if not data or "total" not in data:
+            return None
+        paths = [it.get("externalPath") for it in data.get("jobPostings") or []]
+        return data["total"], paths
 
-                if got_any:
-                    return
+    async def aprobe(self) -> Optional[str]:
+        """CXS total + paths of the first PROBE_SIZE postings (legacy search has no total)."""
+        async with get_async_client() as client:
+            won = await first_valid([
+                lambda host=self._host_for(suffix): self._probe_host(client, host) for suffix in self.suffixes
+            ])
+        return board_signature(*won) if won else None
 
-                # 2) Try legacy /search
-                try:
-                    for job in self._discover_legacy(client, host):
-                        got_any = True
+    # ---------- main ----------
+    async def adiscover(self) -> AsyncIterator[JobRecord]:
+        async with get_async_client() as client:
+            attempts = [
+                lambda host=self._host_for(suffix), mode=mode: self._first_page(client, host, mode)
+                for suffix in self.suffixes for mode in self.MODES
+            ]
+            won = await first_valid(attempts)
+            if not won:
+                return
+            url, base, mode, items = won
+            offset = 0
+            while items:
+                for it in items:
+                    if (job := self._to_job(it, base)) is not None:
                         yield job
-                except Exception:
-                    pass
-
-                if got_any:
-                    return
+                if len(items) < self.PAGE_SIZE:
+                    break
+                offset += self.PAGE_SIZE
+                items = await self._page(client, url, mode, offset)
@@ -1,10 +1,395 @@
+"""
+Shared HTTP client.
+
+HTTP_MODE switches what sits under every client handed out by `get_client()`:
+  live   : the network (default)
+  record : the network, and every request/response is appended to HTTP_CASSETTE
+           (gzip'd JSONL, one gzip member per exchange so threads and worker processes
+           can append to the same file)
+  replay : no network; responses are served from HTTP_CASSETTE, matched on
+           (method, url, request body hash), optionally delayed by the recorded
+           latency × HTTP_REPLAY_LATENCY
+
+    HTTP_MODE=record python scripts/run_scrape_once.py    # capture a run
+    HTTP_MODE=replay python scripts/run_scrape_once.py    # re-run it offline
+
+`get_async_client()` is the httpx.AsyncClient twin used by async adapters (same modes),
+and `first_valid()` races alternative requests and keeps the first acceptable answer.
+
+Every client also times its requests (time to response headers) per host into the
+`request_log()` open in the calling context, and swaps the default REQUEST_TIMEOUT for the
+host's adaptive one when `set_host_timeouts()` has one (see scraper/pipeline/health.py).
+Timeouts passed explicitly to a request are left alone.
+"""
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
 import httpx
 from scraper.settings import settings
 
 
 _headers = {"User-Agent": settings.USER_AGENT}
 
+# Bodies are stored decoded, so these no longer describe them
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def _key(method: str, url: str, body: bytes) -> str:
+    return f"{method} {url} {hashlib.sha1(body or b'').hexdigest()[:16]}"
+
+
+def _request_body(request: httpx.Request) -> bytes:
+    try:
+        return request.content
+    except httpx.RequestNotRead:
+        return request.read()
+
+# --- record -------------------------------------------------------------------------
+
+class Cassette:
+    """Append-only writer shared by every recording transport of the process."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+
+    def append(self, entry: dict) -> None:
+        data = gzip.compress((json.dumps(entry) + "\n").encode("utf-8"))
+        with self._lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+
+
+def _entry(request: httpx.Request, body: bytes, response: httpx.Response, content: bytes,
+           elapsed: float) -> dict:
+    return {
+        "key": _key(request.method, str(request.url), body),
+        "method": request.method,
+        "url": str(request.url),
+        "status": response.status_code,
+        "headers": [(k, v) for k, v in response.headers.multi_items() if k.lower() not in _DROP_HEADERS],
+        "body": base64.b64encode(content).decode("ascii"),
+        "elapsed": round(elapsed, 4),
+        "ts": time.time(),
+    }
+
+
+def _response(entry: dict, request: httpx.Request, content: Optional[bytes] = None) -> httpx.Response:
+    if content is None:
+        content = base64.b64decode(entry["body"])
+    return httpx.Response(entry["status"], headers=entry["headers"], content=content, request=request)
+
+
+class RecordingTransport(httpx.BaseTransport):
+    def __init__(self, cassette: Cassette, inner: Optional[httpx.BaseTransport] = None):
+        self.cassette = cassette
+        self.inner = inner or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        body = _request_body(request)
+        t0 = time.perf_counter()
+        response = self.inner.handle_request(request)
+        try:
+            content = response.read()
+        finally:
+            response.close()
+        entry = _entry(request, body, response, content, time.perf_counter() - t0)
+        self.cassette.append(entry)
+        return _response(entry, request, content)
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class AsyncRecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, cassette: Cassette, inner: Optional[httpx.AsyncBaseTransport] = None):
+        self.cassette = cassette
+        self.inner = inner or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        t0 = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+        entry = _entry(request, body, response, content, time.perf_counter() - t0)
+        self.cassette.append(entry)
+        return _response(entry, request, content)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+# --- replay -------------------------------------------------------------------------
+
+class ReplayIndex:
+    """
+    Cassette loaded into memory, keyed by request. Repeated identical requests are
+    served in recorded order; once exhausted the last response keeps being served.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: dict[str, list[dict]] = defaultdict(list)
+        self._cursor: dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries[entry["key"]].append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._entries.values())
+
+    def lookup(self, key: str) -> Optional[dict]:
+        entries = self._entries.get(key)
+        if not entries:
+            return None
+        with self._lock:
+            i = self._cursor[key]
+            self._cursor[key] = i + 1
+        return entries[min(i, len(entries) - 1)]
+
+    def entry_for(self, request: httpx.Request, body: bytes) -> dict:
+        entry = self.lookup(_key(request.method, str(request.url), body))
+        if entry is None:
+            raise httpx.ConnectError(f"not in cassette {self.path}: {request.method} {request.url}",
+                                     request=request)
+        return entry
+
+
+class ReplayTransport(httpx.BaseTransport):
+    def __init__(self, index: ReplayIndex, latency: float = 0.0):
+        self.index = index
+        self.latency = latency
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        entry = self.index.entry_for(request, _request_body(request))
+        if self.latency:
+            time.sleep(entry["elapsed"] * self.latency)
+        return _response(entry, request)
+
+
+class AsyncReplayTransport(httpx.AsyncBaseTransport):
+    def __init__(self, index: ReplayIndex, latency: float = 0.0):
+        self.index = index
+        self.latency = latency
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        entry = self.index.entry_for(request, await request.aread())
+        if self.latency:
+            await asyncio.sleep(entry["elapsed"] * self.latency)
+        return _response(entry, request)
+
+# --- timing + adaptive timeouts -----------------------------------------------------
+
+def _quantile(values: list[float], q: float) -> float:
+    """Nearest-rank quantile of sorted values."""
+    return values[max(0, math.ceil(q * len(values)) - 1)]
+
+
+class RequestLog:
+    """Per-host request latencies and failures of one scrape (see `request_log()`)."""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: Counter = Counter()    # transport errors and 429/5xx answers
+        self.timeouts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, host: str, seconds: Optional[float] = None, status: Optional[int] = None,
+            error: Optional[str] = None) -> None:
+        with self._lock:
+            if seconds is not None:
+                self.latencies[host].append(seconds)
+            if error == "timeout":
+                self.timeouts[host] += 1
+            if error or (status is not None and (status == 429 or status >= 500)):
+                self.errors[host] += 1
+
+    @property
+    def requests(self) -> int:
+        return sum(len(v) for v in self.latencies.values()) + sum(self.timeouts.values())
+
+    def hosts(self) -> dict[str, dict]:
+        """{host: {"n", "p50", "p99", "max", "errors", "timeouts"}}, latencies in seconds."""
+        out = {}
+        with self._lock:
+            for host in set(self.latencies) | set(self.errors):
+                lat = sorted(self.latencies.get(host, []))
+                out[host] = {
+                    "n": len(lat),
+                    "p50": round(_quantile(lat, 0.50), 4) if lat else None,
+                    "p99": round(_quantile(lat, 0.99), 4) if lat else None,
+                    "max": round(lat[-1], 4) if lat else None,
+                    "errors": self.errors[host],
+                    "timeouts": self.timeouts[host],
+                }
+        return out
+
+    def quantiles(self) -> tuple[Optional[float], Optional[float]]:
+        """(p50, p99) over every host, seconds; (None, None) without timed requests."""
+        with self._lock:
+            lat = sorted(x for v in self.latencies.values() for x in v)
+        if not lat:
+            return None, None
+        return _quantile(lat, 0.50), _quantile(lat, 0.99)
+
+
+_request_log: ContextVar[Optional[RequestLog]] = ContextVar("request_log", default=None)
+
+
+@contextmanager
+def request_log():
+    """Collect the timings of every request made in this context (thread / async tasks)."""
+    log = RequestLog()
+    token = _request_log.set(log)
+    try:
+        yield log
+    finally:
+        _request_log.reset(token)
+
+
+_host_timeouts: dict[str, httpx.Timeout] = {}
+
+
+def set_host_timeouts(timeouts: dict[str, httpx.Timeout]) -> None:
+    global _host_timeouts
+    _host_timeouts = dict(timeouts)
+
+
+def _prepare(request: httpx.Request) -> None:
+    adaptive = _host_timeouts.get(request.url.host)
+    if adaptive is None:
+        return
+    current = request.extensions.get("timeout") or {}
+    if all(v == settings.REQUEST_TIMEOUT for v in current.values()):
+        request.extensions["timeout"] = adaptive.as_dict()
+
+
+def _failure(e: Exception) -> str:
+    return "timeout" if isinstance(e, httpx.TimeoutException) else "error"
+
+
+class TimedTransport(httpx.BaseTransport):
+    def __init__(self, inner: httpx.BaseTransport):
+        self.inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        _prepare(request)
+        log = _request_log.get()
+        t0 = time.perf_counter()
+        try:
+            response = self.inner.handle_request(request)
+        except httpx.TransportError as e:
+            if log is not None:
+                log.add(request.url.host, error=_failure(e))
+            raise
+        if log is not None:
+            log.add(request.url.host, time.perf_counter() - t0, response.status_code)
+        return response
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class AsyncTimedTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport):
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        _prepare(request)
+        log = _request_log.get()
+        t0 = time.perf_counter()
+        try:
+            response = await self.inner.handle_async_request(request)
+        except httpx.TransportError as e:
+            if log is not None:
+                log.add(request.url.host, error=_failure(e))
+            raise
+        if log is not None:
+            log.add(request.url.host, time.perf_counter() - t0, response.status_code)
+        return response
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+# --- client -------------------------------------------------------------------------
+
+_shared: dict = {}
+_shared_lock = threading.Lock()
+
+
+def _shared_obj(kind: str, factory):
+    key = (kind, settings.HTTP_CASSETTE)
+    with _shared_lock:
+        if key not in _shared:
+            _shared[key] = factory(settings.HTTP_CASSETTE)
+        return _shared[key]
+
+
+def _transport(asynchronous: bool = False):
+    mode = settings.HTTP_MODE
+    if mode == "record":
+        cls = AsyncRecordingTransport if asynchronous else RecordingTransport
+        return cls(_shared_obj("record", Cassette))
+    if mode == "replay":
+        cls = AsyncReplayTransport if asynchronous else ReplayTransport
+        return cls(_shared_obj("replay", ReplayIndex), latency=settings.HTTP_REPLAY_LATENCY)
+    if mode != "live":
+        raise ValueError(f"HTTP_MODE must be live|record|replay, got {mode!r}")
+    return None
+
 
 def get_client() -> httpx.Client:
-    return httpx.Client(headers=_headers, timeout=settings.REQUEST_TIMEOUT, follow_redirects=True)
+    transport = TimedTransport(_transport() or httpx.HTTPTransport())
+    return httpx.Client(headers=_headers, timeout=settings.REQUEST_TIMEOUT, follow_redirects=True,
+                        transport=transport)
+
+
+def get_async_client() -> httpx.AsyncClient:
+    transport = AsyncTimedTransport(_transport(asynchronous=True) or httpx.AsyncHTTPTransport())
+    return httpx.AsyncClient(headers=_headers, timeout=settings.REQUEST_TIMEOUT, follow_redirects=True,
+                             transport=transport)
+
+# --- racing -------------------------------------------------------------------------
 
+async def first_valid(attempts: Iterable[Callable[[], Awaitable[Any]]]) -> Any:
+    """
+    Start every attempt at once and return the first result that is not None; the
+    others are cancelled. Attempts that raise count as invalid. None if none succeed.
+    Used where a board has interchangeable endpoints (Personio languages, Workday hosts).
+    """
+    tasks = [asyncio.ensure_future(a()) for a in attempts]
+    try:
+        for fut in asyncio.as_completed(tasks):
+            try:
+                result = await fut
+            except Exception:
+                continue
+            if result is not None:
+                return result
+        return None
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
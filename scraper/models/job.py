@@ -15,4 +15,8 @@ class JobModel(BaseModel):
     posted_at: Optional[str] = None
     language: Optional[str] = None
     tags: list[str] = []
-
+    # Filled by normalize.classify before storage
+    internship_score: Optional[int] = None
+    cs_mask: Optional[int] = None
+    cs_score: Optional[int] = None
+    is_france: Optional[bool] = None
@@ -0,0 +1,132 @@
+from dataclasses import dataclass, fields
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from scraper.models.job import JobModel
+from scraper.pipeline.dedupe import synthetic_job_id
+from scraper.pipeline.location import parse_location
+from scraper.pipeline.normalize import tags_from_mask, tags_to_mask
+from scraper.settings import settings
+
+
+@dataclass(slots=True)
+class JobRecord:
+    """
+    Internal posting representation between adapters and the writer.
+
+    Same attribute names as JobModel (so storage/filters accept either), but a plain
+    slotted dataclass: no validation, no per-field model machinery, updated in place by
+    enrichment/classification instead of being copied, and tags carried as a bitmask
+    over normalize.TAG_VOCAB. Pydantic stays at the edges: `make_record` validates
+    through JobModel when VALIDATE_JOBS is on, and `to_model()` converts for APIs.
+    """
+    source: str
+    title: str
+    apply_url: str
+    source_job_id: Optional[str] = None
+    company: Optional[str] = None
+    location: Optional[str] = None
+    country_code: Optional[str] = None
+    is_remote: bool = False
+    description_text: Optional[str] = None
+    posted_at: Optional[str] = None
+    language: Optional[str] = None
+    tag_mask: int = 0
+    internship_score: Optional[int] = None
+    cs_mask: Optional[int] = None
+    cs_score: Optional[int] = None
+    is_france: Optional[bool] = None
+    # Names of the matching filter profiles (pipeline/profiles.py); None = not evaluated
+    profiles: Optional[tuple[str, ...]] = None
+    # probes.board_key of the board it was discovered on, set by the run loop
+    board: Optional[str] = None
+
+    @property
+    def tags(self) -> list[str]:
+        return tags_from_mask(self.tag_mask)
+
+    def set_location(self, raw: Any) -> None:
+        """Flatten any adapter location shape and derive country_code/is_remote from it."""
+        parsed = parse_location(raw)
+        self.location = parsed.text
+        self.country_code = self.country_code or parsed.country_code
+        self.is_remote = self.is_remote or parsed.is_remote
+
+    def update(self, values: dict) -> "JobRecord":
+        """In-place update; unknown keys are ignored, `tags` lists are folded into the mask."""
+        for key, val in values.items():
+            if key == "tags":
+                self.tag_mask = tags_to_mask(val)
+            elif key == "location":
+                self.set_location(val)
+            elif key in _FIELD_NAMES:
+                setattr(self, key, val)
+        return self
+
+    @classmethod
+    def from_model(cls, m: JobModel) -> "JobRecord":
+        data = m.model_dump()
+        tags = data.pop("tags")
+        return cls(**{k: v for k, v in data.items() if k in _FIELD_NAMES}, tag_mask=tags_to_mask(tags))
+
+    def to_model(self) -> JobModel:
+        data = {f: getattr(self, f) for f in _FIELD_NAMES if f not in ("tag_mask", "profiles", "board")}
+        return JobModel(**data, tags=self.tags)
+
+
+_FIELD_NAMES = frozenset(f.name for f in fields(JobRecord))
+
+
+def _with_identity(rec: JobRecord) -> JobRecord:
+    # Postings without a source id get one derived from their URL (pipeline/dedupe.py)
+    if not rec.source_job_id and rec.apply_url:
+        rec.source_job_id = synthetic_job_id(rec.apply_url, rec.title)
+    return rec
+
+
+def _check(rec: JobRecord) -> JobRecord:
+    # Invariants checked even without VALIDATE_JOBS: storage and the UI rely on them
+    if not isinstance(rec.title, str) or not rec.title.strip():
+        raise ValueError(f"{rec.source} posting without a title ({rec.apply_url!r})")
+    url = urlsplit(rec.apply_url) if isinstance(rec.apply_url, str) else None
+    if url is None or url.scheme not in ("http", "https") or not url.netloc:
+        raise ValueError(f"{rec.source} posting {rec.title!r}: apply_url {rec.apply_url!r} is not an absolute http(s) URL")
+    return rec
+
+
+def make_record(**values) -> JobRecord:
+    """
+    Build a record from adapter keyword arguments (the same ones JobModel takes).
+    With VALIDATE_JOBS the values go through JobModel first; otherwise only the cheap
+    normalizations JobModel would have done are applied. Either way a posting without
+    a title or an absolute http(s) apply_url raises ValueError (BaseAdapter.make_job
+    skips and counts those). The raw location (any
+    adapter shape) is parsed here, after validation, and a missing source_job_id is
+    replaced by a synthetic one.
+    """
+    location = values.pop("location", None)
+    if settings.VALIDATE_JOBS:
+        rec = _check(JobRecord.from_model(JobModel(**values)))
+        if location is not None:
+            rec.set_location(location)
+        return _with_identity(rec)
+    tags = values.pop("tags", None)
+    jid = values.get("source_job_id")
+    if jid is not None and not isinstance(jid, str):
+        values["source_job_id"] = str(jid)
+    rec = _check(JobRecord(**values))
+    if location is not None:
+        rec.set_location(location)
+    if tags:
+        rec.tag_mask = tags_to_mask(tags)
+    return _with_identity(rec)
+
+
+def as_record(job) -> JobRecord:
+    """Accept JobModel from third-party adapters; records pass through untouched."""
+    if isinstance(job, JobRecord):
+        return job
+    rec = JobRecord.from_model(job)
+    if rec.location is not None:
+        rec.set_location(rec.location)
+    return _with_identity(rec)
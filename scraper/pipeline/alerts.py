@@ -0,0 +1,189 @@
+# scraper/pipeline/alerts.py
+"""
+Saved-search alerts: each posting stored for the first time is matched against the saved
+searches, not the other way round (re-running every search over `jobs` after each run).
+
+A saved search (`saved_searches`, managed with scripts/saved_searches.py) combines
+  keywords  comma-separated phrases, all required, in the title or description
+  location  comma-separated phrases, any of, in the location
+  tags      any of (normalize.TAG_VOCAB)
+  sources   any of (greenhouse, lever, ...)
+  profile   a FILTER_PROFILES name the posting must belong to
+Text is matched on words and word pairs (ranking.tokens: lowercased, accents stripped,
+hyphens as spaces), so "machine learning" matches "Machine-Learning Intern" but not
+"learning machine".
+
+`load()` compiles the active searches into an inverted index, percolator style: every
+search is filed under one of its keys (its longest required term, else the alternatives
+of its smallest any-of condition, else "*" for a search without conditions). A new
+posting is turned into its set of keys, only the searches filed under one of them are
+checked in full, and matches are queued in `alert_outbox` in the transaction that
+stores the posting (`on_upsert`). `deliver()` appends queued alerts to
+ALERTS_OUTBOX_PATH as JSON lines and marks them delivered; run_once/run_staged call it
+at the end of a run, work-queue workers whenever they find the queue drained.
+"""
+from __future__ import annotations
+
+import json
+import os
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import select
+
+from db.schemas import AlertOutbox, Job, SavedSearch
+from scraper.models.record import JobRecord
+from scraper.pipeline.history import utcnow
+from scraper.pipeline.ranking import tokens
+from scraper.pipeline.storage import get_session
+from scraper.settings import settings
+
+ANY = "*"
+
+
+def _split(value: Optional[str]) -> list[str]:
+    return [v.strip() for v in (value or "").split(",") if v.strip()]
+
+
+def _terms(text: Optional[str]) -> list[str]:
+    # "Machine-Learning", "Île-de-France": hyphenated words count as separate words here
+    return tokens((text or "").replace("-", " "))
+
+
+def _phrase(text: str, prefix: str = "") -> frozenset[str]:
+    """Keys a phrase needs: itself if one or two words, else all of its word pairs."""
+    words = _terms(text)
+    n = (len(words) + 1) // 2  # tokens() = n words then n - 1 pairs
+    terms = words[:1] if n == 1 else words[n:]
+    return frozenset(prefix + t for t in terms)
+
+
+@dataclass(frozen=True)
+class Query:
+    search_id: int
+    name: str
+    required: frozenset[str]                          # every key
+    any_of: tuple[tuple[frozenset[str], ...], ...]    # per condition, one alternative fully present
+
+    def matches(self, keys: set[str]) -> bool:
+        return self.required <= keys and all(any(alt <= keys for alt in alts) for alts in self.any_of)
+
+    def anchors(self) -> list[str]:
+        if self.required:
+            return [max(self.required, key=lambda k: (len(k), k))]
+        if self.any_of:
+            alts = min(self.any_of, key=len)
+            return [max(alt, key=lambda k: (len(k), k)) for alt in alts if alt]
+        return [ANY]
+
+
+def compile_search(row: SavedSearch) -> Query:
+    required = frozenset().union(*(_phrase(p) for p in _split(row.keywords)))
+    any_of = []
+    for prefix, values in (("loc:", _split(row.location)), ("tag:", _split(row.tags)),
+                           ("src:", _split(row.sources)), ("profile:", [row.profile] if row.profile else [])):
+        alts = tuple(_phrase(v, prefix) if prefix == "loc:" else frozenset([prefix + v.casefold()])
+                     for v in values)
+        alts = tuple(alt for alt in alts if alt)
+        if alts:
+            any_of.append(alts)
+    return Query(row.id, row.name, required, tuple(any_of))
+
+
+def posting_keys(job: JobRecord) -> set[str]:
+    keys = set(_terms(job.title))
+    keys.update(_terms(job.description_text))
+    keys.update("loc:" + t for t in _terms(job.location))
+    keys.update("tag:" + t.casefold() for t in job.tags or ())
+    keys.update("profile:" + p.casefold() for p in job.profiles or ())
+    keys.add("src:" + (job.source or "").casefold())
+    return keys
+
+
+class SearchIndex:
+    def __init__(self, queries: list[Query]):
+        self.queries = queries
+        self._by_key: dict[str, list[Query]] = defaultdict(list)
+        for q in queries:
+            for key in set(q.anchors()):
+                self._by_key[key].append(q)
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    def candidates(self, keys: set[str]) -> dict[int, Query]:
+        found = {q.search_id: q for q in self._by_key.get(ANY, ())}
+        for key in keys:
+            for q in self._by_key.get(key, ()):
+                found[q.search_id] = q
+        return found
+
+    def match(self, job: JobRecord) -> list[Query]:
+        if not self.queries:
+            return []
+        keys = posting_keys(job)
+        return [q for q in self.candidates(keys).values() if q.matches(keys)]
+
+
+_index: Optional[SearchIndex] = None
+
+
+def load() -> Optional[SearchIndex]:
+    """(Re)compile the active saved searches for this process; None when alerts are off."""
+    global _index
+    if not settings.ALERTS_ENABLED:
+        _index = None
+        return None
+    with get_session(write=False) as s:
+        rows = s.execute(select(SavedSearch).where(SavedSearch.active.is_(True))).scalars().all()
+        _index = SearchIndex([compile_search(r) for r in rows])
+    return _index
+
+
+def on_upsert(sess, row: Job, job: JobRecord) -> int:
+    """Queue alerts for `row` if upsert_job just created it; returns how many were queued."""
+    if not _index or row not in sess.new:
+        return 0
+    matches = _index.match(job)
+    if matches:
+        sess.flush()  # row.id
+        now = utcnow()
+        for q in matches:
+            sess.add(AlertOutbox(search_id=q.search_id, job_id=row.id, created_at=now))
+    return len(matches)
+
+
+def deliver(path: Optional[str] = None) -> Optional[str]:
+    """Append queued alerts to ALERTS_OUTBOX_PATH and mark them delivered; summary line or None."""
+    if not settings.ALERTS_ENABLED:
+        return None
+    path = path or settings.ALERTS_OUTBOX_PATH
+    stmt = (
+        select(AlertOutbox, SavedSearch.name, Job)
+        .join(SavedSearch, SavedSearch.id == AlertOutbox.search_id)
+        .join(Job, Job.id == AlertOutbox.job_id)
+        .where(AlertOutbox.delivered_at.is_(None))
+        .order_by(AlertOutbox.id)
+    )
+    with get_session(write=False) as s:
+        if s.execute(stmt.limit(1)).first() is None:
+            return None
+    with get_session() as s:
+        pending = s.execute(stmt).all()
+        if not pending:
+            return None
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        now = utcnow()
+        per_search: dict[str, int] = defaultdict(int)
+        with open(path, "a", encoding="utf-8") as f:
+            for alert, name, job in pending:
+                f.write(json.dumps({
+                    "search": name, "job_id": job.id, "title": job.title, "company": job.company,
+                    "location": job.location, "source": job.source, "apply_url": job.apply_url,
+                    "matched_at": alert.created_at.isoformat(),
+                }, ensure_ascii=False) + "\n")
+                alert.delivered_at = now
+                per_search[name] += 1
+    counts = "  ".join(f"{name}={n}" for name, n in per_search.items())
+    return f"[alerts] {len(pending)} new matches → {path}: {counts}"
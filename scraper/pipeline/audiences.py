@@ -0,0 +1,31 @@
+# scraper/pipeline/audiences.py
+"""
+Filter profiles ("audiences"): plain config, importable without the adapters (the
+Streamlit app, scripts/saved_searches.py). Keys as in pipeline/filters.py;
+orchestrator re-exports these names.
+"""
+from scraper.pipeline.profiles import ProfileSet
+
+# Default audience. Applied at query time (UI/API) and for the "kept" count of a run;
+# every discovered posting is stored regardless.
+TARGET_FILTERS = {
+    "intern_only": True,     # keep internships/stage/alternance
+    "cs_only": True,         # keep CS/SE/AI/ML/Data
+    "france_only": False,    # set True to keep only France-looking locations
+    "lang_fr_en_only": True, # keep FR/EN postings
+}
+
+# Named audiences, all evaluated on every classified posting in the same pass
+# (pipeline/profiles.py); memberships are stored in job_profiles. Keys as in
+# pipeline/filters.py. After editing, scripts/rebuild_profiles.py updates stored postings.
+FILTER_PROFILES: dict[str, dict] = {
+    "default": TARGET_FILTERS,
+    "fr_ml_interns": {"intern_only": True, "france_only": True, "lang_fr_en_only": True,
+                      "cs_buckets": ["ai-ml", "data"]},
+    "eu_data": {"cs_buckets": ["data"], "countries": [
+        "FR", "DE", "NL", "BE", "LU", "ES", "PT", "IT", "IE", "AT", "CH", "SE", "DK", "FI", "NO", "PL", "CZ", "GB",
+    ]},
+}
+DEFAULT_PROFILE = "default"  # its members are the run's "kept" count
+
+PROFILES = ProfileSet(FILTER_PROFILES)
@@ -0,0 +1,71 @@
+# scraper/pipeline/dedupe.py
+"""
+Stable identity for postings whose source has no job id (Teamtailor, the Workable HTML
+fallback, Ashby anchors, generic HTML without an id field).
+
+`canonical_url` reduces the variants one posting shows up under to a single form:
+lowercase scheme/host, no `www.`, default port, fragment or trailing slash, tracking
+parameters dropped and the rest sorted, a leading locale segment (/en/, /fr-fr/, /en_US/)
+removed and the path lowercased.
+
+`synthetic_job_id` hashes that URL together with the normalized title. The title is part
+of the key (as it was in upsert_job's old (apply_url, title) lookup), so postings that
+share a board URL stay distinct. make_record fills it into `source_job_id` when an adapter
+gives none, so every row goes through the (source, source_job_id) unique index.
+scripts/migrate_synthetic_ids.py converts rows stored before this.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+SYNTHETIC_PREFIX = "h:"
+
+# Only parameters that are never part of a posting's identity: click ids, campaign tags,
+# ATS attribution. Generic names (ref, src, source, share, ...) also carry real job
+# references ("?ref=123") and are kept.
+TRACKING_PARAMS = frozenset({
+    "gclid", "gbraid", "wbraid", "fbclid", "msclkid", "dclid", "yclid", "twclid", "li_fat_id",
+    "mc_cid", "mc_eid", "_hsenc", "_hsmi", "gh_src", "trk",
+    "pk_campaign", "pk_kwd", "pk_source", "pk_medium", "pk_content",
+})
+_TRACKING_PREFIXES = ("utm_", "lever-", "hsa_")
+_LOCALE_RE = re.compile(r"^[a-z]{2}(?:[-_][a-z]{2,4})?$")
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+_WS_RE = re.compile(r"\s+")
+
+
+def _is_tracking(key: str) -> bool:
+    k = key.lower()
+    return k in TRACKING_PARAMS or k.startswith(_TRACKING_PREFIXES)
+
+
+def canonical_url(url: str) -> str:
+    """https://WWW.Acme.com:443/fr-FR/Jobs/42/?utm_source=x&b=2&a=1#apply → https://acme.com/jobs/42?a=1&b=2"""
+    parts = urlsplit((url or "").strip())
+    scheme = (parts.scheme or "https").lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and str(parts.port) != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    segments = [s for s in parts.path.lower().split("/") if s]
+    if segments and _LOCALE_RE.match(segments[0]) and len(segments) > 1:
+        segments = segments[1:]
+    path = "/" + "/".join(segments) if segments else ""
+
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking(k))
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def synthetic_job_id(apply_url: str, title: Optional[str] = None) -> str:
+    """Deterministic id for (canonical apply URL, title): 'h:' + 32 hex chars."""
+    key = canonical_url(apply_url) + "\x1f" + _WS_RE.sub(" ", (title or "").strip()).casefold()
+    return SYNTHETIC_PREFIX + hashlib.sha1(key.encode("utf-8")).hexdigest()[:32]
+
+
+def is_synthetic(source_job_id: Optional[str]) -> bool:
+    return bool(source_job_id) and source_job_id.startswith(SYNTHETIC_PREFIX)
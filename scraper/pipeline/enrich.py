@@ -0,0 +1,221 @@
+# scraper/pipeline/enrich.py
+"""
+Detail-page enrichment.
+
+HTML-backed adapters (Teamtailor, Workable fallback, Ashby anchors, ...) only see a
+title and a link, so the internship/CS heuristics run on the title alone. This stage
+fetches the posting's own page — only when the title already looks relevant and the
+posting has no description yet — and fills description/location/posted_at from its
+LD+JSON JobPosting (or the page text); classification then runs on the enriched text.
+
+Detail pages are kept in a content-addressed cache:
+    <ENRICH_CACHE_DIR>/objects/ab/abcdef...   gzip'd body, named by sha256(body)
+    <ENRICH_CACHE_DIR>/urls/<sha1(url)>       "<sha256> <fetched_at_epoch>"
+Identical pages reached through different URLs are stored once, and re-runs within
+ENRICH_CACHE_TTL_HOURS do not hit the network at all. When a fetch fails, an expired
+cache entry is used instead.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import contextvars
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+import httpx
+
+from scraper.adapters.extract import html_to_text, iter_ldjson, meta_description, page_text, parse_html
+from scraper.client.http import get_client
+from scraper.models.record import JobRecord
+from scraper.pipeline.normalize import passes_title_prefilter
+from scraper.settings import settings
+
+# ---------------------
+# Content-addressed cache
+# ---------------------
+
+class DetailCache:
+    def __init__(self, root: str, ttl_hours: float):
+        self.root = root
+        self.ttl = ttl_hours * 3600
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(root, "urls"), exist_ok=True)
+
+    def _url_path(self, url: str) -> str:
+        return os.path.join(self.root, "urls", hashlib.sha1(url.encode("utf-8")).hexdigest())
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], digest)
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+
+    def get(self, url: str, stale_ok: bool = False) -> Optional[str]:
+        """Cached body of `url`; past ENRICH_CACHE_TTL_HOURS only with stale_ok."""
+        try:
+            with open(self._url_path(url), encoding="ascii") as fh:
+                digest, fetched_at = fh.read().split()
+            if not stale_ok and time.time() - float(fetched_at) > self.ttl:
+                return None
+            with gzip.open(self._object_path(digest), "rb") as fh:
+                return fh.read().decode("utf-8")
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url: str, body: str) -> str:
+        raw = body.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        obj = self._object_path(digest)
+        if not os.path.exists(obj):
+            self._atomic_write(obj, gzip.compress(raw))
+        self._atomic_write(self._url_path(url), f"{digest} {time.time():.0f}".encode("ascii"))
+        return digest
+
+
+_cache: Optional[DetailCache] = None
+
+
+def get_cache() -> DetailCache:
+    global _cache
+    if _cache is None:
+        _cache = DetailCache(settings.ENRICH_CACHE_DIR, settings.ENRICH_CACHE_TTL_HOURS)
+    return _cache
+
+# ---------------------
+# Selection & parsing
+# ---------------------
+
+def needs_enrichment(job: JobRecord) -> bool:
+    """
+    Not enriched yet, has a real link, and the title alone already looks relevant.
+    Postings enriched in an earlier run already carry their stored description here
+    (storage.fill_from_stored runs first), so they are not fetched again.
+    """
+    return (
+        not job.description_text
+        and job.apply_url.startswith(("http://", "https://"))
+        and passes_title_prefilter(job.title)
+    )
+
+
+def _ld_job_posting(html: str) -> Optional[dict]:
+    for obj in iter_ldjson(html):
+        for cand in (obj if isinstance(obj, list) else [obj]):
+            if isinstance(cand, dict) and cand.get("@type") == "JobPosting":
+                return cand
+    return None
+
+
+def _ld_location(posting: dict) -> Optional[str]:
+    loc_obj = posting.get("jobLocation") or {}
+    if isinstance(loc_obj, list) and loc_obj:
+        loc_obj = loc_obj[0]
+    if not isinstance(loc_obj, dict):
+        return None
+    addr = loc_obj.get("address") or {}
+    if not isinstance(addr, dict):
+        return None
+    country = addr.get("addressCountry")
+    if isinstance(country, dict):
+        country = country.get("name")
+    parts = [addr.get("addressLocality"), addr.get("addressRegion"), country]
+    return ", ".join([x for x in parts if isinstance(x, str) and x]) or None
+
+
+def parse_detail(html: str) -> dict:
+    """Description/location/posted_at from a detail page; LD+JSON first, page text second."""
+    posting = _ld_job_posting(html)
+    if posting:
+        desc = html_to_text(posting.get("description") or "")
+        if desc:
+            return {
+                "description_text": desc,
+                "location": _ld_location(posting),
+                "posted_at": posting.get("datePosted"),
+            }
+    doc = parse_html(html)
+    meta = meta_description(doc)
+    return {
+        "description_text": page_text(doc) or meta,
+        "location": _ld_location(posting) if posting else None,
+        "posted_at": posting.get("datePosted") if posting else None,
+    }
+
+# ---------------------
+# Fetching
+# ---------------------
+
+def _fetch_detail(client: httpx.Client, url: str) -> Optional[str]:
+    # Recorded/replayed runs go through the client so the cassette sees every page
+    cache = get_cache() if settings.HTTP_MODE == "live" else None
+    body = cache.get(url) if cache else None
+    if body is not None:
+        return body
+    try:
+        r = client.get(url)
+    except httpx.HTTPError:
+        r = None
+    if r is None or r.status_code != 200 or "html" not in r.headers.get("Content-Type", "html").lower():
+        # A page that fetched before is better than nothing (upsert_job keeps the stored
+        # description either way)
+        return cache.get(url, stale_ok=True) if cache else None
+    if cache:
+        cache.put(url, r.text)
+    return r.text
+
+
+def enrich_job(client: httpx.Client, job: JobRecord) -> JobRecord:
+    html = _fetch_detail(client, job.apply_url)
+    if not html:
+        return job
+    try:
+        found = parse_detail(html)
+    except Exception:
+        return job
+    # In place; tags and scores are recomputed by classification downstream
+    return job.update({k: v for k, v in found.items() if v and not getattr(job, k)})
+
+
+def enrich_jobs(jobs: Iterable[JobRecord], concurrency: Optional[int] = None,
+                batch_size: Optional[int] = None) -> Iterator[JobRecord]:
+    """
+    Pass postings through, enriching the ones that need it.
+
+    Input is consumed in batches so detail fetches run `concurrency` at a time without
+    buffering a whole board; output order matches input order.
+    """
+    concurrency = concurrency or settings.ENRICH_CONCURRENCY
+    batch_size = batch_size or settings.ENRICH_BATCH_SIZE
+    it = iter(jobs)
+    client = None
+    pool = None
+    try:
+        while True:
+            batch = list(islice(it, batch_size))
+            if not batch:
+                return
+            todo = [i for i, j in enumerate(batch) if needs_enrichment(j)]
+            if todo:
+                if pool is None:
+                    client = get_client()
+                    pool = ThreadPoolExecutor(max_workers=concurrency)
+                # each task runs in a copy of this context, so the caller's request_log
+                # also times the detail pages
+                ctxs = {i: contextvars.copy_context() for i in todo}
+                for i, enriched in zip(todo, pool.map(lambda i: ctxs[i].run(enrich_job, client, batch[i]), todo)):
+                    batch[i] = enriched
+            yield from batch
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
+            client.close()
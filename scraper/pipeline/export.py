@@ -0,0 +1,146 @@
+# scraper/pipeline/export.py
+"""
+Columnar export of `jobs` to a Hive-partitioned Parquet dataset for analytics.
+
+    <out>/source=greenhouse/scrape_date=2026-10-19/part-<run>-<chunk>-0.parquet
+
+Rows are streamed out in id order, `chunk_size` at a time, so memory stays flat however
+big the table is. Low-cardinality strings (company, country, language) and
+the tag lists are dictionary-encoded; source and scrape date are partition directories,
+so DuckDB / pandas / pyarrow.dataset can prune on them.
+
+Exports are incremental: the id of the last exported row is kept in
+<out>/_export_state.json and the next run only writes rows after it. Ids only grow and
+scraped_at is set once, on insert, so id order is scrape order; scraped_at itself is not
+a usable checkpoint (one-second CURRENT_TIMESTAMP precision on SQLite, so rows sharing
+the checkpoint's second would compare unequal to it and be skipped).
+pyarrow is an optional dependency (`poetry install -E analytics`).
+"""
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+from sqlalchemy import select
+
+from db.schemas import Job
+
+STATE_FILE = "_export_state.json"
+
+COLUMNS = (
+    Job.id, Job.source, Job.source_job_id, Job.title, Job.company, Job.location,
+    Job.country_code, Job.is_remote, Job.apply_url, Job.description_text, Job.posted_at,
+    Job.scraped_at, Job.language, Job.tags, Job.internship_score, Job.cs_mask, Job.cs_score,
+    Job.is_france,
+)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:  # pragma: no cover - depends on the environment
+        raise RuntimeError(
+            "Parquet export needs pyarrow: `poetry install -E analytics` (or `pip install pyarrow`)"
+        ) from e
+    return pa, pq
+
+
+def _schema(pa):
+    dict_str = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("id", pa.int64()),
+        ("source", pa.string()),
+        ("source_job_id", pa.string()),
+        ("title", pa.string()),
+        ("company", dict_str),
+        ("location", pa.string()),
+        ("country_code", dict_str),
+        ("is_remote", pa.bool_()),
+        ("apply_url", pa.string()),
+        ("description_text", pa.string()),
+        ("posted_at", pa.string()),
+        ("scraped_at", pa.timestamp("us", tz="UTC")),
+        ("language", dict_str),
+        ("tags", pa.list_(dict_str)),
+        ("internship_score", pa.int16()),
+        ("cs_mask", pa.int32()),
+        ("cs_score", pa.int8()),
+        ("is_france", pa.bool_()),
+        ("scrape_date", pa.string()),
+    ])
+
+# --- state ----------------------------------------------------------------------
+
+def load_state(out_dir: str) -> dict:
+    try:
+        with open(os.path.join(out_dir, STATE_FILE), encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(out_dir: str, state: dict) -> None:
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, STATE_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as fh:
+        json.dump(state, fh)
+    os.replace(path + ".tmp", path)
+
+# --- reading --------------------------------------------------------------------
+
+def _as_utc(ts: Optional[datetime]) -> Optional[datetime]:
+    if ts is None:
+        return None
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts.astimezone(timezone.utc)
+
+
+def iter_rows(engine, after_id: Optional[int], chunk_size: int) -> Iterator[list]:
+    """Chunks of rows with an id above `after_id`, in id order."""
+    stmt = select(*COLUMNS).order_by(Job.id)
+    if after_id is not None:
+        stmt = stmt.where(Job.id > after_id)
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(stmt)
+        for part in result.partitions():
+            yield part
+
+
+def _to_table(pa, rows: list):
+    cols: dict[str, list] = {name: [] for name in _schema(pa).names}
+    for r in rows:
+        m = r._mapping
+        for c in COLUMNS:
+            cols[c.key].append(m[c.key])
+        ts = _as_utc(m["scraped_at"])
+        cols["scraped_at"][-1] = ts
+        cols["tags"][-1] = [t for t in (m["tags"] or "").split(",") if t]
+        cols["scrape_date"].append(ts.date().isoformat() if ts else "unknown")
+    return pa.Table.from_pydict(cols, schema=_schema(pa))
+
+# --- main -----------------------------------------------------------------------
+
+def export_jobs(engine, out_dir: str, chunk_size: int = 50_000, full: bool = False) -> dict:
+    """Append rows newer than the last export to the dataset; returns run stats."""
+    pa, pq = _require_pyarrow()
+    state = {} if full else load_state(out_dir)
+    after = state.get("last_id")
+
+    run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S") + "-" + uuid.uuid4().hex[:6]
+    written = 0
+    for n, rows in enumerate(iter_rows(engine, after, chunk_size)):
+        table = _to_table(pa, rows)
+        pq.write_to_dataset(
+            table,
+            root_path=out_dir,
+            partition_cols=["source", "scrape_date"],
+            basename_template=f"part-{run_id}-{n:05d}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        written += len(rows)
+        state = {"last_id": rows[-1]._mapping["id"]}
+        save_state(out_dir, state)
+    return {"rows": written, "run_id": run_id, "state": state}
@@ -0,0 +1,272 @@
+# scraper/pipeline/facets.py
+"""
+Bitset facet index over `jobs`: one bitset per tag, source, country and the remote flag,
+bit i set when the posting with id i has that value.
+
+In memory a bitset is a Python int, so facet filters and counts are integer ops:
+
+    idx.match({"tag": ["python", "rust"], "country": ["FR"], "remote": True})
+        → (tag:python | tag:rust) & country:FR & remote      (OR within a facet, AND across)
+    idx.counts("tag", within=bits)  → {"python": (tag:python & bits).bit_count(), ...}
+
+a few µs per facet value for 100k postings, instead of splitting `jobs.tags` row by row.
+
+On disk (FACET_INDEX_PATH) the index is one file: a JSON header (change_seq watermark, max id and,
+per key, its container kind, offset, length and cardinality) followed by the containers.
+A container is the bitset's bytes, or the sorted uint32 ids when that is smaller (sparse
+values such as rare countries). The file is memory-mapped and a key is only decoded when
+first used, so opening it costs the header and nothing else.
+
+`update(conn)` is incremental: only rows with a change_seq above the previous watermark
+(every row created or changed since: upsert_job and the backfill scripts stamp it with
+storage.change_seq, which is handed out in commit order) or with an id above the
+previous max id are re-read; their bits are cleared everywhere and set again from the
+current values, and bits of deleted postings are masked out. run_once/run_staged
+refresh the file at the end of a run (`refresh`) and scripts/build_facet_index.py
+(re)builds it; the Streamlit app only opens it, for tag filters and counts.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from collections import defaultdict
+from typing import Iterable, Optional
+
+from sqlalchemy import func, or_, select
+
+from db.schemas import Job
+from scraper.pipeline.storage import get_session
+from scraper.settings import settings
+
+FACETS = ("tag", "source", "country", "remote")
+MAGIC = b"JOBFACT2"  # 1: last_seen_at watermark
+_HEADER = struct.Struct("<8sI")  # magic, header length
+_BYTE_BITS = [tuple(i for i in range(8) if b >> i & 1) for b in range(256)]
+
+
+def from_ids(ids: Iterable[int]) -> int:
+    """Bitset with the given bits set."""
+    ids = list(ids)
+    if not ids:
+        return 0
+    buf = bytearray(max(ids) // 8 + 1)
+    for i in ids:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+
+def to_ids(bits: int) -> list[int]:
+    """Set bits of a bitset, ascending."""
+    out: list[int] = []
+    for pos, b in enumerate(bits.to_bytes((bits.bit_length() + 7) // 8, "little")):
+        if b:
+            base = pos * 8
+            out.extend(base + i for i in _BYTE_BITS[b])
+    return out
+
+
+def row_keys(row) -> list[str]:
+    keys = [f"source:{row.source}"]
+    keys.extend(f"tag:{t}" for t in (row.tags or "").split(",") if t)
+    if row.country_code:
+        keys.append(f"country:{row.country_code}")
+    if row.is_remote:
+        keys.append("remote")
+    return keys
+
+
+class FacetIndex:
+    def __init__(self):
+        self.watermark: Optional[int] = None  # highest Job.change_seq indexed
+        self.max_id = 0
+        self.all = 0  # every indexed posting
+        self._bits: dict[str, int] = {}
+        self._stored: dict[str, list] = {}  # key → [kind, offset, length, count], not decoded yet
+        self._mm: Optional[mmap.mmap] = None
+        self._data = 0
+
+    # --- reading ------------------------------------------------------------------------
+
+    def keys(self, facet: Optional[str] = None) -> list[str]:
+        keys = sorted(set(self._bits) | set(self._stored))
+        if facet is None:
+            return keys
+        return [k for k in keys if k == facet or k.startswith(facet + ":")]
+
+    def bits(self, key: str) -> int:
+        if key not in self._bits:
+            stored = self._stored.pop(key, None)
+            self._bits[key] = self._decode(*stored) if stored else 0
+        return self._bits[key]
+
+    def _decode(self, kind: str, offset: int, length: int, count: int) -> int:
+        raw = self._mm[self._data + offset:self._data + offset + length]
+        if kind == "bitmap":
+            return int.from_bytes(raw, "little")
+        ids = array("I")
+        ids.frombytes(raw)
+        return from_ids(ids)
+
+    def value(self, facet: str, value) -> int:
+        if facet == "remote":
+            return self.bits("remote") if value else self.all & ~self.bits("remote")
+        return self.bits(f"{facet}:{value}")
+
+    def match(self, selection: dict) -> int:
+        """Bitset of the postings matching `selection` ({facet: values or bool}); {} → all."""
+        bits = self.all
+        for facet, values in selection.items():
+            if facet == "remote":
+                if values is not None:
+                    bits &= self.value("remote", values)
+                continue
+            if not values:
+                continue
+            if isinstance(values, str):
+                values = [values]
+            any_of = 0
+            for v in values:
+                any_of |= self.value(facet, v)
+            bits &= any_of
+        return bits
+
+    def counts(self, facet: str, within: Optional[int] = None) -> dict[str, int]:
+        """Postings per value of `facet` (among `within`), largest first."""
+        within = self.all if within is None else within
+        out = {}
+        for key in self.keys(facet):
+            n = (self.bits(key) & within).bit_count()
+            if n:
+                out[key.partition(":")[2] or key] = n
+        return dict(sorted(out.items(), key=lambda kv: (-kv[1], kv[0])))
+
+    # --- building -----------------------------------------------------------------------
+
+    def update(self, conn) -> int:
+        """
+        Re-index rows stored or re-seen since the last update; returns how many. `conn`
+        must read from one transaction: the new watermark is taken before the rows, so a
+        row written in between is never covered by it without having been read.
+        """
+        watermark, count, top = conn.execute(
+            select(func.max(Job.change_seq), func.count(Job.id), func.max(Job.id))
+        ).one()
+        cols = (Job.id, Job.source, Job.tags, Job.country_code, Job.is_remote)
+        stmt = select(*cols)
+        if self.watermark is not None or self.max_id:
+            stmt = stmt.where(or_(Job.id > self.max_id, Job.change_seq > (self.watermark or 0)))
+        rows = conn.execute(stmt).all()
+        if count == self.all.bit_count() and (top or 0) == self.all.bit_length() - 1 + (not self.all):
+            live = self.all  # ids only ever grow: same count and same max id → no deletions
+        else:
+            live = from_ids(i for (i,) in conn.execute(select(Job.id)))
+
+        if rows:
+            touched = from_ids(r.id for r in rows)
+            by_key: dict[str, list[int]] = defaultdict(list)
+            for r in rows:
+                for key in row_keys(r):
+                    by_key[key].append(r.id)
+            for key in self.keys():
+                self._bits[key] = self.bits(key) & ~touched
+            for key, ids in by_key.items():
+                self._bits[key] = self.bits(key) | from_ids(ids)
+        if live != self.all:
+            for key in self.keys():
+                self._bits[key] = self.bits(key) & live
+        for key in [k for k in self.keys() if not self.bits(k)]:
+            del self._bits[key]
+        self.all = live
+        self.max_id = max(self.max_id, live.bit_length() - 1, 0)
+        self.watermark = watermark or self.watermark
+        return len(rows)
+
+    # --- persistence --------------------------------------------------------------------
+
+    def save(self, path: Optional[str] = None) -> str:
+        path = path or settings.FACET_INDEX_PATH
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        blobs, header_keys, offset = [], {}, 0
+        for key in ["*", *self.keys()]:
+            bits = self.all if key == "*" else self.bits(key)
+            count = bits.bit_count()
+            nbytes = (bits.bit_length() + 7) // 8
+            if count * 4 < nbytes:
+                blob, kind = array("I", to_ids(bits)).tobytes(), "array"
+            else:
+                blob, kind = bits.to_bytes(nbytes, "little"), "bitmap"
+            header_keys[key] = [kind, offset, len(blob), count]
+            blobs.append(blob)
+            offset += len(blob)
+        header = json.dumps({
+            "watermark": self.watermark,
+            "max_id": self.max_id, "keys": header_keys,
+        }).encode()
+        self.close()
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(MAGIC, len(header)))
+                f.write(header)
+                for blob in blobs:
+                    f.write(blob)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return path
+
+    @classmethod
+    def open(cls, path: Optional[str] = None) -> Optional["FacetIndex"]:
+        """Memory-map a saved index (keys decoded on first use); None if there is none."""
+        path = path or settings.FACET_INDEX_PATH
+        if not os.path.exists(path):
+            return None
+        idx = cls()
+        with open(path, "rb") as f:
+            idx._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, size = _HEADER.unpack_from(idx._mm, 0)
+        if magic != MAGIC:
+            idx.close()
+            return None
+        header = json.loads(idx._mm[_HEADER.size:_HEADER.size + size])
+        idx._data = _HEADER.size + size
+        idx.max_id = header["max_id"]
+        idx.watermark = header["watermark"]
+        idx._stored = header["keys"]
+        idx.all = idx._decode(*idx._stored.pop("*"))
+        return idx
+
+    def close(self) -> None:
+        """Decode whatever is still on disk and release the mapping."""
+        if self._mm is None:
+            return
+        for key in list(self._stored):
+            self.bits(key)
+        self._mm.close()
+        self._mm = None
+
+
+def load_or_build(conn, path: Optional[str] = None) -> FacetIndex:
+    """Saved index brought up to date (and saved again if anything changed)."""
+    idx = FacetIndex.open(path) or FacetIndex()
+    before = (idx.all, idx.watermark)
+    idx.update(conn)
+    if (idx.all, idx.watermark) != before:
+        idx.save(path)
+    return idx
+
+
+def refresh() -> Optional[str]:
+    """Bring FACET_INDEX_PATH up to date after a run; summary line or None."""
+    if not settings.FACET_INDEX:
+        return None
+    with get_session(write=False) as s:
+        idx = load_or_build(s)
+    if not idx.all:
+        return None
+    return f"[facets] {idx.all.bit_count()} postings in {len(idx.keys())} bitsets → {settings.FACET_INDEX_PATH}"
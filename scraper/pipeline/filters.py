@@ -0,0 +1,77 @@
+# scraper/pipeline/filters.py
+"""
+Target filters over the precomputed classification columns.
+
+Every discovered posting is stored with its scores (see normalize.classify), so a
+filter dict like audiences.TARGET_FILTERS is no longer an ingest-time drop: the
+same dict is either evaluated on a classified posting (`passes`, used to count "kept"
+during a run) or turned into WHERE clauses over `jobs` (`filter_clauses`, used by the
+UI/API). Changing a filter is instant and needs no re-scrape.
+
+Keys: intern_only, cs_only, france_only, lang_fr_en_only, remote_only (booleans) and
+countries, cs_buckets, tags (lists; the posting must match at least one entry). Several
+named filter dicts are evaluated at once by pipeline/profiles.py.
+
+A NULL score means "unclassified" (a row stored before the column existed and not
+backfilled yet), not "fails": the score filters let it through, like a NULL language.
+"""
+from sqlalchemy import literal, or_
+
+from db.schemas import Job
+from scraper.pipeline.normalize import (
+    CS_BUCKET_BITS, CS_MIN_SCORE, INTERNSHIP_MIN_SCORE, TARGET_LANGS, tags_to_mask,
+)
+
+
+def passes(features: dict, filters: dict) -> bool:
+    """Python-side twin of `filter_clauses` for one classified posting."""
+    if filters.get("lang_fr_en_only") and features.get("language") not in (*TARGET_LANGS, None):
+        return False
+    if filters.get("intern_only") and _below(features.get("internship_score"), INTERNSHIP_MIN_SCORE):
+        return False
+    if filters.get("cs_only") and _below(features.get("cs_score"), CS_MIN_SCORE):
+        return False
+    if filters.get("france_only") and features.get("is_france") is False:
+        return False
+    if filters.get("remote_only") and not features.get("is_remote"):
+        return False
+    if filters.get("countries") and features.get("country_code") not in {c.upper() for c in filters["countries"]}:
+        return False
+    cs_mask = features.get("cs_mask")
+    if filters.get("cs_buckets") and cs_mask is not None and not cs_mask & _bucket_mask(filters["cs_buckets"]):
+        return False
+    if filters.get("tags") and not (features.get("tag_mask") or 0) & tags_to_mask(filters["tags"]):
+        return False
+    return True
+
+
+def _below(score, minimum) -> bool:
+    return score is not None and score < minimum
+
+
+def _bucket_mask(buckets) -> int:
+    return sum(CS_BUCKET_BITS[b] for b in set(buckets) if b in CS_BUCKET_BITS)
+
+
+def filter_clauses(filters: dict) -> list:
+    """SQLAlchemy conditions on Job equivalent to `passes(…, filters)`."""
+    clauses = []
+    if filters.get("lang_fr_en_only"):
+        clauses.append(or_(Job.language.in_(TARGET_LANGS), Job.language.is_(None)))
+    if filters.get("intern_only"):
+        clauses.append(or_(Job.internship_score >= INTERNSHIP_MIN_SCORE, Job.internship_score.is_(None)))
+    if filters.get("cs_only"):
+        clauses.append(or_(Job.cs_score >= CS_MIN_SCORE, Job.cs_score.is_(None)))
+    if filters.get("france_only"):
+        clauses.append(or_(Job.is_france.is_(True), Job.is_france.is_(None)))
+    if filters.get("remote_only"):
+        clauses.append(Job.is_remote.is_(True))
+    if filters.get("countries"):
+        clauses.append(Job.country_code.in_([c.upper() for c in filters["countries"]]))
+    if filters.get("cs_buckets"):
+        clauses.append(or_(Job.cs_mask.op("&")(_bucket_mask(filters["cs_buckets"])) != 0, Job.cs_mask.is_(None)))
+    if filters.get("tags"):
+        # jobs.tags is comma-joined
+        padded = literal(",") + Job.tags + literal(",")
+        clauses.append(or_(*(padded.like(f"%,{t},%") for t in filters["tags"])))
+    return clauses
@@ -0,0 +1,165 @@
+# scraper/pipeline/health.py
+"""
+Run history per board (`scrape_runs`) and what is derived from it.
+
+Every board a run touches gets one row (`record_run`, written by scrape_adapter and the
+staged pipeline): status (ok | error | unchanged | deferred, see pipeline/schedule.py), seen/kept, duration, requests, bytes,
+failed/timed-out requests and latency quantiles, overall and per host. Latencies are the
+time to response headers measured by the HTTP client (client/http.request_log); requests
+made by the enrichment thread pool are included. Rows carry the run's HTTP_MODE, and
+runs recorded or replayed from a cassette (near-zero latencies, no real yield) are
+left out of everything derived below and of the budget estimates (pipeline/schedule.py).
+
+  host_timeouts            per-host httpx.Timeout from the last TIMEOUT_HISTORY_RUNS runs
+                           of each board: TIMEOUT_P99_FACTOR × the highest per-run p99,
+                           clamped to [TIMEOUT_MIN, TIMEOUT_MAX], connect capped at
+                           CONNECT_TIMEOUT_MAX. A host that only ever timed out gets
+                           TIMEOUT_MIN, so a dead host fails fast instead of costing
+                           REQUEST_TIMEOUT per attempt.
+  apply_adaptive_timeouts  loads them into the HTTP client at the start of a run
+  source_health            per-board trend over recent runs (scripts/source_health.py)
+"""
+from __future__ import annotations
+
+import json
+from collections import defaultdict
+from datetime import datetime
+from statistics import median
+from typing import Optional
+
+import httpx
+from sqlalchemy import func, or_, select
+
+from db.schemas import ScrapeRun
+from scraper.client.http import RequestLog, set_host_timeouts
+from scraper.pipeline.storage import get_session
+from scraper.settings import settings
+
+
+def record_run(label: str, source: str, started_at: datetime, duration: float, status: str,
+               stats: dict, log: Optional[RequestLog] = None, error: Optional[str] = None) -> None:
+    """Append one scrape_runs row; never raises (history must not fail a scrape)."""
+    hosts = log.hosts() if log is not None else {}
+    p50, p99 = log.quantiles() if log is not None else (None, None)
+    net = stats.get("net") or {}
+    row = ScrapeRun(
+        label=label, source=source, started_at=started_at, duration_s=round(duration, 3), status=status,
+        seen=stats.get("seen", 0), kept=stats.get("kept", 0),
+        requests=log.requests if log is not None else net.get("requests", 0),
+        bytes=net.get("bytes"),
+        failures=sum(h["errors"] for h in hosts.values()),
+        timeouts=sum(h["timeouts"] for h in hosts.values()),
+        p50_ms=round(p50 * 1000, 1) if p50 is not None else None,
+        p99_ms=round(p99 * 1000, 1) if p99 is not None else None,
+        hosts=json.dumps(hosts) if hosts else None,
+        error=(error or "")[:2000] or None,
+        http_mode=settings.HTTP_MODE,
+    )
+    try:
+        with get_session() as s:
+            s.add(row)
+    except Exception as e:
+        print(f"[health] could not record run of {label}: {e}")
+
+# Runs against the real boards; record/replay runs only exercise the cassette
+LIVE_RUNS = or_(ScrapeRun.http_mode.is_(None), ScrapeRun.http_mode == "live")
+
+# --- adaptive timeouts --------------------------------------------------------------
+
+def _recent_runs(conn, per_label: int, columns: tuple):
+    """Rows of the last `per_label` live runs of every board."""
+    rn = func.row_number().over(partition_by=ScrapeRun.label, order_by=(ScrapeRun.started_at.desc(), ScrapeRun.id.desc())).label("rn")
+    inner = select(*columns, rn).where(LIVE_RUNS).subquery()
+    return conn.execute(select(*(inner.c[c.key] for c in columns)).where(inner.c.rn <= per_label))
+
+
+def host_timeouts(conn) -> dict[str, httpx.Timeout]:
+    samples: dict[str, int] = defaultdict(int)
+    worst_p99: dict[str, float] = {}
+    timeouts: dict[str, int] = defaultdict(int)
+    for (raw,) in _recent_runs(conn, settings.TIMEOUT_HISTORY_RUNS, (ScrapeRun.hosts,)):
+        for host, h in json.loads(raw or "{}").items():
+            samples[host] += h.get("n") or 0
+            timeouts[host] += h.get("timeouts") or 0
+            if h.get("p99") is not None:
+                worst_p99[host] = max(worst_p99.get(host, 0.0), h["p99"])
+
+    out = {}
+    for host in set(samples) | set(timeouts):
+        if samples[host] >= settings.TIMEOUT_MIN_SAMPLES and host in worst_p99:
+            read = min(max(worst_p99[host] * settings.TIMEOUT_P99_FACTOR, settings.TIMEOUT_MIN), settings.TIMEOUT_MAX)
+            out[host] = httpx.Timeout(read, connect=min(read, settings.CONNECT_TIMEOUT_MAX))
+        elif samples[host] == 0 and timeouts[host]:
+            out[host] = httpx.Timeout(settings.TIMEOUT_MIN)
+    return out
+
+
+def apply_adaptive_timeouts() -> dict[str, httpx.Timeout]:
+    """Install host_timeouts() in client.http (no-op with ADAPTIVE_TIMEOUTS off)."""
+    if not settings.ADAPTIVE_TIMEOUTS:
+        set_host_timeouts({})
+        return {}
+    with get_session(write=False) as s:
+        timeouts = host_timeouts(s)
+    set_host_timeouts(timeouts)
+    return timeouts
+
+# --- trends -------------------------------------------------------------------------
+
+_TREND_COLUMNS = (
+    ScrapeRun.label, ScrapeRun.started_at, ScrapeRun.status, ScrapeRun.duration_s, ScrapeRun.seen,
+    ScrapeRun.kept, ScrapeRun.requests, ScrapeRun.timeouts, ScrapeRun.failures, ScrapeRun.p99_ms,
+)
+
+
+def run_series(conn, label: str, limit: int = 50) -> list[dict]:
+    """Last `limit` runs of one board, oldest first."""
+    stmt = select(*_TREND_COLUMNS).where(ScrapeRun.label == label)
+    stmt = stmt.order_by(ScrapeRun.started_at.desc()).limit(limit)
+    return [dict(r._mapping) for r in conn.execute(stmt)][::-1]
+
+
+def _trend(values: list[float]) -> Optional[float]:
+    """Median of the newer half over the older half (>1: growing); None when too short."""
+    values = [v for v in values if v is not None]
+    if len(values) < 4:
+        return None
+    half = len(values) // 2
+    old, new = median(values[:half]), median(values[half:])
+    return round(new / old, 2) if old else None
+
+
+def source_health(conn, runs: int = 20) -> list[dict]:
+    """
+    One dict per board over its last `runs` runs: ok rate, last status, median duration
+    and p99, seen/kept per run, kept per second of scraping, timeouts, and p99_trend /
+    kept_trend (newer-half median ÷ older-half median). Worst ok rate first.
+    """
+    by_label: dict[str, list] = defaultdict(list)
+    for r in _recent_runs(conn, runs, _TREND_COLUMNS):
+        by_label[r.label].append(r)
+
+    out = []
+    for label, rows in by_label.items():
+        rows.sort(key=lambda r: r.started_at)
+        fetched = [r for r in rows if r.status not in ("unchanged", "deferred")]
+        ok = [r for r in fetched if r.status == "ok"]
+        busy = sum(r.duration_s for r in ok)
+        out.append({
+            "label": label,
+            "runs": len(rows),
+            "ok_rate": round(len(ok) / len(fetched), 2) if fetched else None,
+            "unchanged": sum(1 for r in rows if r.status == "unchanged"),
+            "last_status": rows[-1].status,
+            "last_run": rows[-1].started_at,
+            "duration_s": round(median(r.duration_s for r in fetched), 2) if fetched else None,
+            "p99_ms": median([r.p99_ms for r in ok if r.p99_ms is not None] or [0]) or None,
+            "seen": round(sum(r.seen for r in ok) / len(ok), 1) if ok else None,
+            "kept": round(sum(r.kept for r in ok) / len(ok), 1) if ok else None,
+            "kept_per_s": round(sum(r.kept for r in ok) / busy, 3) if busy else None,
+            "timeouts": sum(r.timeouts for r in rows),
+            "p99_trend": _trend([r.p99_ms for r in ok]),
+            "kept_trend": _trend([r.kept for r in ok]),
+        })
+    out.sort(key=lambda d: (d["ok_rate"] if d["ok_rate"] is not None else 2, d["label"]))
+    return out
@@ -0,0 +1,137 @@
+# scraper/pipeline/history.py
+"""
+Posting history: an append-only `job_versions` log next to the upserted `jobs` rows.
+
+`upsert_job` hashes the source content of every posting it writes (`content_hash`) and
+only appends a version when that hash differs from the stored one, so re-scraping an
+unchanged board writes nothing to the log. `jobs.last_seen_at` is bumped on every upsert,
+which together with `jobs.scraped_at` (first insert) gives how long a posting was open.
+
+Old history is compacted (`compact_versions`, scripts/compact_history.py): before a cutoff,
+each posting keeps its first version plus the last version per day/week bucket.
+
+The query helpers accept a Connection or a Session, for the Streamlit app and scripts.
+"""
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import delete, func, select, union
+
+from db.schemas import Job, JobVersion
+
+# Fields that come from the source; classification is derived and not part of the hash
+HASHED_FIELDS = ("title", "company", "location", "apply_url", "description_text", "posted_at")
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def content_hash(jm) -> str:
+    h = hashlib.sha1()
+    for f in HASHED_FIELDS:
+        h.update((getattr(jm, f) or "").encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+def snapshot(row: Job, kind: str, changed_at: datetime) -> JobVersion:
+    """Version row for the current state of `row` (linked through the relationship, so
+    it can be added before the job itself has been flushed and given an id)."""
+    return JobVersion(
+        job=row, source=row.source, kind=kind, content_hash=row.content_hash, changed_at=changed_at,
+        title=row.title, company=row.company, location=row.location, apply_url=row.apply_url,
+        description_text=row.description_text, posted_at=row.posted_at, tags=row.tags,
+        internship_score=row.internship_score, cs_score=row.cs_score, is_france=row.is_france,
+    )
+
+# --- time buckets -------------------------------------------------------------------
+
+def _dialect(conn) -> str:
+    bind = conn if hasattr(conn, "dialect") else conn.get_bind()
+    return bind.dialect.name
+
+
+def _bucket(conn, col, unit: str):
+    """Truncate a timestamp column to its day/week, as something GROUP BY can use."""
+    if unit not in ("day", "week"):
+        raise ValueError(f"unknown bucket {unit!r} (day|week)")
+    if _dialect(conn) == "sqlite":
+        # Monday of the week / the day, as ISO date strings
+        if unit == "week":
+            return func.date(col, "weekday 0", "-6 days")
+        return func.date(col)
+    return func.date_trunc(unit, col)
+
+# --- compaction ---------------------------------------------------------------------
+
+def compact_versions(sess, before: datetime, bucket: str = "week") -> int:
+    """
+    Thin out versions older than `before`: per posting keep the first version and the
+    last one in each `bucket`; newer versions are untouched. Returns rows deleted.
+    """
+    old = JobVersion.changed_at < before
+    keep = union(
+        select(func.min(JobVersion.id)).where(old).group_by(JobVersion.job_id),
+        select(func.max(JobVersion.id)).where(old).group_by(
+            JobVersion.job_id, _bucket(sess, JobVersion.changed_at, bucket)
+        ),
+    )
+    res = sess.execute(
+        delete(JobVersion).where(old, JobVersion.id.not_in(keep)).execution_options(synchronize_session=False)
+    )
+    return res.rowcount or 0
+
+# --- queries ------------------------------------------------------------------------
+
+def versions_between(conn, start: datetime, end: datetime, source: Optional[str] = None,
+                     job_id: Optional[int] = None) -> list:
+    """Versions with start <= changed_at < end, oldest first (index on changed_at / source / job)."""
+    stmt = select(JobVersion).where(JobVersion.changed_at >= start, JobVersion.changed_at < end)
+    if source:
+        stmt = stmt.where(JobVersion.source == source)
+    if job_id is not None:
+        stmt = stmt.where(JobVersion.job_id == job_id)
+    stmt = stmt.order_by(JobVersion.changed_at, JobVersion.id)
+    if hasattr(conn, "scalars"):  # Session
+        return list(conn.scalars(stmt))
+    return [r[0] for r in conn.execute(stmt)]
+
+
+def weekly_additions(conn, since: Optional[datetime] = None, source: Optional[str] = None) -> list[dict]:
+    """New postings per (source, week): [{"source", "week", "added"}], oldest week first."""
+    week = _bucket(conn, JobVersion.changed_at, "week").label("week")
+    stmt = select(JobVersion.source, week, func.count().label("added")).where(JobVersion.kind == "created")
+    if since is not None:
+        stmt = stmt.where(JobVersion.changed_at >= since)
+    if source:
+        stmt = stmt.where(JobVersion.source == source)
+    stmt = stmt.group_by(JobVersion.source, week).order_by(week, JobVersion.source)
+    return [dict(r._mapping) for r in conn.execute(stmt)]
+
+
+def open_durations(conn, source: Optional[str] = None, where: Optional[list] = None) -> list[dict]:
+    """
+    First/last time each posting was seen and the days in between. A posting that is
+    still listed has last_seen_at at the latest run; one that was taken down stops there.
+    `where` takes extra conditions on Job, e.g. filters.filter_clauses(...).
+    """
+    stmt = select(Job.id, Job.source, Job.title, Job.company, Job.scraped_at, Job.last_seen_at)
+    stmt = stmt.where(Job.last_seen_at.is_not(None), *(where or []))
+    if source:
+        stmt = stmt.where(Job.source == source)
+    out = []
+    for r in conn.execute(stmt):
+        d = dict(r._mapping)
+        first, last = d["scraped_at"], d["last_seen_at"]
+        if first is not None and last is not None:
+            if (first.tzinfo is None) != (last.tzinfo is None):
+                first, last = first.replace(tzinfo=None), last.replace(tzinfo=None)
+            d["open_days"] = max((last - first).total_seconds(), 0) / 86400
+        else:
+            d["open_days"] = None
+        out.append(d)
+    return out
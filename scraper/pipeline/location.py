@@ -0,0 +1,193 @@
+# scraper/pipeline/location.py
+"""
+Location normalization: raw adapter location -> (text, city, country_code, is_remote).
+
+Adapters hand us very different shapes: plain strings ("Paris, FR", "Remote - France"),
+dicts (Personio offices, LD+JSON addresses), lists (Workday `locations`, Personio
+`locations`) or even numbers. Everything is flattened to a display string first, then
+parsed against a small offline gazetteer. Parsing is memoized on the normalized string,
+since a board repeats the same handful of locations across hundreds of postings.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, NamedTuple, Optional
+
+# ----------------
+# Gazetteer
+# ----------------
+
+# Country names (EN/FR/local) -> ISO 3166-1 alpha-2
+COUNTRIES: dict[str, str] = {
+    "france": "FR", "germany": "DE", "allemagne": "DE", "deutschland": "DE",
+    "united kingdom": "GB", "uk": "GB", "royaume-uni": "GB", "great britain": "GB", "england": "GB",
+    "spain": "ES", "espagne": "ES", "españa": "ES", "italy": "IT", "italie": "IT", "italia": "IT",
+    "netherlands": "NL", "pays-bas": "NL", "the netherlands": "NL", "holland": "NL",
+    "belgium": "BE", "belgique": "BE", "switzerland": "CH", "suisse": "CH", "schweiz": "CH",
+    "portugal": "PT", "ireland": "IE", "irlande": "IE", "luxembourg": "LU", "austria": "AT",
+    "autriche": "AT", "sweden": "SE", "suède": "SE", "denmark": "DK", "danemark": "DK",
+    "norway": "NO", "norvège": "NO", "finland": "FI", "finlande": "FI", "poland": "PL",
+    "pologne": "PL", "czech republic": "CZ", "czechia": "CZ", "romania": "RO", "roumanie": "RO",
+    "greece": "GR", "grèce": "GR", "hungary": "HU", "estonia": "EE", "lithuania": "LT",
+    "latvia": "LV", "bulgaria": "BG", "croatia": "HR", "serbia": "RS", "ukraine": "UA",
+    "turkey": "TR", "türkiye": "TR", "israel": "IL", "morocco": "MA", "maroc": "MA",
+    "tunisia": "TN", "tunisie": "TN", "algeria": "DZ", "algérie": "DZ", "egypt": "EG",
+    "south africa": "ZA", "nigeria": "NG", "kenya": "KE",
+    "united states": "US", "united states of america": "US", "usa": "US", "us": "US",
+    "états-unis": "US", "etats-unis": "US", "canada": "CA", "mexico": "MX", "brazil": "BR",
+    "brésil": "BR", "argentina": "AR", "chile": "CL", "colombia": "CO",
+    "india": "IN", "inde": "IN", "china": "CN", "chine": "CN", "japan": "JP", "japon": "JP",
+    "south korea": "KR", "korea": "KR", "singapore": "SG", "singapour": "SG",
+    "hong kong": "HK", "taiwan": "TW", "vietnam": "VN", "indonesia": "ID", "philippines": "PH",
+    "australia": "AU", "australie": "AU", "new zealand": "NZ",
+    "united arab emirates": "AE", "uae": "AE", "saudi arabia": "SA", "qatar": "QA",
+}
+
+# Cities / regions -> ISO 3166-1 alpha-2
+CITIES: dict[str, str] = {
+    # France
+    "paris": "FR", "lyon": "FR", "lille": "FR", "nantes": "FR", "rennes": "FR",
+    "toulouse": "FR", "bordeaux": "FR", "marseille": "FR", "grenoble": "FR", "nice": "FR",
+    "strasbourg": "FR", "montpellier": "FR", "sophia antipolis": "FR", "aix-en-provence": "FR",
+    "la défense": "FR", "la defense": "FR", "boulogne-billancourt": "FR", "issy-les-moulineaux": "FR",
+    "levallois-perret": "FR", "neuilly-sur-seine": "FR", "saclay": "FR", "palaiseau": "FR",
+    "massy": "FR", "nancy": "FR", "metz": "FR", "dijon": "FR", "angers": "FR", "tours": "FR",
+    "brest": "FR", "caen": "FR", "rouen": "FR", "le mans": "FR", "clermont-ferrand": "FR",
+    "saint-étienne": "FR", "annecy": "FR", "orléans": "FR", "reims": "FR", "amiens": "FR",
+    "île-de-france": "FR", "ile-de-france": "FR", "idf": "FR",
+    # Europe
+    "london": "GB", "manchester": "GB", "cambridge": "GB", "oxford": "GB", "edinburgh": "GB",
+    "berlin": "DE", "munich": "DE", "münchen": "DE", "hamburg": "DE", "frankfurt": "DE",
+    "cologne": "DE", "köln": "DE", "stuttgart": "DE", "düsseldorf": "DE",
+    "madrid": "ES", "barcelona": "ES", "valencia": "ES", "lisbon": "PT", "lisbonne": "PT",
+    "porto": "PT", "milan": "IT", "milano": "IT", "rome": "IT", "roma": "IT", "turin": "IT",
+    "amsterdam": "NL", "rotterdam": "NL", "the hague": "NL", "eindhoven": "NL", "utrecht": "NL",
+    "brussels": "BE", "bruxelles": "BE", "antwerp": "BE", "ghent": "BE",
+    "zurich": "CH", "zürich": "CH", "geneva": "CH", "genève": "CH", "lausanne": "CH", "basel": "CH",
+    "dublin": "IE", "vienna": "AT", "wien": "AT", "stockholm": "SE", "copenhagen": "DK",
+    "oslo": "NO", "helsinki": "FI", "warsaw": "PL", "krakow": "PL", "kraków": "PL",
+    "wroclaw": "PL", "prague": "CZ", "bucharest": "RO", "budapest": "HU", "athens": "GR",
+    "tallinn": "EE", "vilnius": "LT", "riga": "LV", "sofia": "BG", "belgrade": "RS",
+    "kyiv": "UA", "istanbul": "TR", "tel aviv": "IL",
+    # Africa / Middle East
+    "casablanca": "MA", "rabat": "MA", "tunis": "TN", "cairo": "EG", "dubai": "AE",
+    "abu dhabi": "AE", "lagos": "NG", "nairobi": "KE", "cape town": "ZA",
+    # Americas
+    "new york": "US", "nyc": "US", "san francisco": "US", "sf": "US", "seattle": "US",
+    "boston": "US", "austin": "US", "chicago": "US", "los angeles": "US", "denver": "US",
+    "mountain view": "US", "palo alto": "US", "menlo park": "US", "sunnyvale": "US",
+    "toronto": "CA", "montreal": "CA", "montréal": "CA", "vancouver": "CA",
+    "são paulo": "BR", "sao paulo": "BR", "mexico city": "MX", "buenos aires": "AR",
+    # Asia-Pacific
+    "bangalore": "IN", "bengaluru": "IN", "hyderabad": "IN", "pune": "IN", "mumbai": "IN",
+    "tokyo": "JP", "seoul": "KR", "shanghai": "CN", "beijing": "CN", "shenzhen": "CN",
+    "sydney": "AU", "melbourne": "AU", "auckland": "NZ",
+}
+
+ISO2 = set(COUNTRIES.values())
+
+_REMOTE_RE = re.compile(
+    r"\b(remote|fully[- ]remote|work from home|wfh|anywhere|télétravail|teletravail|"
+    r"full[- ]remote|à distance|a distance|distanciel)\b",
+    re.I,
+)
+# Separators between location components: "Paris, FR", "Remote - France", "Lyon / Paris"
+_SPLIT_RE = re.compile(r"\s*(?:[,;/|()·•]|\s[-–—]\s)\s*")
+
+# Words that may surround a place name in a component: "Greater London", "Paris Area"
+_QUALIFIERS = frozenset((
+    "greater", "grand", "area", "region", "région", "metro", "metropolitan", "city", "centre",
+    "center", "remote", "hybrid", "onsite", "on-site", "office", "hq", "based", "in", "from",
+    "anywhere", "fully", "télétravail", "teletravail",
+))
+
+# Keys commonly holding location parts in adapter dicts, in display order
+_DICT_KEYS = (
+    "name", "city", "addressLocality", "region", "state", "addressRegion",
+    "country", "countryCode", "country_code", "addressCountry",
+)
+
+
+class ParsedLocation(NamedTuple):
+    text: Optional[str]
+    city: Optional[str]
+    country_code: Optional[str]
+    is_remote: bool
+
+# ----------------
+# Flattening
+# ----------------
+
+def location_text(raw: Any) -> Optional[str]:
+    """Flatten any adapter location shape to a display string (None when empty)."""
+    if raw is None:
+        return None
+    if isinstance(raw, str):
+        return " ".join(raw.split()) or None
+    if isinstance(raw, dict):
+        if isinstance(raw.get("address"), dict):  # LD+JSON Place
+            return location_text(raw["address"])
+        parts = []
+        for key in _DICT_KEYS:
+            val = raw.get(key)
+            if isinstance(val, dict):
+                val = val.get("name")
+            if isinstance(val, str) and val.strip() and val.strip() not in parts:
+                parts.append(val.strip())
+        return ", ".join(parts) or None
+    if isinstance(raw, (list, tuple, set)):
+        parts = []
+        for item in raw:
+            txt = location_text(item)
+            if txt and txt not in parts:
+                parts.append(txt)
+        return " / ".join(parts) or None
+    return str(raw).strip() or None
+
+# ----------------
+# Parsing
+# ----------------
+
+def _fold(s: str) -> str:
+    return unicodedata.normalize("NFC", s).strip().lower()
+
+
+@lru_cache(maxsize=4096)
+def _parse_text(text: str) -> tuple[Optional[str], Optional[str], bool]:
+    is_remote = bool(_REMOTE_RE.search(text))
+    tokens = [t for t in _SPLIT_RE.split(text) if t and t.strip()]
+    city = country = None
+    for i, tok in enumerate(tokens):
+        key = _fold(tok)
+        if country is None:
+            if key in COUNTRIES:
+                country = COUNTRIES[key]
+                continue
+            # "Paris, FR": a bare upper-case alpha-2 code after the first component
+            if i > 0 and len(tok) == 2 and tok.isupper() and tok in ISO2:
+                country = tok
+                continue
+        if city is None and key in CITIES:
+            city = tok.strip()
+            country = country or CITIES[key]
+    if country is None:
+        # "Paris Area", "Remote France", "Greater London": a component that is a known name
+        # once location qualifiers are dropped. Free words around it ("Nice team") don't count.
+        for tok in tokens:
+            words = [w for w in tok.split() if _fold(w) not in _QUALIFIERS]
+            key = _fold(" ".join(words))
+            if key in COUNTRIES:
+                country = COUNTRIES[key]
+                break
+            if key in CITIES:
+                city, country = city or " ".join(words), CITIES[key]
+                break
+    return city, country, is_remote
+
+
+def parse_location(raw: Any) -> ParsedLocation:
+    text = location_text(raw)
+    if not text:
+        return ParsedLocation(None, None, None, False)
+    city, country, is_remote = _parse_text(text)
+    return ParsedLocation(text, city, country, is_remote)
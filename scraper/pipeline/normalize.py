@@ -1,7 +1,9 @@
 # scraper/pipeline/normalize.py
 import re
 from typing import Sequence
-from langdetect import detect, LangDetectException
+from langdetect import DetectorFactory, detect, LangDetectException
+
+from scraper.pipeline.location import parse_location
 
 # ---------------------------
 # Internship detection (FR+EN)
@@ -135,10 +137,21 @@ _fr_re    = _join(FRANCE_HINTS)
 _CS_BUCKET_RES: dict[str, list[re.Pattern]] = {
     bucket: [re.compile(p, re.I) for p in pats] for bucket, pats in CS_BUCKETS.items()
 }
+# Stored as jobs.cs_mask — append new buckets at the end to keep existing bits stable
+CS_BUCKET_BITS: dict[str, int] = {bucket: 1 << i for i, bucket in enumerate(CS_BUCKETS)}
+
+# Thresholds shared by ingest-time and query-time filtering
+INTERNSHIP_MIN_SCORE = 2
+CS_MIN_SCORE = 2
+TARGET_LANGS = ("fr", "en")
 
 # ---------------------
 # Language detection FR/EN
 # ---------------------
+# langdetect samples at random: without a fixed seed a short or mixed text can get a
+# different language (and a different stored `language`) on every run
+DetectorFactory.seed = 0
+
 def detect_lang(text: str) -> str | None:
     try:
         return detect(text)
@@ -148,7 +161,7 @@ def detect_lang(text: str) -> str | None:
 def is_target_lang(text: str) -> bool:
     lang = detect_lang(text or "")
     # allow unknown/short texts too
-    return (lang in {"fr", "en"}) or (lang is None)
+    return (lang in TARGET_LANGS) or (lang is None)
 
 # ---------------------
 # Scoring & heuristics
@@ -177,18 +190,30 @@ def score_internship(title: str, body: str = "") -> int:
 
     return score
 
+def cs_bucket_mask(text: str) -> int:
+    """Bitmask of the CS buckets hit in the text (bit i = i-th key of CS_BUCKETS)."""
+    txt = (text or "")
+    mask = 0
+    for bucket, patterns in _CS_BUCKET_RES.items():
+        if any(p.search(txt) for p in patterns):
+            mask |= CS_BUCKET_BITS[bucket]
+    return mask
+
 def score_cs(text: str) -> int:
     """
     Returns a score; treat >= 2 as CS/Software/AI/Data relevant.
     Counts how many distinct CS buckets are hit in the text (max 5).
     """
-    txt = (text or "")
-    buckets_hit = 0
-    for bucket, patterns in _CS_BUCKET_RES.items():
-        if any(p.search(txt) for p in patterns):
-            buckets_hit += 1
     # Cap to keep scale small
-    return min(buckets_hit, 5)
+    return min(cs_bucket_mask(text).bit_count(), 5)
+
+def passes_title_prefilter(title: str) -> bool:
+    """
+    Cheap title-only check used before spending a request on a detail page:
+    an internship signal or at least one CS bucket in the title.
+    """
+    title = title or ""
+    return bool(_title_re.search(title)) or score_cs(title) >= 1
 
 def looks_like_france(text: str) -> bool:
     return bool(_fr_re.search(text or ""))
@@ -196,37 +221,83 @@ def looks_like_france(text: str) -> bool:
 # ---------------------
 # Tag normalization
 # ---------------------
+_BUCKET_TAGS = {
+    "backend": "backend",
+    "frontend": "frontend",
+    "mobile": "mobile",
+    "data": "data",
+    "ai-ml": "ai-ml",
+    "devops-sre": "devops-sre",
+    "security": "security",
+    "systems-embedded": "systems",
+}
+
+# Popular tech tags (short curated list)
+TECH_TAGS = [
+    "python", "java", "c++", "c#", "golang", "rust",
+    "typescript", "javascript", "react", "node", "kubernetes",
+    "docker", "sql", "postgres", "pytorch", "tensorflow",
+    "spark", "airflow", "dbt",
+]
+
+# Tags are carried as a bitmask over this vocabulary on the ingest hot path.
+# Sorted, so decoding a mask in bit order yields the tags already sorted.
+TAG_VOCAB: tuple[str, ...] = tuple(sorted(set(_BUCKET_TAGS.values()) | set(TECH_TAGS)))
+TAG_BITS: dict[str, int] = {tag: 1 << i for i, tag in enumerate(TAG_VOCAB)}
+MAX_TAGS = 15
+
+def tag_mask(title: str, description: str | None) -> int:
+    """Bitmask (over TAG_VOCAB) of bucket + tech tags found in title/description."""
+    base_l = ((title or "") + "\n" + (description or "")).lower()
+    mask = 0
+    for bucket, label in _BUCKET_TAGS.items():
+        if any(p.search(base_l) for p in _CS_BUCKET_RES[bucket]):
+            mask |= TAG_BITS[label]
+    for t in TECH_TAGS:
+        if t in base_l:
+            mask |= TAG_BITS[t]
+    return mask
+
+def tags_from_mask(mask: int) -> list[str]:
+    tags = [tag for i, tag in enumerate(TAG_VOCAB) if mask >> i & 1]
+    return tags[:MAX_TAGS]
+
+def tags_to_mask(tags) -> int:
+    """Inverse of tags_from_mask; tags outside the vocabulary are dropped."""
+    mask = 0
+    for t in tags or ():
+        mask |= TAG_BITS.get(t, 0)
+    return mask
+
 def normalize_tags(title: str, description: str | None) -> list[str]:
     """
     Produce compact, meaningful tags from buckets + common techs.
     """
-    base = (title or "") + "\n" + (description or "")
-    base_l = base.lower()
-    tags: list[str] = []
-
-    # Bucket tags
-    bucket_to_label = {
-        "backend": "backend",
-        "frontend": "frontend",
-        "mobile": "mobile",
-        "data": "data",
-        "ai-ml": "ai-ml",
-        "devops-sre": "devops-sre",
-        "security": "security",
-        "systems-embedded": "systems",
+    return tags_from_mask(tag_mask(title, description))
+
+# ---------------------
+# Stored classification
+# ---------------------
+def classify(title: str, description: str | None, location: str | None = None,
+             company: str | None = None) -> dict:
+    """
+    Everything we derive and store from a posting's text, in one place so that ingest
+    and scripts/backfill_source.py compute exactly the same thing. The scores are stored
+    as indexed columns so filters can run as WHERE clauses (see scraper/pipeline/filters.py).
+    """
+    title = title or ""
+    body = " ".join([description or "", location or "", company or ""])
+    loc = parse_location(location)
+    cs_mask = cs_bucket_mask(title + " " + body)
+    return {
+        "tag_mask": tag_mask(title, description),
+        "language": detect_lang(title + " " + body),
+        "internship_score": score_internship(title, body),
+        "cs_mask": cs_mask,
+        "cs_score": min(cs_mask.bit_count(), 5),
+        "country_code": loc.country_code,
+        "is_remote": loc.is_remote,
+        "is_france": loc.country_code == "FR" or (
+            loc.country_code is None and looks_like_france(location or "")
+        ),
     }
-    for bucket, label in bucket_to_label.items():
-        if any(p.search(base_l) for p in _CS_BUCKET_RES[bucket]):
-            tags.append(label)
-
-    # Popular tech tags (short curated list)
-    techs = [
-        "python", "java", "c++", "c#", "golang", "rust",
-        "typescript", "javascript", "react", "node", "kubernetes",
-        "docker", "sql", "postgres", "pytorch", "tensorflow",
-        "spark", "airflow", "dbt",
-    ]
-    tags.extend([t for t in techs if t in base_l])
-
-    # De-dupe & limit
-    return sorted(set(tags))[:15]
@@ -1,18 +1,23 @@
 # scraper/pipeline/orchestrator.py
 from __future__ import annotations
 
-from typing import Iterable, Any
+from contextlib import nullcontext
+from typing import Iterable, Any, Optional
 import httpx
+import time
 import traceback
 
-from scraper.pipeline.storage import init_engine, get_session, upsert_job
+from scraper.pipeline.storage import fill_from_stored, init_engine, get_session, upsert_job
+from scraper.pipeline.enrich import enrich_jobs
 from scraper.settings import settings
-from scraper.pipeline.normalize import (
-    looks_like_france,
-    is_target_lang,
-    score_cs,
-    score_internship,
-)
+from scraper.pipeline.normalize import classify
+from scraper.pipeline.audiences import DEFAULT_PROFILE, FILTER_PROFILES, PROFILES, TARGET_FILTERS
+from scraper.models.record import JobRecord, as_record
+from scraper.pipeline.profiling import Profiler
+from scraper.pipeline.schedule import RunBudget, budget_from_settings, deferred_summary, plan
+from scraper.pipeline import alerts, facets, health, probes
+from scraper.pipeline.history import utcnow
+from scraper.client.http import request_log
 
 # Built-in adapters
 from scraper.adapters.greenhouse import GreenhouseAdapter
@@ -29,6 +34,8 @@ SOURCES: list[dict] = [
     # Lever
     {"type": "lever", "slug": "qonto",      "company": "Qonto"},
     {"type": "lever", "slug": "blablacar",  "company": "BlaBlaCar"},
+    # Server-side narrowing (Lever query params), e.g. internships only:
+    # {"type": "lever", "slug": "acme", "company": "Acme", "filters": {"commitment": ["Internship", "Stage"]}},
 
     # Ashby (public job board)
     {"type": "ashby", "slug": "alan", "company": "Alan"},
@@ -54,6 +61,14 @@ SOURCES: list[dict] = [
     {"type": "personio", "slug": "tradedoubler-en", "company": "Tradedoubler"},
     {"type": "personio", "slug": "sungrow-emea",    "company": "Sungrow EMEA"},
     {"type": "personio", "slug": "autarcenergy",    "company": "Autarc"},
+
+    # Generic HTML (selector config, see scraper/adapters/generic_html.py)
+    # {"type": "generic_html", "slug": "acme", "company": "Acme", "config": {
+    #     "list_urls": ["https://acme.example/careers"],
+    #     "item": "//li[contains(@class, 'job')]",
+    #     "fields": {"title": ".//h3", "url": ".//a/@href", "location": ".//*[@class='location']"},
+    #     "pagination": {"param": "page", "start": 1, "max_pages": 5},
+    # }},
 ]
 
 # Tencent (Workday)
@@ -68,14 +83,6 @@ SOURCES += [
      "company": "Tencent Lightspeed Studios"},
 ]
 
-
-TARGET_FILTERS = {
-    "intern_only": True,     # keep internships/stage/alternance
-    "cs_only": True,         # keep CS/SE/AI/ML/Data
-    "france_only": False,    # set True to keep only France-looking locations
-    "lang_fr_en_only": True, # keep FR/EN postings
-}
-
 # --- helpers -----------------------------------------------------------------
 
 _PLACEHOLDER_STRINGS = {
@@ -108,104 +115,198 @@ def _adapter_label(adapter: Any) -> str:
 
 # --- adapter factory ----------------------------------------------------------
 
-def iter_adapters() -> Iterable:
-    for cfg in SOURCES:
-        t = cfg.get("type", "").lower()
-        slug = cfg.get("slug")
-        if _is_placeholder_slug(slug):
-            print(f"[skip] placeholder config for type={t}: slug={slug!r}. Replace with a real board/company slug.")
-            continue
+def build_adapter(cfg: dict):
+    """Instantiate the adapter for one SOURCES entry (None when the entry is skipped)."""
+    t = cfg.get("type", "").lower()
+    slug = cfg.get("slug")
+    if _is_placeholder_slug(slug):
+        print(f"[skip] placeholder config for type={t}: slug={slug!r}. Replace with a real board/company slug.")
+        return None
+
+    if t == "greenhouse":
+        return GreenhouseAdapter(str(slug), company=cfg.get("company"), two_phase=cfg.get("two_phase"))
+
+    elif t == "lever":
+        return LeverAdapter(str(slug), company=cfg.get("company"), filters=cfg.get("filters"))
 
-        if t == "greenhouse":
-            yield GreenhouseAdapter(str(slug), company=cfg.get("company"))
+    elif t == "ashby":
+        return AshbyAdapter(str(slug), company=cfg.get("company"))
 
-        elif t == "lever":
-            yield LeverAdapter(str(slug), company=cfg.get("company"))
+    elif t == "smartrecruiters":
+        from scraper.adapters.smartrecruiters import SmartRecruitersAdapter
+        return SmartRecruitersAdapter(str(slug), company=cfg.get("company"))
 
-        elif t == "ashby":
-            yield AshbyAdapter(str(slug), company=cfg.get("company"))
+    elif t == "recruitee":
+        from scraper.adapters.recruitee import RecruiteeAdapter
+        return RecruiteeAdapter(str(slug), company=cfg.get("company"))
 
-        elif t == "smartrecruiters":
-            from scraper.adapters.smartrecruiters import SmartRecruitersAdapter
-            yield SmartRecruitersAdapter(str(slug), company=cfg.get("company"))
+    elif t == "personio":
+        from scraper.adapters.personio import PersonioAdapter
+        return PersonioAdapter(str(slug), company=cfg.get("company"))
 
-        elif t == "recruitee":
-            from scraper.adapters.recruitee import RecruiteeAdapter
-            yield RecruiteeAdapter(str(slug), company=cfg.get("company"))
+    elif t == "bamboohr":
+        from scraper.adapters.bamboohr import BambooHRAdapter
+        return BambooHRAdapter(str(slug), company=cfg.get("company"))
 
-        elif t == "personio":
-            from scraper.adapters.personio import PersonioAdapter
-            yield PersonioAdapter(str(slug), company=cfg.get("company"))
+    elif t == "workable":
+        from scraper.adapters.workable import WorkableAdapter
+        return WorkableAdapter(str(slug), company=cfg.get("company"))
 
-        elif t == "bamboohr":
-            from scraper.adapters.bamboohr import BambooHRAdapter
-            yield BambooHRAdapter(str(slug), company=cfg.get("company"))
+    elif t == "workday":
+        from scraper.adapters.workday import WorkdayAdapter
+        if not isinstance(slug, dict):
+            print(f"[skip] workday requires slug as dict {{'tenant':..., 'site':...}}. Got: {slug!r}")
+            return None
+        return WorkdayAdapter(slug, company=cfg.get("company"))
 
-        elif t == "workable":
-            from scraper.adapters.workable import WorkableAdapter
-            yield WorkableAdapter(str(slug), company=cfg.get("company"))
+    elif t == "teamtailor":
+        from scraper.adapters.teamtailor import TeamtailorAdapter
+        return TeamtailorAdapter(str(slug), company=cfg.get("company"))
 
-        elif t == "workday":
-            from scraper.adapters.workday import WorkdayAdapter
-            if not isinstance(slug, dict):
-                print(f"[skip] workday requires slug as dict {{'tenant':..., 'site':...}}. Got: {slug!r}")
-                continue
-            yield WorkdayAdapter(slug, company=cfg.get("company"))
+    elif t == "generic_html":
+        from scraper.adapters.generic_html import GenericHTMLAdapter
+        if not isinstance(cfg.get("config"), dict):
+            print(f"[skip] generic_html requires a 'config' dict with list_urls/item/fields. Got: {cfg.get('config')!r}")
+            return None
+        return GenericHTMLAdapter(str(slug), cfg["config"], company=cfg.get("company"))
 
-        elif t == "teamtailor":
-            from scraper.adapters.teamtailor import TeamtailorAdapter
-            yield TeamtailorAdapter(str(slug), company=cfg.get("company"))
+    print(f"[skip] unknown adapter type: {t!r}")
+    return None
 
-        else:
-            print(f"[skip] unknown adapter type: {t!r}")
+
+def iter_adapters() -> Iterable:
+    for cfg in SOURCES:
+        try:
+            adapter = build_adapter(cfg)
+        except Exception as e:  # a bad entry (e.g. a mistyped generic_html XPath) skips that source only
+            print(f"[skip] bad config for type={cfg.get('type')!r} slug={cfg.get('slug')!r}: {type(e).__name__}: {e}")
+            continue
+        if adapter is not None:
+            yield adapter
+
+# --- filtering + storage -----------------------------------------------------
+
+def classify_job(job: JobRecord) -> dict:
+    """Attach the stored classification (scores, language, tags, location flags) and the
+    matching FILTER_PROFILES in place."""
+    features = classify(job.title, job.description_text, job.location, job.company)
+    features["country_code"] = job.country_code or features["country_code"]
+    features["is_remote"] = job.is_remote or features["is_remote"]
+    job.update(features)
+    job.profiles = PROFILES.names_of(PROFILES.match(features))
+    return features
+
+
+def count_profiles(stats: dict, job: JobRecord) -> None:
+    """Add one classified posting to stats["kept"] and the per-profile stats["profiles"]."""
+    profiles = stats.setdefault("profiles", {})
+    for name in job.profiles or ():
+        profiles[name] = profiles.get(name, 0) + 1
+    if DEFAULT_PROFILE in (job.profiles or ()):
+        stats["kept"] += 1
+
+
+def profiles_summary(per_adapter: dict[str, dict]) -> Optional[str]:
+    if len(PROFILES.names) < 2:
+        return None
+    totals = {name: 0 for name in PROFILES.names}
+    for st in per_adapter.values():
+        for name, n in (st.get("profiles") or {}).items():
+            totals[name] = totals.get(name, 0) + n
+    return "[profiles] " + "  ".join(f"{name}={n}" for name, n in totals.items())
+
+
+def scrape_adapter(adapter, stats: dict) -> dict:
+    """Discover one adapter's postings, classify and upsert every one of them.
+
+    All postings are stored with their scores and FILTER_PROFILES memberships; the
+    default profile (TARGET_FILTERS) decides what counts as "kept" (the UI/API apply
+    filters at query time, see pipeline/filters.py).
+    Counts are accumulated into ``stats`` ({"seen": int, "kept": int}) as we go, so a
+    failure halfway through a board still reports what was processed. HTTP/adapter
+    errors propagate to the caller. A board whose change probe matches its last full
+    fetch is skipped with ``stats["unchanged"] = True`` (pipeline/probes.py). Every call
+    appends a scrape_runs row with the outcome and request timings (pipeline/health.py).
+    New postings matching a saved search are queued in alert_outbox (pipeline/alerts.py).
+    """
+    stats.setdefault("seen", 0)
+    stats.setdefault("kept", 0)
+    label = _adapter_label(adapter)
+    started, t0 = utcnow(), time.perf_counter()
+    status, error = "error", None
+    with request_log() as log:
+        try:
+            probe = probes.check(adapter, label)
+            if probe.unchanged:
+                stats["unchanged"] = True
+                status = "unchanged"
+                print(f"[skip] {label} unchanged since last fetch")
+                return stats
+            board = probes.board_key(adapter)
+            # Postings listed without a description take their stored one (no refetch)
+            jobs = fill_from_stored(as_record(j) for j in adapter.discover())
+            if settings.ENRICH_DETAILS:
+                # Title-only postings get their detail page fetched before scoring
+                jobs = enrich_jobs(jobs)
+            for job in jobs:
+                stats["seen"] += 1
+                job.board = board
+                classify_job(job)
+
+                with get_session() as s:
+                    alerts.on_upsert(s, upsert_job(s, job), job)
+                count_profiles(stats, job)
+            probes.record(label, probe)
+            status = "ok"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            if getattr(adapter, "stats", None):
+                stats["net"] = dict(adapter.stats)
+            if getattr(adapter, "invalid", 0):
+                stats["invalid"] = adapter.invalid
+            stats["requests"] = stats.get("requests", 0) + log.requests
+            health.record_run(label, adapter.source_name, started, time.perf_counter() - t0,
+                              status, stats, log, error)
+    return stats
+
+
+def net_summary(net: dict) -> str:
+    """One line from an adapter's network accounting (AsyncBaseAdapter.count_response)."""
+    return f"net: {net['requests']} requests, {net['bytes'] / 1e6:.2f} MB, {net['seconds']:.1f}s"
 
 # --- main run ----------------------------------------------------------------
 
-def run_once():
-    """Run all adapters once, apply filters, upsert into DB."""
+def run_once(profiler: Optional[Profiler] = None, profile_top: int = 5, budget: Optional[RunBudget] = None):
+    """Run all adapters once, classify and upsert into DB; kept = postings matching TARGET_FILTERS.
+
+    With a profiler (pipeline/profiling.py) each adapter runs in its own scope and its
+    top hotspots are printed under its [done] line. With a budget (default from
+    RUN_BUDGET_SECONDS / RUN_BUDGET_REQUESTS) boards run most productive first and those
+    that no longer fit are deferred (pipeline/schedule.py).
+    """
     init_engine(settings.DB_URL)
+    health.apply_adaptive_timeouts()
+    alerts.load()
+    budget = budget or budget_from_settings()
 
-    total = kept = 0
     per_adapter = {}  # {label: {"seen": int, "kept": int}}
-
-    for adapter in iter_adapters():
-        label = _adapter_label(adapter)
+    deferred: list[str] = []
+
+    labelled = [(_adapter_label(a), a) for a in iter_adapters()]
+    queue = plan(labelled) if budget.limited else [(label, a, None) for label, a in labelled]
+    for label, adapter, estimate in queue:
+        if estimate is not None and not budget.admits(estimate):
+            deferred.append(label)
+            health.record_run(label, adapter.source_name, utcnow(), 0.0, "deferred", {})
+            continue
         per_adapter.setdefault(label, {"seen": 0, "kept": 0})
         print(f"[run] {label}")
 
         try:
-            for job in adapter.discover():
-                per_adapter[label]["seen"] += 1
-                total += 1
-
-                # Build a text blob for heuristics
-                text_title = job.title or ""
-                text_body  = " ".join([
-                    job.description_text or "",
-                    job.location or "",
-                    job.company or "",
-                ])
-
-                # Language (FR/EN) filter
-                if TARGET_FILTERS["lang_fr_en_only"] and not is_target_lang(text_title + " " + text_body):
-                    continue
-
-                # Internship filter
-                if TARGET_FILTERS["intern_only"] and score_internship(text_title, text_body) < 2:
-                    continue
-
-                # CS/AI/ML/Data filter
-                if TARGET_FILTERS["cs_only"] and score_cs(text_title + " " + text_body) < 2:
-                    continue
-
-                # France filter (optional)
-                if TARGET_FILTERS["france_only"] and not looks_like_france(job.location or ""):
-                    continue
-
-                with get_session() as s:
-                    upsert_job(s, job)
-                kept += 1
-                per_adapter[label]["kept"] += 1
+            with profiler.scope(label) if profiler else nullcontext():
+                scrape_adapter(adapter, per_adapter[label])
 
         except httpx.HTTPStatusError as e:
             code = e.response.status_code if e.response is not None else "?"
@@ -214,12 +315,27 @@ def run_once():
         except Exception as e:
             print(f"[skip] {label} error: {e}\n{traceback.format_exc()}")
             continue
+        finally:
+            budget.charge(per_adapter[label].get("requests", 0))
 
     # Summary
     print("—" * 60)
     for label, stats in per_adapter.items():
-        print(f"[done] {label:40s} seen={stats['seen']:4d}  kept={stats['kept']:4d}")
+        unchanged = "  unchanged" if stats.get("unchanged") else ""
+        invalid = f"  invalid={stats['invalid']}" if stats.get("invalid") else ""
+        print(f"[done] {label:40s} seen={stats['seen']:4d}  kept={stats['kept']:4d}{unchanged}{invalid}")
+        if stats.get("net"):
+            print(f"         {net_summary(stats['net'])}")
+        if profiler:
+            for line in profiler.top(label, profile_top):
+                print(f"         {line}")
+    for line in (profiles_summary(per_adapter), probes.skip_summary(per_adapter),
+                 deferred_summary(budget, deferred), alerts.deliver(), facets.refresh()):
+        if line:
+            print(line)
     print("—" * 60)
+    total = sum(stats["seen"] for stats in per_adapter.values())
+    kept = sum(stats["kept"] for stats in per_adapter.values())
     return total, kept
 
 if __name__ == "__main__":
@@ -0,0 +1,120 @@
+# scraper/pipeline/probes.py
+"""
+Change probes: skip boards that have not changed since their last full fetch.
+
+Adapters may implement `probe()` (async adapters: `aprobe()`). It is a cheap request,
+e.g. a total count plus the ids of the newest postings, hashed into a signature with
+adapters.base.board_signature. Before a board is scraped, its probe is compared with the
+signature stored in `source_signatures` (one row per `board_key`) at the last successful
+full fetch:
+
+  equal      : the board is skipped; postings seen by that fetch get last_seen_at bumped
+               so pipeline/history.open_durations keeps treating them as open. Postings
+               are matched on jobs.board (`board_key`: source and slug), not on the
+               company name, which two boards can share
+  different,
+  no probe,
+  or failed  : the board is scraped and, if that succeeds, the new signature is stored
+
+A probe only looks at part of a board (edits deep in a long list can go unnoticed), so a
+full fetch is forced once the stored one is older than PROBE_MAX_AGE_HOURS.
+PROBE_BOARDS=False (or `run_scrape_once.py --no-probe`) turns the check off.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, or_, update
+
+from db.schemas import Job, SourceSignature
+from scraper.pipeline.history import utcnow
+from scraper.pipeline.storage import get_session
+from scraper.settings import settings
+
+
+@dataclass
+class ProbeResult:
+    signature: Optional[str]    # None: no probe / probe failed
+    unchanged: bool = False
+    started_at: Optional[datetime] = None
+    board: Optional[str] = None  # board_key: source_signatures row and jobs.board
+
+
+def board_key(adapter) -> str:
+    """"source:slug" of an adapter's board: the key of its source_signatures row and its
+    postings' jobs.board. Unlike the run label (source:company) it tells apart boards
+    that share a company name."""
+    slug = next((getattr(adapter, a, None) for a in ("board_slug", "company_slug", "account_slug")
+                 if getattr(adapter, a, None)), None)
+    if slug is None and getattr(adapter, "tenant", None):
+        slug = f"{adapter.tenant}/{getattr(adapter, 'site', None)}"
+    slug = slug or getattr(adapter, "base", None) or getattr(adapter, "company", None) or "unknown"
+    return f"{adapter.source_name}:{slug}"
+
+
+def _aware(ts: datetime) -> datetime:
+    # SQLite hands timezone-aware columns back naive (stored as UTC)
+    return ts if ts.tzinfo is not None else ts.replace(tzinfo=utcnow().tzinfo)
+
+
+def check(adapter, label: str) -> ProbeResult:
+    """Probe `adapter`; `unchanged` means the full fetch can be skipped."""
+    now = utcnow()
+    key = board_key(adapter)
+    if not settings.PROBE_BOARDS:
+        return ProbeResult(None, started_at=now, board=key)
+    try:
+        sig = adapter.probe()
+    except Exception as e:
+        print(f"[probe] {label} failed, full fetch: {e}")
+        return ProbeResult(None, started_at=now, board=key)
+    if sig is None:
+        return ProbeResult(None, started_at=now, board=key)
+
+    with get_session(write=False) as s:
+        row = s.get(SourceSignature, key)
+        if row is None or row.signature != sig:
+            return ProbeResult(sig, started_at=now, board=key)
+        fetched_at = _aware(row.fetched_at)
+        if now - fetched_at > timedelta(hours=settings.PROBE_MAX_AGE_HOURS):
+            return ProbeResult(sig, started_at=now, board=key)
+    with get_session() as s:
+        row = s.get(SourceSignature, key)
+        row.checked_at = now
+        row.unchanged_runs = (row.unchanged_runs or 0) + 1
+        # Postings the last full fetch saw are still listed (rows stored before jobs.board
+        # existed: matched on source and company until a full fetch sets their board)
+        mine = Job.board == key
+        company = getattr(adapter, "company", None)
+        if company:
+            mine = or_(mine, and_(Job.board.is_(None), Job.source == adapter.source_name, Job.company == company))
+        stmt = update(Job).where(mine, Job.last_seen_at >= fetched_at)
+        s.execute(stmt.values(last_seen_at=now).execution_options(synchronize_session=False))
+    return ProbeResult(sig, unchanged=True, started_at=now, board=key)
+
+
+def record(label: str, result: Optional[ProbeResult]) -> None:
+    """Store the signature of a full fetch that completed successfully."""
+    if result is None or result.signature is None:
+        return
+    key = result.board or label
+    with get_session() as s:
+        row = s.get(SourceSignature, key)
+        if row is None:
+            row = SourceSignature(label=key)
+            s.add(row)
+        row.signature = result.signature
+        row.fetched_at = result.started_at
+        row.checked_at = result.started_at
+        row.unchanged_runs = 0
+
+
+def skip_summary(per_adapter: dict[str, dict]) -> Optional[str]:
+    """Skip-rate line for the run summary (None with probes off)."""
+    if not per_adapter or not settings.PROBE_BOARDS:
+        return None
+    skipped = sum(1 for st in per_adapter.values() if st.get("unchanged"))
+    total = len(per_adapter)
+    return f"[probe] {skipped}/{total} boards unchanged and skipped ({100 * skipped / total:.0f}%)"
@@ -0,0 +1,133 @@
+# scraper/pipeline/profiles.py
+"""
+Named filter profiles, all evaluated in one pass over each classified posting.
+
+audiences.FILTER_PROFILES maps a profile name to a filter dict (the keys of
+pipeline/filters.py). `ProfileSet` compiles them once per process:
+
+  * a classified posting becomes one int, its feature vector: predicate bits
+    (FR/EN language, internship, CS, France, remote), then its cs_mask, its tag_mask
+    and one bit per country code some profile mentions;
+  * every boolean key of every profile becomes "profiles requiring feature bit b", and
+    every list key (countries, cs_buckets, tags) an any-of mask over the feature bits,
+    shared by all profiles with the same list.
+
+`match(features)` then gives the set of matching profiles as a bitmask over profile
+names, using one AND per feature bit the posting is missing and one AND per distinct
+any-of mask, however many profiles there are. A new profile that reuses existing
+criteria adds no work at all. Memberships are stored in `job_profiles`
+(storage.upsert_job); scripts/rebuild_profiles.py recomputes them for stored postings
+after FILTER_PROFILES changes, without re-scraping.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Iterable
+
+from scraper.pipeline.normalize import (
+    CS_BUCKET_BITS, CS_MIN_SCORE, INTERNSHIP_MIN_SCORE, TAG_BITS, TAG_VOCAB, TARGET_LANGS, tags_to_mask,
+)
+
+# Predicate bits, in the order of filters.passes
+LANG_OK = 1 << 0
+INTERN = 1 << 1
+CS = 1 << 2
+FRANCE = 1 << 3
+REMOTE = 1 << 4
+
+_FLAGS = {"lang_fr_en_only": LANG_OK, "intern_only": INTERN, "cs_only": CS, "france_only": FRANCE,
+          "remote_only": REMOTE}
+_CS_SHIFT = 8
+_TAG_SHIFT = _CS_SHIFT + len(CS_BUCKET_BITS)
+_COUNTRY_SHIFT = _TAG_SHIFT + len(TAG_VOCAB)
+
+
+def _bits(mask: int) -> Iterable[int]:
+    while mask:
+        low = mask & -mask
+        yield low
+        mask ^= low
+
+
+class ProfileSet:
+    def __init__(self, profiles: dict[str, dict]):
+        self.names: tuple[str, ...] = tuple(profiles)
+        self.bit: dict[str, int] = {name: 1 << i for i, name in enumerate(self.names)}
+        self.all = (1 << len(self.names)) - 1
+        self._countries: dict[str, int] = {}
+        self._required_by_bit: dict[int, int] = defaultdict(int)  # feature bit → profiles needing it
+        self._any_of: dict[int, int] = defaultdict(int)           # feature mask → profiles needing one of it
+        for name, filters in profiles.items():
+            self._compile(self.bit[name], filters)
+        self.required = 0
+        for b in self._required_by_bit:
+            self.required |= b
+
+    def _compile(self, pbit: int, filters: dict) -> None:
+        for key, flag in _FLAGS.items():
+            if filters.get(key):
+                self._required_by_bit[flag] |= pbit
+        groups = []
+        if filters.get("countries"):
+            groups.append(self._country_mask(filters["countries"], allocate=True))
+        if filters.get("cs_buckets"):
+            unknown = set(filters["cs_buckets"]) - set(CS_BUCKET_BITS)
+            if unknown:
+                raise ValueError(f"unknown cs_buckets {sorted(unknown)} (choose from {', '.join(CS_BUCKET_BITS)})")
+            groups.append(sum(CS_BUCKET_BITS[b] for b in set(filters["cs_buckets"])) << _CS_SHIFT)
+        if filters.get("tags"):
+            unknown = set(filters["tags"]) - set(TAG_BITS)
+            if unknown:
+                raise ValueError(f"unknown tags {sorted(unknown)} (see normalize.TAG_VOCAB)")
+            groups.append(tags_to_mask(filters["tags"]) << _TAG_SHIFT)
+        for mask in groups:
+            self._any_of[mask] |= pbit
+
+    def _country_mask(self, codes: Iterable[str], allocate: bool = False) -> int:
+        mask = 0
+        for code in codes:
+            code = (code or "").upper()
+            if code not in self._countries:
+                if not allocate:
+                    continue
+                self._countries[code] = 1 << (_COUNTRY_SHIFT + len(self._countries))
+            mask |= self._countries[code]
+        return mask
+
+    def features(self, f: dict) -> int:
+        """Feature vector of one posting's classification (normalize.classify output or a jobs row).
+        NULL scores are unclassified and pass, as in filters.passes."""
+        v = 0
+        if f.get("language") in (*TARGET_LANGS, None):
+            v |= LANG_OK
+        intern, cs = f.get("internship_score"), f.get("cs_score")
+        if intern is None or intern >= INTERNSHIP_MIN_SCORE:
+            v |= INTERN
+        if cs is None or cs >= CS_MIN_SCORE:
+            v |= CS
+        if f.get("is_france") is not False:
+            v |= FRANCE
+        if f.get("is_remote"):
+            v |= REMOTE
+        cs_mask = f.get("cs_mask")
+        v |= (sum(CS_BUCKET_BITS.values()) if cs_mask is None else cs_mask) << _CS_SHIFT
+        v |= (f.get("tag_mask") or 0) << _TAG_SHIFT
+        if f.get("country_code"):
+            v |= self._country_mask([f["country_code"]])
+        return v
+
+    def match_vector(self, v: int) -> int:
+        failed = 0
+        for b in _bits(self.required & ~v):
+            failed |= self._required_by_bit[b]
+        for mask, profiles in self._any_of.items():
+            if not v & mask:
+                failed |= profiles
+        return self.all & ~failed
+
+    def match(self, f: dict) -> int:
+        """Bitmask over `names` of the profiles this classified posting belongs to."""
+        return self.match_vector(self.features(f))
+
+    def names_of(self, mask: int) -> tuple[str, ...]:
+        return tuple(name for name in self.names if mask & self.bit[name])
@@ -0,0 +1,229 @@
+# scraper/pipeline/profiling.py
+"""
+Per-adapter profiling for run_once (scripts/run_scrape_once.py --profile ...).
+
+A profiler opens one `scope(label)` per adapter. After the run, `top(label, n)` gives the
+hotspots printed under that adapter's [done] line, and `write(out_dir)` writes
+`run.folded`, a collapsed-stack file whose root frame is the adapter label. It can be
+passed straight to flamegraph.pl, speedscope or inferno.
+
+  sampling : a background thread snapshots every thread's stack each `interval` seconds.
+             Stacks are exact and include time blocked in the network or pool threads.
+             Idle pool workers waiting for work are dropped.
+  cprofile : deterministic, main thread only. Also writes `<label>.prof` for pstats or
+             snakeviz. cProfile only records caller→callee edges, so the folded stacks
+             hang each function's own time under its heaviest caller chain.
+
+Register new profilers in PROFILERS.
+"""
+from __future__ import annotations
+
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Optional
+
+
+def _safe(label: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", label).strip("_") or "adapter"
+
+
+_CWD = os.getcwd().replace("\\", "/") + "/"
+_STDLIB_RE = re.compile(r"/lib/python\d+\.\d+/(.*)$")
+
+
+def _short(filename: str) -> str:
+    """…/site-packages/langdetect/detector.py → langdetect/detector.py"""
+    f = filename.replace("\\", "/")
+    for anchor in ("/site-packages/", "/dist-packages/"):
+        if anchor in f:
+            return f.rsplit(anchor, 1)[1]
+    m = _STDLIB_RE.search(f)
+    if m:
+        return m.group(1)
+    if f.startswith(_CWD):
+        return f[len(_CWD):]
+    return "/".join(f.split("/")[-2:])
+
+
+def _frame_name(filename: str, func: str) -> str:
+    # ';' separates frames in the folded format
+    return f"{_short(filename)}:{func}".replace(";", ":")
+
+
+class Profiler:
+    name = "base"
+
+    @contextmanager
+    def scope(self, label: str):
+        yield
+
+    def top(self, label: str, n: int = 5) -> list[str]:
+        return []
+
+    def write(self, out_dir: str) -> list[str]:
+        return []
+
+# --- sampling -----------------------------------------------------------------------
+
+class SamplingProfiler(Profiler):
+    name = "sampling"
+    _IDLE = ("concurrent/futures/thread.py:_worker", "queue.py:get")
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: dict[str, Counter] = defaultdict(Counter)  # label → {folded stack: samples}
+        self._label: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _is_idle(self, frames: list[str]) -> bool:
+        for a, b in zip(frames, frames[1:]):
+            if (a, b) == self._IDLE:
+                return True
+        return False
+
+    def _sample(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            label = self._label
+            if label is None:
+                continue
+            for tid, frame in sys._current_frames().items():
+                if tid == me:
+                    continue
+                frames = []
+                while frame is not None:
+                    frames.append(_frame_name(frame.f_code.co_filename, frame.f_code.co_name))
+                    frame = frame.f_back
+                frames.reverse()
+                if frames and not self._is_idle(frames):
+                    self.stacks[label][";".join(frames)] += 1
+
+    @contextmanager
+    def scope(self, label: str):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._sample, name="profiler-sampler", daemon=True)
+            self._thread.start()
+        self._label = label
+        try:
+            yield
+        finally:
+            self._label = None
+
+    def top(self, label: str, n: int = 5) -> list[str]:
+        stacks = self.stacks.get(label)
+        if not stacks:
+            return []
+        total = sum(stacks.values())
+        leaf = Counter()
+        for stack, count in stacks.items():
+            leaf[stack.rsplit(";", 1)[-1]] += count
+        return [f"{100 * c / total:5.1f}%  ~{c * self.interval:6.2f}s  {name}" for name, c in leaf.most_common(n)]
+
+    def write(self, out_dir: str) -> list[str]:
+        self._stop.set()
+        path = os.path.join(out_dir, "run.folded")
+        with open(path, "w", encoding="utf-8") as fh:
+            for label, stacks in self.stacks.items():
+                for stack, count in stacks.items():
+                    fh.write(f"{_safe(label)};{stack} {count}\n")
+        return [path]
+
+# --- cProfile -----------------------------------------------------------------------
+
+class CProfileProfiler(Profiler):
+    name = "cprofile"
+
+    def __init__(self):
+        self.profiles: dict[str, cProfile.Profile] = {}
+
+    @contextmanager
+    def scope(self, label: str):
+        prof = self.profiles.setdefault(label, cProfile.Profile())
+        prof.enable()
+        try:
+            yield
+        finally:
+            prof.disable()
+
+    def _stats(self, label: str) -> Optional[pstats.Stats]:
+        prof = self.profiles.get(label)
+        if prof is None:
+            return None
+        try:
+            return pstats.Stats(prof)
+        except TypeError:  # nothing was recorded
+            return None
+
+    @staticmethod
+    def _name(func: tuple) -> str:
+        filename, _, name = func
+        return _frame_name(filename, name) if filename != "~" else name.strip("<>").replace(";", ":")
+
+    def top(self, label: str, n: int = 5) -> list[str]:
+        st = self._stats(label)
+        if st is None:
+            return []
+        total = st.total_tt or 1e-9
+        rows = sorted(st.stats.items(), key=lambda kv: kv[1][2], reverse=True)[:n]
+        return [f"{100 * tt / total:5.1f}%  {tt:7.2f}s  {self._name(func)}  ({nc} calls)"
+                for func, (cc, nc, tt, ct, callers) in rows]
+
+    def _folded(self, st: pstats.Stats) -> Counter:
+        out = Counter()
+        for func, (cc, nc, tt, ct, callers) in st.stats.items():
+            if tt <= 0:
+                continue
+            chain, seen, cur = [func], {func}, func
+            while len(chain) < 64:
+                parents = st.stats[cur][4]
+                # heaviest caller by cumulative time through that edge
+                parent = max(parents, key=lambda p: parents[p][3], default=None)
+                if parent is None or parent in seen:
+                    break
+                chain.append(parent)
+                seen.add(parent)
+                cur = parent
+            out[";".join(self._name(f) for f in reversed(chain))] += int(tt * 1e6)  # µs
+        return out
+
+    def write(self, out_dir: str) -> list[str]:
+        paths = []
+        folded = os.path.join(out_dir, "run.folded")
+        with open(folded, "w", encoding="utf-8") as fh:
+            for label in self.profiles:
+                st = self._stats(label)
+                if st is None:
+                    continue
+                prof_path = os.path.join(out_dir, f"{_safe(label)}.prof")
+                st.dump_stats(prof_path)
+                paths.append(prof_path)
+                for stack, us in self._folded(st).items():
+                    if us:
+                        fh.write(f"{_safe(label)};{stack} {us}\n")
+        return [folded] + paths
+
+
+PROFILERS: dict[str, type[Profiler]] = {
+    SamplingProfiler.name: SamplingProfiler,
+    CProfileProfiler.name: CProfileProfiler,
+}
+
+
+def make_profiler(name: str, **kwargs) -> Profiler:
+    try:
+        cls = PROFILERS[name]
+    except KeyError:
+        raise ValueError(f"unknown profiler {name!r} (choose from {', '.join(PROFILERS)})")
+    return cls(**kwargs)
+
+
+def default_out_dir() -> str:
+    return os.path.join(".cache", "profiles", time.strftime("%Y%m%d-%H%M%S"))
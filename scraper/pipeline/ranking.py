@@ -0,0 +1,263 @@
+# scraper/pipeline/ranking.py
+"""
+Relevance ranking of stored postings against a free-text candidate profile
+("python, machine learning, stage, Paris").
+
+Each posting is turned into hashed word uni/bigrams (title counted RANK_TITLE_WEIGHT
+times, then tags and the start of the description; lowercased, accents stripped),
+stored as log-scaled term counts in one CSR matrix of RANK_FEATURES columns. Document
+frequencies are kept next to it, so IDF is applied at query time and the matrix never
+has to be rewritten when new postings change it. Scoring a profile is TF-IDF cosine:
+
+    scores = X @ (idf² · q) / ‖X · idf‖
+
+i.e. one sparse matrix-vector product over every posting (row norms are cached between
+updates), ~15 ms for 100k rows.
+
+The index is saved to RANK_INDEX_PATH (one .npz) and brought up to date incrementally
+(`update`): postings with a new id are appended, postings whose content_hash changed
+are re-appended and their old row is marked dead, removed postings are marked dead.
+Dead rows are dropped once they exceed a fifth of the matrix. An index is not
+thread-safe: `update` changes it in place, so callers sharing one (the Streamlit app,
+whose sessions share a cached index) serialize updates and scoring. The Streamlit app
+updates and uses it for its "Relevance" sort; scripts/build_ranking_index.py (re)builds it.
+numpy/scipy are optional dependencies (`poetry install -E ranking`).
+"""
+from __future__ import annotations
+
+import math
+import os
+import re
+import tempfile
+import unicodedata
+import zlib
+from collections import Counter
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+
+from db.schemas import Job
+from scraper.settings import settings
+
+try:
+    import numpy as np
+    import scipy.sparse as sp
+except ImportError:  # pragma: no cover - depends on the environment
+    np = sp = None
+
+COLUMNS = (Job.id, Job.content_hash, Job.title, Job.tags, Job.description_text)
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[.\-][a-z0-9+#]+)*")
+_COMBINING_RE = re.compile(r"[\u0300-\u036f]")
+_hash_cache: dict[str, int] = {}
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError(
+            "Relevance ranking needs numpy and scipy: `poetry install -E ranking` (or `pip install numpy scipy`)"
+        )
+
+
+def _fold(text: str) -> str:
+    text = text.casefold()
+    if text.isascii():
+        return text
+    return _COMBINING_RE.sub("", unicodedata.normalize("NFKD", text))
+
+
+def tokens(text: Optional[str]) -> list[str]:
+    """Word unigrams and bigrams of `text`."""
+    words = _TOKEN_RE.findall(_fold(text or ""))
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def _feature(token: str, n_features: int) -> int:
+    h = _hash_cache.get(token)
+    if h is None:
+        h = zlib.crc32(token.encode("utf-8"))  # stable across processes, unlike hash()
+        if len(_hash_cache) < 1_000_000:
+            _hash_cache[token] = h
+    return h % n_features
+
+
+def posting_terms(title: Optional[str], tags: Optional[str], description: Optional[str]) -> Counter:
+    """Term counts of one posting (title counted RANK_TITLE_WEIGHT times)."""
+    terms = Counter(tokens((description or "")[: settings.RANK_MAX_DESCRIPTION_CHARS]))
+    terms.update(tokens((tags or "").replace(",", " ")))
+    weight = max(1, settings.RANK_TITLE_WEIGHT)
+    for t in tokens(title):
+        terms[t] += weight
+    return terms
+
+
+def _features(terms: Counter, n_features: int) -> dict[int, int]:
+    out: dict[int, int] = {}
+    for t, n in terms.items():
+        col = _feature(t, n_features)
+        out[col] = out.get(col, 0) + n
+    return out
+
+
+class RankingIndex:
+    def __init__(self, n_features: Optional[int] = None):
+        _require_numpy()
+        self.n_features = n_features or settings.RANK_FEATURES
+        self.matrix = sp.csr_matrix((0, self.n_features), dtype=np.float32)
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.hashes = np.zeros(0, dtype="S40")
+        self.live = np.zeros(0, dtype=bool)
+        self.df = np.zeros(self.n_features, dtype=np.int32)
+        self._norms = None
+        self._idf = None
+
+    def __len__(self) -> int:
+        return int(self.live.sum())
+
+    # --- building -----------------------------------------------------------------------
+
+    def _rows(self, rows: list) -> "sp.csr_matrix":
+        indptr, indices, data = [0], [], []
+        for r in rows:
+            counts = _features(posting_terms(r.title, r.tags, r.description_text), self.n_features)
+            cols = sorted(counts)
+            indices.extend(cols)
+            data.extend(1.0 + math.log(counts[c]) for c in cols)
+            indptr.append(len(indices))
+        return sp.csr_matrix(
+            (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+            shape=(len(rows), self.n_features),
+        )
+
+    def _append(self, rows: list) -> None:
+        if not rows:
+            return
+        block = self._rows(rows)
+        self.matrix = sp.vstack([self.matrix, block], format="csr")
+        self.ids = np.concatenate([self.ids, np.fromiter((r.id for r in rows), np.int64, len(rows))])
+        self.hashes = np.concatenate([self.hashes, np.array([(r.content_hash or "").encode() for r in rows], "S40")])
+        self.live = np.concatenate([self.live, np.ones(len(rows), dtype=bool)])
+        np.add.at(self.df, block.indices, 1)
+
+    def _kill(self, positions) -> None:
+        for pos in positions:
+            if self.live[pos]:
+                self.live[pos] = False
+                start, end = self.matrix.indptr[pos], self.matrix.indptr[pos + 1]
+                np.subtract.at(self.df, self.matrix.indices[start:end], 1)
+
+    def _compact(self) -> None:
+        keep = np.flatnonzero(self.live)
+        self.matrix = self.matrix[keep]
+        self.ids, self.hashes, self.live = self.ids[keep], self.hashes[keep], self.live[keep]
+
+    def update(self, conn, chunk_size: int = 5000) -> tuple[int, int, int]:
+        """Bring the index in line with `jobs`; returns (added, changed, removed)."""
+        current = {jid: (h or "").encode() for jid, h in conn.execute(select(Job.id, Job.content_hash))}
+        live_pos = np.flatnonzero(self.live)
+        indexed = dict(zip(self.ids[live_pos].tolist(), live_pos.tolist()))
+
+        removed = [pos for jid, pos in indexed.items() if jid not in current]
+        changed = [jid for jid, pos in indexed.items() if jid in current and current[jid] != self.hashes[pos]]
+        added = [jid for jid in current if jid not in indexed]
+        self._kill(removed + [indexed[jid] for jid in changed])
+
+        todo = sorted(changed + added)
+        for i in range(0, len(todo), chunk_size):
+            part = todo[i:i + chunk_size]
+            rows = conn.execute(select(*COLUMNS).where(Job.id.in_(part)).order_by(Job.id)).all()
+            self._append(rows)
+
+        if len(self.live) and (~self.live).sum() > len(self.live) / 5:
+            self._compact()
+        if removed or todo:
+            self._norms = self._idf = None
+        return len(added), len(changed), len(removed)
+
+    # --- persistence --------------------------------------------------------------------
+
+    def save(self, path: Optional[str] = None) -> str:
+        path = path or settings.RANK_INDEX_PATH
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # a temporary file of its own: app sessions and the build script may save at once
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp.npz")
+        m = self.matrix
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                np.savez(fh, data=m.data, indices=m.indices, indptr=m.indptr, n_features=self.n_features,
+                         ids=self.ids, hashes=self.hashes, live=self.live, df=self.df)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return path
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> Optional["RankingIndex"]:
+        """The saved index, or None when missing / built with another RANK_FEATURES."""
+        _require_numpy()
+        path = path or settings.RANK_INDEX_PATH
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as z:
+            if int(z["n_features"]) != settings.RANK_FEATURES:
+                return None
+            idx = cls(int(z["n_features"]))
+            idx.matrix = sp.csr_matrix((z["data"], z["indices"], z["indptr"]),
+                                       shape=(len(z["ids"]), idx.n_features))
+            idx.ids, idx.hashes, idx.live, idx.df = z["ids"], z["hashes"], z["live"], z["df"]
+        return idx
+
+    # --- scoring ------------------------------------------------------------------------
+
+    def _weights(self):
+        if self._idf is None:
+            n = len(self)
+            self._idf = (np.log((1.0 + n) / (1.0 + self.df)) + 1.0).astype(np.float32)
+            norms = np.sqrt(self.matrix.multiply(self.matrix) @ (self._idf ** 2))
+            norms[norms == 0] = 1.0
+            self._norms = norms
+        return self._idf, self._norms
+
+    def scores(self, profile: str):
+        """Cosine similarity of every row with `profile` (dead rows score 0)."""
+        idf, norms = self._weights()
+        q = np.zeros(self.n_features, dtype=np.float32)
+        for col, n in _features(Counter(tokens(profile)), self.n_features).items():
+            q[col] = 1.0 + math.log(n)
+        q *= idf
+        q_norm = float(np.linalg.norm(q)) or 1.0
+        out = (self.matrix @ (q * idf)) / (norms * q_norm)
+        out[~self.live] = 0.0
+        return out
+
+    def scores_for(self, profile: str, job_ids):
+        """Scores aligned with `job_ids` (array-like); 0 for postings not in the index."""
+        job_ids = np.asarray(job_ids, dtype=np.int64)
+        s = self.scores(profile)
+        pos = np.flatnonzero(self.live)
+        by_id = pos[np.argsort(self.ids[pos])]
+        if not len(by_id):
+            return np.zeros(len(job_ids), dtype=np.float32)
+        at = np.searchsorted(self.ids[by_id], job_ids).clip(max=len(by_id) - 1)
+        found = self.ids[by_id[at]] == job_ids
+        return np.where(found, s[by_id[at]], 0.0).astype(np.float32)
+
+    def rank(self, profile: str, job_ids: Optional[Iterable[int]] = None,
+             limit: Optional[int] = None) -> list[tuple[int, float]]:
+        """[(job_id, score)], best first; restricted to `job_ids` when given."""
+        s = self.scores(profile)
+        pos = np.flatnonzero(self.live)
+        if job_ids is not None:
+            pos = pos[np.isin(self.ids[pos], np.fromiter(job_ids, np.int64))]
+        if limit and limit < len(pos):
+            pos = pos[np.argpartition(-s[pos], limit - 1)[:limit]]  # top `limit` unordered, O(n)
+        order = pos[np.argsort(-s[pos], kind="stable")]
+        return list(zip(self.ids[order].tolist(), s[order].astype(float).tolist()))
+
+
+def load_or_build(conn, path: Optional[str] = None) -> RankingIndex:
+    """Saved index brought up to date (and saved again if anything changed)."""
+    idx = RankingIndex.load(path) or RankingIndex()
+    if any(idx.update(conn)):
+        idx.save(path)
+    return idx
@@ -0,0 +1,153 @@
+# scraper/pipeline/schedule.py
+"""
+Time/request-budgeted runs: scrape the most productive boards first, defer the rest.
+
+With RUN_BUDGET_SECONDS and/or RUN_BUDGET_REQUESTS set (or run_scrape_once.py
+--budget-seconds / --budget-requests), `plan()` orders the boards from the scrape_runs
+history (pipeline/health.py):
+
+  1. boards deferred SCHEDULE_MAX_DEFERRALS runs in a row (so nothing starves)
+  2. boards without history (their yield is unknown until they have run once)
+  3. boards with an ok run by kept postings per second of scraping, highest first
+  4. boards whose recent runs all failed (or were unchanged)
+
+Before each board, `RunBudget.admits()` checks that its expected duration and requests
+(medians of its recent ok runs, else of its recent runs of any outcome) still fit in what is left of the budget; a board that
+does not fit is deferred and smaller ones further down still get their chance; a starved
+board (1.) runs as long as any budget is left, even if it will not fit. A board that has
+started always finishes, so a run can overshoot by one board (by one per discover worker
+in the staged pipeline, whose workers are admitted concurrently). Deferred boards
+are reported in the run summary and recorded as status "deferred" in scrape_runs.
+Without a budget the SOURCES order is kept.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from statistics import median
+from typing import Optional
+
+from db.schemas import ScrapeRun
+from scraper.pipeline.health import _recent_runs
+from scraper.pipeline.storage import get_session
+from scraper.settings import settings
+
+
+@dataclass
+class Estimate:
+    runs: int = 0                       # recent runs that were not deferred; 0: no history
+    kept_per_s: Optional[float] = None  # None: no ok run among them
+    duration_s: float = 0.0
+    requests: int = 0
+    deferrals: int = 0                  # consecutive deferred runs up to now
+
+
+_COLUMNS = (ScrapeRun.id, ScrapeRun.label, ScrapeRun.started_at, ScrapeRun.status, ScrapeRun.duration_s,
+            ScrapeRun.kept, ScrapeRun.requests)
+
+
+def estimates(conn, runs: Optional[int] = None) -> dict[str, Estimate]:
+    """Per-board yield estimate from its last `runs` runs (default SCHEDULE_HISTORY_RUNS)."""
+    by_label: dict[str, list] = defaultdict(list)
+    for r in _recent_runs(conn, runs or settings.SCHEDULE_HISTORY_RUNS, _COLUMNS):
+        by_label[r.label].append(r)
+
+    out = {}
+    for label, rows in by_label.items():
+        rows.sort(key=lambda r: (r.started_at, r.id), reverse=True)  # newest first
+        est = Estimate()
+        for r in rows:
+            if r.status != "deferred":
+                break
+            est.deferrals += 1
+        ran = [r for r in rows if r.status != "deferred"]
+        ok = [r for r in ran if r.status == "ok"]
+        est.runs = len(ran)
+        if ok:
+            busy = sum(r.duration_s for r in ok)
+            est.kept_per_s = sum(r.kept for r in ok) / busy if busy else 0.0
+        basis = ok or ran
+        if basis:
+            est.duration_s = median(r.duration_s for r in basis)
+            est.requests = int(median(r.requests for r in basis))
+        out[label] = est
+    return out
+
+
+def plan(labelled: list[tuple[str, object]]) -> list[tuple[str, object, Estimate]]:
+    """Order (label, adapter) pairs for a budgeted run (see module docstring)."""
+    with get_session(write=False) as s:
+        est = estimates(s)
+    rows = [(label, adapter, est.get(label) or Estimate()) for label, adapter in labelled]
+
+    def priority(item):
+        i, (_, _, e) = item
+        if e.deferrals >= settings.SCHEDULE_MAX_DEFERRALS:
+            return (0, -e.deferrals, i)
+        if not e.runs:
+            return (1, 0.0, i)
+        if e.kept_per_s is None:
+            return (3, 0.0, i)
+        return (2, -e.kept_per_s, i)
+
+    return [row for _, row in sorted(enumerate(rows), key=priority)]
+
+
+class RunBudget:
+    """Wall-clock and request allowance of one run (0 / None = unlimited); thread-safe."""
+
+    def __init__(self, seconds: Optional[float] = None, requests: Optional[int] = None):
+        self.seconds = seconds or 0
+        self.requests = requests or 0
+        self.used_requests = 0
+        self._t0 = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def limited(self) -> bool:
+        return bool(self.seconds or self.requests)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._t0
+
+    def charge(self, requests: int) -> None:
+        with self._lock:
+            self.used_requests += requests
+
+    def admits(self, est: Estimate) -> bool:
+        """Does `est` fit in what is left? A starved board only needs some budget left."""
+        starved = est.deferrals >= settings.SCHEDULE_MAX_DEFERRALS
+        duration, requests = (0.0, 0) if starved else (est.duration_s, est.requests)
+        with self._lock:
+            if self.seconds and self.elapsed + duration >= self.seconds:
+                return False
+            if self.requests and (self.used_requests >= self.requests
+                                  or self.used_requests + requests > self.requests):
+                return False
+            return True
+
+    def describe(self) -> str:
+        parts = []
+        if self.seconds:
+            parts.append(f"{self.elapsed:.1f}/{self.seconds:g}s")
+        if self.requests:
+            parts.append(f"{self.used_requests}/{self.requests} requests")
+        return ", ".join(parts)
+
+
+def budget_from_settings(seconds: Optional[float] = None, requests: Optional[int] = None) -> RunBudget:
+    return RunBudget(
+        settings.RUN_BUDGET_SECONDS if seconds is None else seconds,
+        settings.RUN_BUDGET_REQUESTS if requests is None else requests,
+    )
+
+
+def deferred_summary(budget: RunBudget, deferred: list[str]) -> Optional[str]:
+    if not budget.limited:
+        return None
+    if not deferred:
+        return f"[budget] {budget.describe()} used, nothing deferred"
+    return f"[budget] {budget.describe()} used, deferred to next run ({len(deferred)}): " + ", ".join(deferred)
@@ -0,0 +1,369 @@
+# scraper/pipeline/stages.py
+"""
+Staged scrape: discover → enrich → classify → write, connected by bounded queues.
+
+run_once() interleaves everything in one loop per adapter, so a slow commit stalls the
+HTTP reads and a large board holds up the database. Here each step is a pool of
+threads. Stages hand postings to each other through `queue.Queue(PIPELINE_QUEUE_SIZE)`.
+A full queue blocks the producer (backpressure), so the slowest stage sets the
+throughput, and memory stays bounded by the queue sizes plus the items in flight.
+
+  discover : adapters run PIPELINE_DISCOVER_WORKERS at a time; each posting is queued
+             as soon as the adapter yields it (adapter errors are reported per source);
+             postings without a description take their stored one (storage.fill_from_stored).
+             Under a run budget boards are taken in pipeline/schedule.py order and
+             deferred once they no longer fit
+  enrich   : detail-page fetch + parse for title-only postings (pipeline/enrich.py)
+  classify : normalize.classify + FILTER_PROFILES via orchestrator.classify_job
+  write    : upserts in batches of up to PIPELINE_WRITE_BATCH per session/commit. A
+             batch that fails is retried posting by posting, one savepoint each, so
+             only the postings that fail again are lost (and their board is not marked
+             fetched). Keep one writer on SQLite; with more, two batches could race on
+             the same new (source, source_job_id).
+
+A batch that raises in any stage is dropped; its items are counted per board (items are
+tuples whose first element is the board's label) as not written, and those boards are
+not marked fetched either, so the next run fetches them in full.
+
+"seen" is counted as postings are discovered, "kept" and the profile counts as they are
+written.
+
+Each stage reports items, time spent working, time blocked on a full downstream queue
+and time starved on an empty upstream one (summed over its workers). Each queue reports
+its max and mean depth (sampled). `scripts/run_scrape_once.py --staged` runs it.
+
+Profiling covers the whole run as one "pipeline" scope, which only means something to
+the sampling profiler (it samples every stage thread). cProfile would only see the main
+thread waiting in join(), so run_staged rejects it.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+import traceback
+from collections import Counter
+from contextlib import nullcontext
+from typing import Callable, Iterable, Optional
+
+import httpx
+
+from scraper.client.http import get_client, request_log
+from scraper.pipeline import alerts, facets, health, probes
+from scraper.pipeline.history import utcnow
+from scraper.pipeline.schedule import RunBudget, budget_from_settings, deferred_summary, plan
+from scraper.pipeline.enrich import enrich_job, needs_enrichment
+from scraper.pipeline.storage import fill_from_stored, get_session, init_engine, upsert_job
+from scraper.models.record import as_record
+from scraper.settings import settings
+
+_END = object()
+
+
+class Stage:
+    """A pool of `workers` threads applying `fn(items, emit)` to batches from `inbox`.
+
+    Items are tuples, the board label first; `failed` counts, per label, the items of
+    batches that raised.
+    """
+
+    def __init__(self, name: str, fn: Callable[[list, Callable], None], workers: int,
+                 inbox: queue.Queue, outbox: Optional[queue.Queue], batch_size: int = 1):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.inbox = inbox
+        self.outbox = outbox
+        self.batch_size = max(1, batch_size)
+        self.downstream_workers = 0
+        self.items = 0
+        self.errors = 0
+        self.failed: Counter = Counter()
+        self.busy = 0.0      # inside fn (includes blocked)
+        self.blocked = 0.0   # waiting for room downstream
+        self.starved = 0.0   # waiting for input
+        self._alive = self.workers
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+
+    def emit(self, item) -> None:
+        t0 = time.perf_counter()
+        self.outbox.put(item)
+        dt = time.perf_counter() - t0
+        with self._lock:
+            self.blocked += dt
+
+    def _next_batch(self) -> tuple[list, bool]:
+        t0 = time.perf_counter()
+        item = self.inbox.get()
+        waited = time.perf_counter() - t0
+        with self._lock:
+            self.starved += waited
+        if item is _END:
+            return [], True
+        batch = [item]
+        while len(batch) < self.batch_size:
+            try:
+                item = self.inbox.get_nowait()
+            except queue.Empty:
+                break
+            if item is _END:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        done = False
+        while not done:
+            batch, done = self._next_batch()
+            if not batch:
+                continue
+            t0 = time.perf_counter()
+            try:
+                self.fn(batch, self.emit)
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                    self.failed.update(item[0] for item in batch)
+                print(f"[error] stage {self.name}: {e}\n{traceback.format_exc()}")
+            dt = time.perf_counter() - t0
+            with self._lock:
+                self.busy += dt
+                self.items += len(batch)
+        with self._lock:
+            self._alive -= 1
+            last = self._alive == 0
+        if last and self.outbox is not None:
+            for _ in range(self.downstream_workers):
+                self.outbox.put(_END)
+
+    def start(self) -> None:
+        for i in range(self.workers):
+            t = threading.Thread(target=self._run, name=f"{self.name}-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def join(self) -> None:
+        for t in self._threads:
+            t.join()
+
+
+class DepthMonitor(threading.Thread):
+    """Samples every queue's depth at a fixed interval (max / mean per queue)."""
+
+    def __init__(self, queues: dict[str, queue.Queue], interval: float = 0.05):
+        super().__init__(name="queue-depth", daemon=True)
+        self.queues = queues
+        self.interval = interval
+        self.max = {k: 0 for k in queues}
+        self.total = {k: 0 for k in queues}
+        self.samples = 0
+        self._stop_evt = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_evt.wait(self.interval):
+            self.samples += 1
+            for k, q in self.queues.items():
+                d = q.qsize()
+                self.total[k] += d
+                if d > self.max[k]:
+                    self.max[k] = d
+
+    def stop(self) -> None:
+        self._stop_evt.set()
+        self.join()
+
+    def mean(self, k: str) -> float:
+        return self.total[k] / self.samples if self.samples else 0.0
+
+# --- pipeline -----------------------------------------------------------------------
+
+def run_staged(adapters: Optional[Iterable] = None, profiler=None, profile_top: int = 5,
+               budget: Optional[RunBudget] = None):
+    """Staged equivalent of orchestrator.run_once(); returns (seen, kept)."""
+    from scraper.pipeline.orchestrator import (
+        _adapter_label, classify_job, count_profiles, iter_adapters, net_summary, profiles_summary,
+    )
+
+    if profiler is not None and profiler.name == "cprofile":
+        raise ValueError("cProfile only sees the main thread; profile a staged run with the sampling profiler")
+    init_engine(settings.DB_URL)
+    health.apply_adaptive_timeouts()
+    alerts.load()
+    budget = budget or budget_from_settings()
+    if adapters is None:
+        adapters = iter_adapters()
+
+    size = max(1, settings.PIPELINE_QUEUE_SIZE)
+    sources_q: queue.Queue = queue.Queue()
+    queues = {
+        "discovered": queue.Queue(size),
+        "enriched": queue.Queue(size),
+        "classified": queue.Queue(size),
+    }
+    per_adapter: dict[str, dict] = {}
+    stats_lock = threading.Lock()
+    client: Optional[httpx.Client] = get_client() if settings.ENRICH_DETAILS else None
+    fetched: dict[str, probes.ProbeResult] = {}  # boards fully discovered; signatures saved after the writes
+    deferred: list[str] = []
+
+    def discover(items, emit):
+        for label, adapter, estimate in items:
+            if estimate is not None and not budget.admits(estimate):
+                with stats_lock:
+                    deferred.append(label)
+                    per_adapter.pop(label, None)
+                health.record_run(label, adapter.source_name, utcnow(), 0.0, "deferred", {})
+                continue
+            print(f"[run] {label}")
+            started, t0 = utcnow(), time.perf_counter()
+            status, error = "error", None
+            with request_log() as log:
+                try:
+                    probe = probes.check(adapter, label)
+                    if probe.unchanged:
+                        status = "unchanged"
+                        with stats_lock:
+                            per_adapter[label]["unchanged"] = True
+                        print(f"[skip] {label} unchanged since last fetch")
+                        continue
+                    board = probes.board_key(adapter)
+                    for job in fill_from_stored(as_record(j) for j in adapter.discover()):
+                        with stats_lock:
+                            per_adapter[label]["seen"] += 1
+                        job.board = board
+                        emit((label, job))
+                    status = "ok"
+                    with stats_lock:
+                        fetched[label] = probe
+                except httpx.HTTPStatusError as e:
+                    code = e.response.status_code if e.response is not None else "?"
+                    error = f"HTTP {code}"
+                    print(f"[skip] {label} HTTP {code} → {e.request.method} {e.request.url if e.request else ''}")
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                    print(f"[skip] {label} error: {e}\n{traceback.format_exc()}")
+                finally:
+                    budget.charge(log.requests)
+                    # recorded after the writes, once seen/kept are known
+                    with stats_lock:
+                        per_adapter[label]["run"] = (adapter.source_name, started, time.perf_counter() - t0,
+                                                     status, log, error)
+                        if getattr(adapter, "stats", None):
+                            per_adapter[label]["net"] = dict(adapter.stats)
+                        if getattr(adapter, "invalid", 0):
+                            per_adapter[label]["invalid"] = adapter.invalid
+
+    def enrich(items, emit):
+        for label, job in items:
+            if client is not None and needs_enrichment(job):
+                job = enrich_job(client, job)
+            emit((label, job))
+
+    def classify(items, emit):
+        for label, job in items:
+            classify_job(job)
+            emit((label, job))
+
+    def write(items, emit):
+        try:
+            with get_session() as s:
+                for _, job in items:
+                    alerts.on_upsert(s, upsert_job(s, job), job)
+            written = items
+        except Exception as e:
+            # One bad posting must not cost the whole batch: redo it row by row, one
+            # savepoint per posting, and only drop the ones that fail again
+            print(f"[stages] write batch of {len(items)} failed ({type(e).__name__}: {e}); retrying per posting")
+            written, lost = [], []
+            with get_session() as s:
+                for label, job in items:
+                    try:
+                        with s.begin_nested():
+                            alerts.on_upsert(s, upsert_job(s, job), job)
+                        written.append((label, job))
+                    except Exception as e:
+                        lost.append(label)
+                        print(f"[skip] {label} posting {job.source_job_id}: {type(e).__name__}: {e}")
+            with stats_lock:
+                for label in lost:
+                    per_adapter[label]["lost"] = per_adapter[label].get("lost", 0) + 1
+        with stats_lock:
+            for label, job in written:
+                count_profiles(per_adapter[label], job)
+
+    stages = [
+        Stage("discover", discover, settings.PIPELINE_DISCOVER_WORKERS, sources_q, queues["discovered"]),
+        Stage("enrich", enrich, settings.ENRICH_CONCURRENCY, queues["discovered"], queues["enriched"]),
+        Stage("classify", classify, settings.PIPELINE_CLASSIFY_WORKERS, queues["enriched"], queues["classified"]),
+        Stage("write", write, settings.PIPELINE_WRITE_WORKERS, queues["classified"], None,
+              batch_size=settings.PIPELINE_WRITE_BATCH),
+    ]
+    for up, down in zip(stages, stages[1:]):
+        up.downstream_workers = down.workers
+
+    labelled = [(_adapter_label(a), a) for a in adapters]
+    ordered = plan(labelled) if budget.limited else [(label, a, None) for label, a in labelled]
+    for label, adapter, estimate in ordered:
+        per_adapter.setdefault(label, {"seen": 0, "kept": 0})
+        sources_q.put((label, adapter, estimate))
+    for _ in range(stages[0].workers):
+        sources_q.put(_END)
+
+    monitor = DepthMonitor(queues)
+    t0 = time.perf_counter()
+    try:
+        with profiler.scope("pipeline") if profiler else nullcontext():
+            monitor.start()
+            for st in stages:
+                st.start()
+            for st in stages:
+                st.join()
+    finally:
+        monitor.stop()
+        if client is not None:
+            client.close()
+    wall = time.perf_counter() - t0
+    # A board with postings that could not be written, or that a failed batch of any
+    # stage dropped, is fetched again next run
+    for st in stages:
+        for label, n in st.failed.items():
+            per_adapter[label]["lost"] = per_adapter[label].get("lost", 0) + n
+    for label, probe in fetched.items():
+        if not per_adapter[label].get("lost"):
+            probes.record(label, probe)
+    for label, st in per_adapter.items():
+        if "run" in st:
+            source, started, duration, status, log, error = st.pop("run")
+            health.record_run(label, source, started, duration, status, st, log, error)
+
+    # Summary
+    print("—" * 60)
+    for label, st in per_adapter.items():
+        unchanged = "  unchanged" if st.get("unchanged") else ""
+        lost = f"  not written={st['lost']}" if st.get("lost") else ""
+        invalid = f"  invalid={st['invalid']}" if st.get("invalid") else ""
+        print(f"[done] {label:40s} seen={st['seen']:4d}  kept={st['kept']:4d}{unchanged}{lost}{invalid}")
+        if st.get("net"):
+            print(f"         {net_summary(st['net'])}")
+    print("—" * 60)
+    print(f"[stages] wall {wall:.2f}s")
+    print(f"  {'stage':9s} {'workers':>7s} {'items':>7s} {'work s':>8s} {'blocked s':>10s} {'starved s':>10s} {'errors':>6s}")
+    for st in stages:
+        print(f"  {st.name:9s} {st.workers:7d} {st.items:7d} {st.busy - st.blocked:8.2f} "
+              f"{st.blocked:10.2f} {st.starved:10.2f} {st.errors:6d}")
+    print(f"  {'queue':11s} {'max':>5s} {'mean':>7s}  (capacity {size})")
+    for k in queues:
+        print(f"  {k:11s} {monitor.max[k]:5d} {monitor.mean(k):7.1f}")
+    for line in (profiles_summary(per_adapter), probes.skip_summary(per_adapter),
+                 deferred_summary(budget, deferred), alerts.deliver(), facets.refresh()):
+        if line:
+            print(line)
+    if profiler:
+        for line in profiler.top("pipeline", profile_top):
+            print(f"         {line}")
+    print("—" * 60)
+
+    total = sum(st["seen"] for st in per_adapter.values())
+    kept = sum(st["kept"] for st in per_adapter.values())
+    return total, kept
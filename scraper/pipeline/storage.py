@@ -1,36 +1,221 @@
-from contextlib import contextmanager
-from sqlalchemy import create_engine
+import threading
+from contextlib import contextmanager, nullcontext
+from itertools import islice
+from typing import Iterable, Iterator
+from sqlalchemy import create_engine, event, inspect, literal, select, text, update
+from sqlalchemy.sql.elements import TextClause
 from sqlalchemy.orm import sessionmaker
 from db.base import Base
-from db.schemas import Job
+from db.schemas import Counter, Job, JobProfile
 from scraper.models.job import JobModel
+from scraper.models.record import JobRecord
+from scraper.pipeline.history import content_hash, snapshot, utcnow
+from scraper.settings import settings
 
 _engine = None
 _Session = None
+# One writing session at a time per process on SQLite (see make_engine)
+_write_lock = threading.RLock()
 
 
-def init_engine(db_url: str):
+def make_engine(db_url: str, readonly: bool = False, tuned: bool | None = None):
+    """
+    Engine factory shared by the scraper and the Streamlit app.
+
+    For file-backed SQLite with SQLITE_TUNED (default) every connection gets:
+      journal_mode=WAL       readers see the last commit and never block the writer
+      synchronous=NORMAL     fsync at checkpoints instead of every commit (safe with WAL)
+      mmap_size/cache_size   SQLITE_MMAP_MB / SQLITE_CACHE_MB of page cache
+      busy_timeout           wait SQLITE_BUSY_TIMEOUT_MS for a lock instead of failing
+    Writes start their transaction with BEGIN IMMEDIATE (taken at the first write, so
+    plain reads never hold the write lock), and `get_session` serializes writing
+    sessions within the process (read-only ones, `write=False`, skip the lock), so concurrent writers queue instead of erroring with
+    "database is locked". Read-only engines (the UI) set query_only.
+    """
+    tuned = settings.SQLITE_TUNED if tuned is None else tuned
+    if not db_url.startswith("sqlite") or not tuned:
+        return create_engine(db_url, future=True)
+
+    busy_ms = settings.SQLITE_BUSY_TIMEOUT_MS
+    connect_args = {"timeout": busy_ms / 1000, "check_same_thread": False}
+    if not readonly:
+        connect_args["isolation_level"] = "IMMEDIATE"
+    engine = create_engine(db_url, future=True, connect_args=connect_args)
+    in_memory = ":memory:" in db_url or db_url.rstrip("/") in ("sqlite:", "sqlite:/")
+
+    @event.listens_for(engine, "connect")
+    def _pragmas(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        if not in_memory:
+            cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cur.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_MB * 1024 * 1024}")
+        cur.execute(f"PRAGMA cache_size={-settings.SQLITE_CACHE_MB * 1024}")  # negative = KiB
+        cur.execute(f"PRAGMA busy_timeout={busy_ms}")
+        cur.execute("PRAGMA temp_store=MEMORY")
+        if readonly:
+            cur.execute("PRAGMA query_only=ON")
+        cur.close()
+
+    return engine
+
+
+def init_engine(db_url: str, tuned: bool | None = None):
     global _engine, _Session
-    _engine = create_engine(db_url, future=True)
+    _engine = make_engine(db_url, tuned=tuned)
     Base.metadata.create_all(_engine)
+    _ensure_schema(_engine)
     _Session = sessionmaker(bind=_engine, expire_on_commit=False)
+    with get_session(write=False) as s:
+        missing = s.get(Counter, CHANGE_COUNTER) is None
+    if missing:
+        with get_session() as s:
+            if s.get(Counter, CHANGE_COUNTER) is None:
+                s.add(Counter(name=CHANGE_COUNTER, value=0))
+
+
+def get_engine():
+    return _engine
+
+
+# jobs columns written by normalize.classify (and scripts/backfill_source.py)
+_CLASSIFIED_COLUMNS = {"language", "tags", "internship_score", "cs_mask", "cs_score", "country_code",
+                       "is_remote", "is_france"}
+
+
+def _ensure_schema(engine):
+    """
+    Lightweight migration for existing databases: create_all() only creates missing
+    tables, so columns and indexes added to existing tables later are created here,
+    with their constant default if they have one. Classification columns start out NULL
+    (filters treat NULL as unclassified); scripts/backfill_source.py fills them.
+    """
+    insp = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        existing = {c["name"] for c in insp.get_columns(table.name)}
+        added = []
+        for col in table.columns:
+            if col.name in existing:
+                continue
+            default = _column_default(col, engine.dialect)
+            if default is None and not col.nullable:
+                raise RuntimeError(f"cannot add NOT NULL column {table.name}.{col.name} without a constant default")
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {col.name} {col.type.compile(dialect=engine.dialect)}"
+            if default is not None:
+                ddl += f" DEFAULT {default}"
+            with engine.begin() as conn:
+                conn.execute(text(ddl))
+            added.append(col.name)
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+        if table.name == Job.__tablename__ and set(added) & _CLASSIFIED_COLUMNS:
+            with engine.connect() as conn:
+                if conn.execute(text(f"SELECT 1 FROM {table.name} LIMIT 1")).first():
+                    print(f"[schema] added jobs.{', jobs.'.join(added)}; existing rows stay unclassified "
+                          f"until `python scripts/backfill_source.py` is run")
+
+
+def _column_default(col, dialect) -> str | None:
+    """SQL literal for the column's constant default (server_default or scalar default), else None."""
+    if col.server_default is not None and hasattr(col.server_default, "arg"):
+        arg = col.server_default.arg
+        if isinstance(arg, str):
+            return literal(arg).compile(dialect=dialect, compile_kwargs={"literal_binds": True}).string
+        if isinstance(arg, TextClause):
+            return arg.text
+        return None  # func.now() & co.: not allowed in ADD COLUMN on SQLite
+    if col.default is not None and col.default.is_scalar:
+        return literal(col.default.arg).compile(dialect=dialect, compile_kwargs={"literal_binds": True}).string
+    return None
+
+
+CHANGE_COUNTER = "jobs"
+
+
+def change_seq(sess) -> int:
+    """
+    This transaction's jobs change number, to stamp the rows it changes (Job.change_seq).
+    Taking one increments the counter row, which stays locked until commit (on SQLite:
+    the write lock), so numbers are handed out in commit order: once a reader sees N
+    committed, every change numbered N or lower is visible too, unlike a wall-clock
+    stamp taken before a slow commit. One increment per transaction (per savepoint).
+    """
+    tx = sess.get_nested_transaction() or sess.get_transaction()
+    cached = sess.info.get("change_seq")
+    if cached is not None and cached[0] is tx:
+        return cached[1]
+    stmt = update(Counter).where(Counter.name == CHANGE_COUNTER).values(value=Counter.value + 1)
+    seq = sess.execute(stmt.returning(Counter.value)).scalar_one()
+    sess.info["change_seq"] = (tx, seq)
+    return seq
 
 
 @contextmanager
-def get_session():
-    sess = _Session()
-    try:
-        yield sess
-        sess.commit()
-    except Exception:
-        sess.rollback()
-        raise
-    finally:
-        sess.close()
-
-
-def upsert_job(sess, jm: JobModel):
-    # Upsert by (source, source_job_id) when available; else uniqueness by (apply_url, title)
+def get_session(write: bool = True):
+    """
+    Session committed on exit (rolled back on error). On SQLite writing sessions hold the
+    process write lock (see make_engine); pass write=False for sessions that only read,
+    so they don't queue behind the writers.
+    """
+    single_writer = write and _engine.dialect.name == "sqlite"
+    with _write_lock if single_writer else nullcontext():
+        sess = _Session()
+        try:
+            yield sess
+            sess.commit()
+        except Exception:
+            sess.rollback()
+            raise
+        finally:
+            sess.close()
+
+
+# Fields a detail page provides (pipeline/enrich.py) or that are derived from them
+_DETAIL_FIELDS = ("description_text", "location", "posted_at", "country_code", "is_remote")
+_CLASSIFICATION_FIELDS = ("language", "internship_score", "cs_mask", "cs_score", "is_france")
+# A change to any of these gets the row a new change_seq (re-seen alone does not)
+_STAMPED_COLUMNS = ("title", "apply_url", "company", "tags", "profiles") + _DETAIL_FIELDS + _CLASSIFICATION_FIELDS
+
+
+def fill_from_stored(jobs: Iterable[JobRecord], batch_size: int | None = None) -> Iterator[JobRecord]:
+    """
+    Pass postings through; one that comes without a description (title-only listing,
+    Greenhouse two-phase outside the prefilter, ...) whose stored row has one takes the
+    row's detail fields (description, and location/posted_at where it has none), in
+    place. Enrichment then skips it and classification runs on the text that stays
+    stored. One query per batch of ENRICH_BATCH_SIZE postings.
+    """
+    batch_size = batch_size or settings.ENRICH_BATCH_SIZE
+    it = iter(jobs)
+    while batch := list(islice(it, batch_size)):
+        bare: dict[str, dict[str, JobRecord]] = {}
+        for job in batch:
+            if job.description_text is None and job.source_job_id:
+                bare.setdefault(job.source, {})[job.source_job_id] = job
+        if bare:
+            with get_session(write=False) as s:
+                for source, by_id in bare.items():
+                    stmt = select(Job.source_job_id, *(getattr(Job, f) for f in _DETAIL_FIELDS)).where(
+                        Job.source == source, Job.source_job_id.in_(list(by_id)), Job.description_text.is_not(None),
+                    )
+                    for row in s.execute(stmt):
+                        job = by_id[row.source_job_id]
+                        for f in _DETAIL_FIELDS:
+                            if getattr(job, f) in (None, False):
+                                setattr(job, f, getattr(row, f))
+        yield from batch
+
+
+def upsert_job(sess, jm: JobRecord | JobModel):
+    # Upsert by (source, source_job_id); records always carry one (synthetic if the source
+    # has none, pipeline/dedupe.py). Bare JobModels without an id fall back to (apply_url, title).
+    # A job_versions row is appended only when the content hash changes (pipeline/history.py).
+    # Rows created or changed (not just re-seen) are stamped with the transaction's change_seq.
+    # A posting without a description (no detail fetch, and not filled by fill_from_stored)
+    # does not overwrite a stored one: the row keeps its detail fields and the
+    # classification computed from them, and the hash is taken over the row as stored,
+    # so this does not count as a change either.
+    now = utcnow()
     if jm.source_job_id:
         existing = (
             sess.query(Job)
@@ -45,15 +230,26 @@ def upsert_job(sess, jm: JobModel):
         )
     
     if existing:
-        existing.location = jm.location
-        existing.country_code = jm.country_code
-        existing.is_remote = jm.is_remote
+        previous = existing.content_hash
+        detailed = jm.description_text is not None or existing.description_text is None
+        existing.title = jm.title
         existing.apply_url = jm.apply_url
-        existing.description_text = jm.description_text
-        existing.posted_at = jm.posted_at
-        existing.language = jm.language
         existing.company = jm.company
-        existing.tags = ",".join(jm.tags)
+        if detailed:
+            for f in _DETAIL_FIELDS + _CLASSIFICATION_FIELDS:
+                setattr(existing, f, getattr(jm, f))
+            existing.tags = ",".join(jm.tags)
+        existing.last_seen_at = now
+        existing.board = getattr(jm, "board", None) or existing.board
+        digest = content_hash(existing)
+        if previous != digest:
+            existing.content_hash = digest
+            sess.add(snapshot(existing, "baseline" if previous is None else "changed", now))
+        if detailed:
+            _sync_profiles(sess, existing, getattr(jm, "profiles", None), new=False)
+        state = inspect(existing)
+        if any(state.attrs[c].history.has_changes() for c in _STAMPED_COLUMNS):
+            existing.change_seq = change_seq(sess)
         return existing
     
     row = Job(
@@ -69,6 +265,36 @@ def upsert_job(sess, jm: JobModel):
         posted_at=jm.posted_at,
         language=jm.language,
         tags=",".join(jm.tags),
+        internship_score=jm.internship_score,
+        cs_mask=jm.cs_mask,
+        cs_score=jm.cs_score,
+        is_france=jm.is_france,
+        last_seen_at=now,
+        board=getattr(jm, "board", None),
+        change_seq=change_seq(sess),
     )
+    row.content_hash = content_hash(row)
     sess.add(row)
-    return row
\ No newline at end of file
+    sess.add(snapshot(row, "created", now))
+    _sync_profiles(sess, row, getattr(jm, "profiles", None), new=True)
+    return row
+
+
+def _sync_profiles(sess, row: Job, names, new: bool) -> None:
+    """Make job_profiles match `names` (None: memberships were not evaluated, keep them)."""
+    if names is None:
+        return
+    wanted = set(names)
+    if new or row.profiles is not None:
+        current = {p for p in (row.profiles or "").split(",") if p}
+    else:  # stored before Job.profiles: read them once
+        current = {p for (p,) in sess.query(JobProfile.profile).filter(JobProfile.job_id == row.id)}
+    joined = ",".join(sorted(wanted))
+    if row.profiles != joined:
+        row.profiles = joined
+    if current - wanted:
+        sess.query(JobProfile).filter(
+            JobProfile.job_id == row.id, JobProfile.profile.in_(current - wanted)
+        ).delete(synchronize_session=False)
+    for name in wanted - current:
+        sess.add(JobProfile(job=row, profile=name))
\ No newline at end of file
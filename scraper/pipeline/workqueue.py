@@ -0,0 +1,312 @@
+# scraper/pipeline/workqueue.py
+"""
+Durable work queue for scaling a scrape out over several worker processes.
+
+A coordinator enqueues one task per SOURCES entry into the `scrape_tasks` table
+(same database as `jobs`, so SQLite or Postgres — no external broker). Workers claim
+tasks with a time-limited lease, run the adapter through `scrape_adapter` and mark the
+task done. Semantics are at-least-once:
+  - a worker that crashes simply stops renewing its lease; once `lease_expires_at`
+    passes, the task becomes claimable again,
+  - failed tasks are retried until QUEUE_MAX_ATTEMPTS, then parked as "failed"; so are
+    tasks whose lease expired on their last attempt (`fail_expired`, run before each claim),
+  - re-running a task is safe because `upsert_job` is idempotent.
+"""
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+
+from db.schemas import ScrapeTask
+from scraper.pipeline.storage import get_session, init_engine
+from scraper.settings import settings
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _source_label(cfg: dict) -> str:
+    slug = cfg.get("slug")
+    if isinstance(slug, dict):
+        slug = f"{slug.get('tenant')}/{slug.get('site')}"
+    return f"{cfg.get('type', '?')}:{cfg.get('company') or slug or 'unknown'}"
+
+
+def _claimable(now: datetime):
+    """Pending tasks, plus leased tasks whose worker stopped renewing the lease."""
+    return and_(
+        or_(
+            ScrapeTask.status == "pending",
+            and_(ScrapeTask.status == "leased", ScrapeTask.lease_expires_at < now),
+        ),
+        ScrapeTask.attempts < settings.QUEUE_MAX_ATTEMPTS,
+    )
+
+
+def fail_expired(now: Optional[datetime] = None) -> int:
+    """Park expired leases that have no attempt left as "failed"; returns how many."""
+    now = now or _utcnow()
+    with get_session() as s:
+        res = s.execute(
+            update(ScrapeTask)
+            .where(ScrapeTask.status == "leased", ScrapeTask.lease_expires_at < now,
+                   ScrapeTask.attempts >= settings.QUEUE_MAX_ATTEMPTS)
+            .values(status="failed", lease_expires_at=None, finished_at=now,
+                    last_error=func.coalesce(ScrapeTask.last_error, "lease expired on the last attempt"))
+            .execution_options(synchronize_session=False)
+        )
+        return res.rowcount
+
+# --- coordinator --------------------------------------------------------------
+
+def enqueue_sources(sources: Optional[list[dict]] = None, batch_id: Optional[str] = None) -> str:
+    """Insert one pending task per source config and return the batch id."""
+    if sources is None:
+        from scraper.pipeline.orchestrator import SOURCES
+        sources = SOURCES
+    batch_id = batch_id or _utcnow().strftime("%Y%m%dT%H%M%S") + "-" + uuid.uuid4().hex[:6]
+    with get_session() as s:
+        for cfg in sources:
+            s.add(ScrapeTask(
+                batch_id=batch_id,
+                label=_source_label(cfg),
+                config=json.dumps(cfg),
+                status="pending",
+                attempts=0,
+            ))
+    return batch_id
+
+
+def progress(batch_id: Optional[str] = None) -> dict[str, Any]:
+    """Status counts and per-task rows for a batch (latest batch when omitted)."""
+    with get_session(write=False) as s:
+        if batch_id is None:
+            batch_id = s.execute(
+                select(ScrapeTask.batch_id).order_by(ScrapeTask.id.desc()).limit(1)
+            ).scalar()
+        if batch_id is None:
+            return {"batch_id": None, "counts": {}, "tasks": []}
+        counts = dict(s.execute(
+            select(ScrapeTask.status, func.count())
+            .where(ScrapeTask.batch_id == batch_id)
+            .group_by(ScrapeTask.status)
+        ).all())
+        tasks = [
+            {
+                "id": t.id,
+                "label": t.label,
+                "status": t.status,
+                "attempts": t.attempts,
+                "worker_id": t.worker_id,
+                "lease_expires_at": t.lease_expires_at,
+                "seen": t.seen,
+                "kept": t.kept,
+                "last_error": t.last_error,
+            }
+            for t in s.execute(
+                select(ScrapeTask).where(ScrapeTask.batch_id == batch_id).order_by(ScrapeTask.id)
+            ).scalars()
+        ]
+    return {"batch_id": batch_id, "counts": counts, "tasks": tasks}
+
+
+def print_progress(batch_id: Optional[str] = None) -> None:
+    fail_expired()
+    p = progress(batch_id)
+    if p["batch_id"] is None:
+        print("[queue] empty")
+        return
+    total = sum(p["counts"].values())
+    finished = p["counts"].get("done", 0) + p["counts"].get("failed", 0)
+    summary = "  ".join(f"{k}={v}" for k, v in sorted(p["counts"].items()))
+    print(f"[queue] batch={p['batch_id']}  {finished}/{total} finished  {summary}")
+    print("—" * 60)
+    for t in p["tasks"]:
+        extra = f"  worker={t['worker_id']}" if t["status"] == "leased" else ""
+        print(f"[{t['status']:6s}] {t['label']:40s} seen={t['seen']:4d}  kept={t['kept']:4d}  "
+              f"attempts={t['attempts']}{extra}")
+    print("—" * 60)
+
+# --- worker side --------------------------------------------------------------
+
+def claim_task(worker_id: str, lease_seconds: Optional[int] = None) -> Optional[dict]:
+    """Atomically lease the oldest claimable task; None when nothing is left.
+
+    The claim is a conditional UPDATE re-checking the claimable predicate, so two
+    workers racing for the same row cannot both win (rowcount tells us who did).
+    """
+    lease_seconds = lease_seconds or settings.QUEUE_LEASE_SECONDS
+    fail_expired()
+    while True:
+        now = _utcnow()
+        with get_session() as s:
+            task_id = s.execute(
+                select(ScrapeTask.id).where(_claimable(now)).order_by(ScrapeTask.id).limit(1)
+            ).scalar()
+            if task_id is None:
+                return None
+            res = s.execute(
+                update(ScrapeTask)
+                .where(ScrapeTask.id == task_id, _claimable(now))
+                .values(
+                    status="leased",
+                    worker_id=worker_id,
+                    lease_expires_at=now + timedelta(seconds=lease_seconds),
+                    attempts=ScrapeTask.attempts + 1,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if res.rowcount != 1:
+                continue  # another worker got it first; try the next one
+            row = s.execute(
+                select(ScrapeTask.config, ScrapeTask.label, ScrapeTask.attempts)
+                .where(ScrapeTask.id == task_id)
+            ).one()
+        return {"id": task_id, "config": json.loads(row.config), "label": row.label, "attempts": row.attempts}
+
+
+def renew_lease(task_id: int, worker_id: str, lease_seconds: Optional[int] = None) -> bool:
+    """Extend a lease we still own. False means the lease expired and was taken over."""
+    lease_seconds = lease_seconds or settings.QUEUE_LEASE_SECONDS
+    with get_session() as s:
+        res = s.execute(
+            update(ScrapeTask)
+            .where(ScrapeTask.id == task_id, ScrapeTask.worker_id == worker_id,
+                   ScrapeTask.status == "leased")
+            .values(lease_expires_at=_utcnow() + timedelta(seconds=lease_seconds))
+            .execution_options(synchronize_session=False)
+        )
+        return res.rowcount == 1
+
+
+def complete_task(task_id: int, worker_id: str, seen: int, kept: int) -> None:
+    with get_session() as s:
+        s.execute(
+            update(ScrapeTask)
+            .where(ScrapeTask.id == task_id, ScrapeTask.worker_id == worker_id)
+            .values(status="done", seen=seen, kept=kept, last_error=None,
+                    lease_expires_at=None, finished_at=_utcnow())
+            .execution_options(synchronize_session=False)
+        )
+
+
+def fail_task(task_id: int, worker_id: str, error: str) -> None:
+    """Release the task for another attempt, or park it once attempts are exhausted."""
+    with get_session() as s:
+        task = s.get(ScrapeTask, task_id)
+        if task is None or task.worker_id != worker_id:
+            return
+        exhausted = task.attempts >= settings.QUEUE_MAX_ATTEMPTS
+        task.status = "failed" if exhausted else "pending"
+        task.last_error = error[-4000:]
+        task.lease_expires_at = None
+        task.finished_at = _utcnow() if exhausted else None
+
+
+class _LeaseKeeper(threading.Thread):
+    """Renews the lease in the background while a (possibly long) board is scraped."""
+
+    def __init__(self, task_id: int, worker_id: str, lease_seconds: int):
+        super().__init__(daemon=True)
+        self.task_id = task_id
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self._stop_evt = threading.Event()
+
+    def run(self):
+        while not self._stop_evt.wait(self.lease_seconds / 3):
+            if not renew_lease(self.task_id, self.worker_id, self.lease_seconds):
+                print(f"[queue] {self.worker_id} lost lease on task {self.task_id}")
+                return
+
+    def stop(self):
+        self._stop_evt.set()
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def run_worker(worker_id: Optional[str] = None, lease_seconds: Optional[int] = None,
+               exit_when_empty: bool = True, poll_interval: Optional[float] = None) -> int:
+    """Claim and process tasks until the queue is drained. Returns the number processed.
+
+    Whenever it finds the queue empty after processing tasks, the worker does what the end
+    of run_once does: delivers queued alerts and refreshes the facet index.
+    """
+    from scraper.pipeline import alerts, facets
+    from scraper.pipeline.health import apply_adaptive_timeouts
+    from scraper.pipeline.orchestrator import build_adapter, scrape_adapter
+
+    apply_adaptive_timeouts()
+    alerts.load()  # matches are queued in alert_outbox and written out once the queue is drained
+    worker_id = worker_id or default_worker_id()
+    lease_seconds = lease_seconds or settings.QUEUE_LEASE_SECONDS
+    poll_interval = poll_interval or settings.QUEUE_POLL_INTERVAL
+    processed = drained = 0
+
+    while True:
+        task = claim_task(worker_id, lease_seconds)
+        if task is None:
+            if processed > drained:
+                drained = processed
+                for line in (alerts.deliver(), facets.refresh()):
+                    if line:
+                        print(line)
+            if exit_when_empty:
+                return processed
+            time.sleep(poll_interval)
+            continue
+
+        print(f"[run] {task['label']} (task={task['id']} attempt={task['attempts']} worker={worker_id})")
+        stats = {"seen": 0, "kept": 0}
+        keeper = _LeaseKeeper(task["id"], worker_id, lease_seconds)
+        keeper.start()
+        try:
+            adapter = build_adapter(task["config"])
+            if adapter is not None:
+                scrape_adapter(adapter, stats)
+        except Exception as e:
+            keeper.stop()
+            print(f"[skip] {task['label']} error: {e}")
+            fail_task(task["id"], worker_id, f"{e}\n{traceback.format_exc()}")
+        else:
+            keeper.stop()
+            complete_task(task["id"], worker_id, stats["seen"], stats["kept"])
+            print(f"[done] {task['label']:40s} seen={stats['seen']:4d}  kept={stats['kept']:4d}")
+        processed += 1
+
+
+def _worker_main(db_url: str, worker_id: str, lease_seconds: int, exit_when_empty: bool) -> None:
+    init_engine(db_url)
+    run_worker(worker_id, lease_seconds=lease_seconds, exit_when_empty=exit_when_empty)
+
+
+def run_workers(n: int, db_url: Optional[str] = None, lease_seconds: Optional[int] = None,
+                exit_when_empty: bool = True) -> None:
+    """Spawn `n` local worker processes and wait for them to drain the queue."""
+    db_url = db_url or settings.DB_URL
+    lease_seconds = lease_seconds or settings.QUEUE_LEASE_SECONDS
+    ctx = multiprocessing.get_context("spawn")
+    procs = [
+        ctx.Process(
+            target=_worker_main,
+            args=(db_url, f"{default_worker_id()}-w{i}", lease_seconds, exit_when_empty),
+        )
+        for i in range(n)
+    ]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
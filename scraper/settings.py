@@ -4,6 +4,76 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     DB_URL: str = "sqlite:///./jobs.db"
     REQUEST_TIMEOUT: float = 20.0
+    # Adaptive timeouts (scraper/pipeline/health.py): per host, TIMEOUT_P99_FACTOR × the
+    # highest per-run p99 latency of its last TIMEOUT_HISTORY_RUNS runs, within
+    # [TIMEOUT_MIN, TIMEOUT_MAX] (connect: at most CONNECT_TIMEOUT_MAX). Hosts with fewer
+    # than TIMEOUT_MIN_SAMPLES timed requests keep REQUEST_TIMEOUT.
+    ADAPTIVE_TIMEOUTS: bool = True
+    TIMEOUT_HISTORY_RUNS: int = 10
+    TIMEOUT_P99_FACTOR: float = 3.0
+    TIMEOUT_MIN: float = 5.0
+    TIMEOUT_MAX: float = 60.0
+    CONNECT_TIMEOUT_MAX: float = 10.0
+    TIMEOUT_MIN_SAMPLES: int = 10
+    # SQLite engine profile (scraper/pipeline/storage.make_engine)
+    SQLITE_TUNED: bool = True
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_MB: int = 256
+    SQLITE_CACHE_MB: int = 64
+    SQLITE_BUSY_TIMEOUT_MS: int = 30000
+    # Run adapter output through pydantic JobModel validation (off: plain JobRecord; a
+    # title and an absolute http(s) apply_url are required either way, models/record.py)
+    VALIDATE_JOBS: bool = False
+    # Work-queue mode (scraper/pipeline/workqueue.py)
+    QUEUE_LEASE_SECONDS: int = 300
+    QUEUE_MAX_ATTEMPTS: int = 3
+    QUEUE_POLL_INTERVAL: float = 2.0
+    # Async adapters: concurrent requests within one board (detail calls, pages)
+    ADAPTER_CONCURRENCY: int = 8
+    # Greenhouse: list without content, then content only for prefiltered titles
+    GREENHOUSE_TWO_PHASE: bool = True
+    # Lever: postings per skip/limit window
+    LEVER_PAGE_SIZE: int = 100
+    # Change probes (scraper/pipeline/probes.py): skip boards whose probe signature is
+    # unchanged, but do a full fetch at least every PROBE_MAX_AGE_HOURS
+    PROBE_BOARDS: bool = True
+    PROBE_MAX_AGE_HOURS: float = 24.0
+    # Run budget (scraper/pipeline/schedule.py); 0 = unlimited. With a budget, boards run
+    # by historical kept/s and what does not fit is deferred to the next run
+    RUN_BUDGET_SECONDS: float = 0
+    RUN_BUDGET_REQUESTS: int = 0
+    SCHEDULE_HISTORY_RUNS: int = 10
+    SCHEDULE_MAX_DEFERRALS: int = 3
+    # Relevance ranking (scraper/pipeline/ranking.py); changing RANK_FEATURES rebuilds the index
+    RANK_FEATURES: int = 2 ** 18
+    RANK_TITLE_WEIGHT: int = 3
+    RANK_MAX_DESCRIPTION_CHARS: int = 4000
+    RANK_INDEX_PATH: str = ".cache/ranking/index.npz"
+    # Saved-search alerts (scraper/pipeline/alerts.py): new postings matching a saved
+    # search are queued in alert_outbox, then appended to ALERTS_OUTBOX_PATH (JSON lines)
+    ALERTS_ENABLED: bool = True
+    ALERTS_OUTBOX_PATH: str = ".cache/alerts/outbox.jsonl"
+    # Facet bitsets per tag/source/country/remote (scraper/pipeline/facets.py), refreshed after each run
+    FACET_INDEX: bool = True
+    FACET_INDEX_PATH: str = ".cache/facets/index.bin"
+    # Generic HTML adapter: list pages fetched in parallel
+    GENERIC_HTML_CONCURRENCY: int = 4
+    # Detail-page enrichment (scraper/pipeline/enrich.py)
+    ENRICH_DETAILS: bool = True
+    ENRICH_CONCURRENCY: int = 8
+    ENRICH_BATCH_SIZE: int = 32
+    ENRICH_CACHE_DIR: str = ".cache/detail_pages"
+    ENRICH_CACHE_TTL_HOURS: float = 168.0
+    # Staged pipeline (scraper/pipeline/stages.py); enrich stage uses ENRICH_CONCURRENCY
+    PIPELINE_QUEUE_SIZE: int = 256
+    PIPELINE_DISCOVER_WORKERS: int = 4
+    PIPELINE_CLASSIFY_WORKERS: int = 2
+    PIPELINE_WRITE_WORKERS: int = 1
+    PIPELINE_WRITE_BATCH: int = 100
+    # HTTP record/replay (scraper/client/http.py): live | record | replay
+    HTTP_MODE: str = "live"
+    HTTP_CASSETTE: str = ".cache/http_cassette.jsonl.gz"
+    HTTP_REPLAY_LATENCY: float = 0.0  # × recorded latency; 0 = instant, 1 = as recorded
     USER_AGENT: str = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/125.0 Safari/537.36 JobOfferScraper/0.1"
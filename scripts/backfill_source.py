@@ -0,0 +1,182 @@
+# scripts/backfill_source.py
+"""
+Re-classify stored jobs after a change to normalize.py / location.py, without re-scraping.
+
+    python scripts/backfill_source.py                     # every row
+    python scripts/backfill_source.py --source lever      # one source
+    python scripts/backfill_source.py --workers 8 --chunk-size 5000
+    python scripts/backfill_source.py --restart           # ignore the checkpoint
+
+Rows are streamed out of `jobs` in id order, in chunks. Each chunk is classified in a
+worker process the way orchestrator.classify_job does at ingest (tags, language, scores,
+country_code, is_remote, is_france — see normalize.classify — keeping a country or remote
+flag the adapter provided, and the FILTER_PROFILES memberships) and written back in one
+transaction: a bulk UPDATE of `jobs`, stamped with a storage.change_seq so the facet
+index picks the rows up, and the chunk's job_profiles rows. After every committed chunk the last id is saved to a checkpoint file, so
+an interrupted backfill continues where it stopped when run again with the same args;
+the checkpoint is removed once the backfill completes. The facet index is then
+refreshed, and the ranking index, which only re-reads postings whose content_hash
+changed, is rebuilt if one was saved.
+"""
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional
+
+from sqlalchemy import delete, insert, select, update
+
+from db.schemas import Job, JobProfile
+from scraper.pipeline import facets, ranking, storage
+from scraper.pipeline.audiences import PROFILES
+from scraper.pipeline.normalize import classify, tags_from_mask
+from scraper.settings import settings
+
+COLUMNS = (Job.id, Job.title, Job.description_text, Job.location, Job.company, Job.country_code, Job.is_remote)
+
+# --- checkpoint ---------------------------------------------------------------
+
+def _checkpoint_path(source: Optional[str]) -> str:
+    return os.path.join(".cache", f"backfill_{source or 'all'}.json")
+
+
+def load_checkpoint(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {"last_id": 0, "updated": 0}
+
+
+def save_checkpoint(path: str, state: dict) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(state, fh)
+    os.replace(tmp, path)
+
+# --- reading ------------------------------------------------------------------
+
+def iter_chunks(engine, source: Optional[str], after_id: int, chunk_size: int) -> Iterator[list[tuple]]:
+    """Yield lists of (id, title, description, location, company, country_code, is_remote), ascending id."""
+    stmt = select(*COLUMNS).order_by(Job.id)
+    if source:
+        stmt = stmt.where(Job.source == source)
+
+    if engine.dialect.name == "sqlite":
+        # A long-lived SQLite read cursor holds a SHARED lock that blocks our own writes,
+        # so page with short keyset queries instead.
+        last = after_id
+        while True:
+            with engine.connect() as conn:
+                rows = [tuple(r) for r in conn.execute(stmt.where(Job.id > last).limit(chunk_size))]
+            if not rows:
+                return
+            yield rows
+            last = rows[-1][0]
+    else:
+        # Server-side cursor: one query, rows arrive `chunk_size` at a time
+        with engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(
+                stmt.where(Job.id > after_id)
+            )
+            for part in result.partitions():
+                yield [tuple(r) for r in part]
+
+# --- classification (runs in worker processes) ---------------------------------
+
+def classify_chunk(rows: list[tuple]) -> list[dict]:
+    out = []
+    for jid, title, desc, loc, company, country_code, is_remote in rows:
+        c = classify(title, desc, loc, company)
+        # as orchestrator.classify_job: a country / remote flag the adapter provided wins
+        c["country_code"] = country_code or c["country_code"]
+        c["is_remote"] = bool(is_remote) or c["is_remote"]
+        c["profiles"] = ",".join(sorted(PROFILES.names_of(PROFILES.match(c))))
+        c["id"] = jid
+        c["tags"] = ",".join(tags_from_mask(c.pop("tag_mask")))
+        out.append(c)
+    return out
+
+# --- writing --------------------------------------------------------------------
+
+def write_chunk(s, updates: list[dict]) -> None:
+    """Store one classified chunk and its job_profiles, stamped with this transaction's change_seq."""
+    seq = storage.change_seq(s)
+    s.execute(update(Job), [{**u, "change_seq": seq} for u in updates])
+    s.execute(delete(JobProfile).where(JobProfile.job_id.in_([u["id"] for u in updates])))
+    members = [{"job_id": u["id"], "profile": p} for u in updates for p in u["profiles"].split(",") if p]
+    if members:
+        s.execute(insert(JobProfile), members)
+
+
+def refresh_indexes() -> None:
+    """Bring the facet index up to date and rebuild a saved ranking index (tags changed in place)."""
+    line = facets.refresh()
+    if line:
+        print(line)
+    if ranking.np is None or not os.path.exists(settings.RANK_INDEX_PATH):
+        return
+    idx = ranking.RankingIndex()
+    with storage.get_session(write=False) as s:
+        idx.update(s)
+    print(f"[rank] rebuilt: {len(idx)} postings → {idx.save()}")
+
+# --- main -----------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute stored classifications in bulk.")
+    parser.add_argument("--source", help="only rows of this source (e.g. greenhouse)")
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--checkpoint", help="checkpoint file (default .cache/backfill_<source>.json)")
+    parser.add_argument("--restart", action="store_true", help="start from the first row")
+    parser.add_argument("--dry-run", action="store_true", help="classify but do not write")
+    args = parser.parse_args()
+
+    storage.init_engine(settings.DB_URL)
+    ckpt_path = args.checkpoint or _checkpoint_path(args.source)
+    state = {"last_id": 0, "updated": 0} if args.restart else load_checkpoint(ckpt_path)
+    if state["last_id"]:
+        print(f"[backfill] resuming after id={state['last_id']} ({state['updated']} rows done)")
+
+    t0 = time.perf_counter()
+    done_this_run = 0
+    in_flight: deque = deque()
+
+    def drain_one():
+        nonlocal done_this_run
+        updates = in_flight.popleft().result()
+        if updates and not args.dry_run:
+            with storage.get_session() as s:
+                write_chunk(s, updates)
+        state["last_id"] = updates[-1]["id"]
+        state["updated"] += len(updates)
+        done_this_run += len(updates)
+        if not args.dry_run:
+            save_checkpoint(ckpt_path, state)
+        rate = done_this_run / max(time.perf_counter() - t0, 1e-9)
+        print(f"[backfill] id<={state['last_id']}  rows={state['updated']}  {rate:,.0f} rows/s")
+
+    # Chunks are written in submission order so the checkpoint only ever moves forward
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for rows in iter_chunks(storage.get_engine(), args.source, state["last_id"], args.chunk_size):
+            in_flight.append(pool.submit(classify_chunk, rows))
+            if len(in_flight) >= args.workers * 2:
+                drain_one()
+        while in_flight:
+            drain_one()
+
+    # A completed backfill starts from the first row next time
+    if not args.dry_run and os.path.exists(ckpt_path):
+        os.remove(ckpt_path)
+    if not args.dry_run and done_this_run:
+        refresh_indexes()
+    print(f"[backfill] finished: {done_this_run} rows this run, {state['updated']} total "
+          f"in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# scripts/bench_greenhouse.py
+"""
+Greenhouse single request (jobs?content=true) vs two-phase (list, then jobs/{id} for
+titles passing the prefilter): requests, bytes on the wire and end-to-end time.
+
+    python scripts/bench_greenhouse.py                      # datadog, doctolib, algolia
+    python scripts/bench_greenhouse.py --board datadog --repeat 3
+    HTTP_MODE=replay python scripts/bench_greenhouse.py     # against a recorded cassette
+
+"kept" is what matches TARGET_FILTERS after classification. A difference between the
+modes is the cost of the title prefilter: postings whose title shows no internship/CS
+signal but whose body would have passed.
+"""
+import argparse
+import statistics
+import time
+
+from scraper.adapters.greenhouse import GreenhouseAdapter
+from scraper.pipeline.filters import passes
+from scraper.pipeline.normalize import classify
+from scraper.pipeline.audiences import TARGET_FILTERS
+
+
+def run(board: str, two_phase: bool) -> dict:
+    adapter = GreenhouseAdapter(board, two_phase=two_phase)
+    t0 = time.perf_counter()
+    jobs = list(adapter.discover())
+    wall = time.perf_counter() - t0
+    kept = sum(passes(classify(j.title, j.description_text, j.location), TARGET_FILTERS) for j in jobs)
+    return {
+        "postings": len(jobs),
+        "with_content": sum(1 for j in jobs if j.description_text),
+        "kept": kept,
+        "requests": adapter.stats["requests"],
+        "mb": adapter.stats["bytes"] / 1e6,
+        "seconds": wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--board", action="append", help="board slug (repeatable)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per mode; median time is reported")
+    args = parser.parse_args()
+
+    print(f"{'board':12s} {'mode':10s} {'postings':>8s} {'content':>8s} {'kept':>5s} "
+          f"{'requests':>8s} {'MB':>7s} {'seconds':>8s}")
+    for board in args.board or ["datadog", "doctolib", "algolia"]:
+        for mode, two_phase in (("content", False), ("two-phase", True)):
+            runs = [run(board, two_phase) for _ in range(args.repeat)]
+            r = runs[-1]
+            secs = statistics.median(x["seconds"] for x in runs)
+            print(f"{board:12s} {mode:10s} {r['postings']:8d} {r['with_content']:8d} {r['kept']:5d} "
+                  f"{r['requests']:8d} {r['mb']:7.2f} {secs:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
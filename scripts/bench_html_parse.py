@@ -0,0 +1,161 @@
+# scripts/bench_html_parse.py
+"""
+Parse time / memory of the HTML adapters' extraction: BeautifulSoup vs scraper.adapters.extract.
+
+    python scripts/bench_html_parse.py                       # synthetic Ashby + Teamtailor pages
+    python scripts/bench_html_parse.py --file page.html      # a saved real page
+    python scripts/bench_html_parse.py --jobs 2000 --repeat 20
+
+Time is the median over --repeat runs. "py peak" is the tracemalloc peak (Python heap:
+soup nodes, decoded JSON). "Δrss" is the max RSS of a fresh child process doing one run
+minus that of a child that only loads the page, which also counts libxml2's C
+allocations that tracemalloc cannot see.
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from scraper.adapters.extract import find_next_data, iter_job_anchors, parse_html
+
+BASE = "https://example.teamtailor.com/"
+
+
+def synthetic_next_data_page(n: int) -> str:
+    jobs = [
+        {"id": f"job-{i}", "title": f"Software Engineer Intern #{i}", "location": "Paris, France",
+         "jobUrl": f"https://jobs.ashbyhq.com/acme/{i}", "descriptionText": "Python backend " * 40}
+        for i in range(n)
+    ]
+    blob = json.dumps({"props": {"pageProps": {"jobs": jobs}}})
+    chrome = "".join(f"<div class='c'><span>nav {i}</span><a href='/about/{i}'>about</a></div>" for i in range(n))
+    return (f"<html><head><title>Jobs</title></head><body>{chrome}"
+            f"<script id=\"__NEXT_DATA__\" type=\"application/json\">{blob}</script></body></html>")
+
+
+def synthetic_anchor_page(n: int) -> str:
+    items = "".join(
+        f"<li class='job'><a href='/jobs/{i}-intern'><span>Data Intern</span> <span>#{i}</span></a>"
+        f"<p>Paris · Hybrid</p><a href='/jobs/{i}-intern'>→</a></li>"
+        for i in range(n)
+    )
+    return f"<html><body><header>{'<p>x</p>' * n}</header><ul>{items}</ul></body></html>"
+
+# --- the two paths for each workload ----------------------------------------
+
+def soup_next_data(html: str):
+    soup = BeautifulSoup(html, "lxml")
+    script = soup.find("script", id="__NEXT_DATA__", type="application/json")
+    return json.loads(script.string) if script and script.string else None
+
+
+def soup_anchors(html: str):
+    soup = BeautifulSoup(html, "lxml")
+    seen, out = set(), []
+    for a in soup.select("a[href*='/jobs/']"):
+        title = a.get_text(strip=True)
+        if len(title) < 3:
+            continue
+        url = urljoin(BASE, a.get("href", ""))
+        if url in seen:
+            continue
+        seen.add(url)
+        out.append((url, title))
+    return out
+
+
+def fast_next_data(html: str):
+    return find_next_data(html)
+
+
+def fast_anchors(html: str):
+    return list(iter_job_anchors(parse_html(html), BASE))
+
+
+CASES = {
+    "next_data/bs4": (soup_next_data, "next"),
+    "next_data/fast": (fast_next_data, "next"),
+    "anchors/bs4": (soup_anchors, "anchors"),
+    "anchors/fast": (fast_anchors, "anchors"),
+}
+
+
+def load_page(kind: str, args) -> str:
+    if args.file:
+        with open(args.file, encoding="utf-8") as fh:
+            return fh.read()
+    return synthetic_next_data_page(args.jobs) if kind == "next" else synthetic_anchor_page(args.jobs)
+
+
+def measure(name: str, html: str, repeat: int) -> dict:
+    fn, _ = CASES[name]
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(html)
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"median_ms": statistics.median(times) * 1000, "py_peak_kb": peak / 1024}
+
+
+def peak_rss_kb() -> int:
+    # VmHWM belongs to this exec'd image; ru_maxrss can carry over the parent's peak from fork()
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def child_rss_kb(name: str, html: str) -> int:
+    """Max RSS of a fresh interpreter that runs `name` once (Linux reports KiB)."""
+    with tempfile.NamedTemporaryFile("w", suffix=".html", encoding="utf-8", delete=False) as fh:
+        fh.write(html)
+    try:
+        cmd = [sys.executable, __file__, "--child", name, "--file", fh.name]
+        out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+    finally:
+        os.unlink(fh.name)
+    return int(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=500, help="postings in the synthetic pages")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--file", help="benchmark a saved HTML page instead of synthetic ones")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        html = load_page("file", args)
+        if args.child != "baseline":
+            CASES[args.child][0](html)
+        print(peak_rss_kb())
+        return
+
+    print(f"{'case':18s} {'page KB':>8s} {'median ms':>10s} {'py peak KB':>11s} {'Δrss KB':>9s}")
+    for name, (_, kind) in CASES.items():
+        html = load_page(kind, args)
+        m = measure(name, html, args.repeat)
+        rss = child_rss_kb(name, html) - child_rss_kb("baseline", html)
+        print(f"{name:18s} {len(html) / 1024:8.0f} {m['median_ms']:10.2f} {m['py_peak_kb']:11.0f} {rss:9d}")
+
+
+if __name__ == "__main__":
+    main()
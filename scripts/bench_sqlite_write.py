@@ -0,0 +1,101 @@
+# scripts/bench_sqlite_write.py
+"""
+SQLite write throughput: plain engine vs the tuned profile (storage.make_engine).
+
+    python scripts/bench_sqlite_write.py                     # 5k postings, batches of 1 and 100
+    python scripts/bench_sqlite_write.py -n 20000 --readers 2
+
+Each profile gets a fresh database file in a temp dir. Postings are upserted the
+way the pipeline writes them: one session per batch, where a batch of 1 is the
+run_once path and a batch of 100 is the staged writer. Reader threads meanwhile run
+the UI's filtered SELECT in a loop on their own engine. Reported: postings/s,
+reader queries/s, and how many reader or writer operations failed with
+"database is locked".
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+
+from db.schemas import Job
+from scraper.models.record import make_record
+from scraper.pipeline import storage
+from scraper.pipeline.filters import filter_clauses
+from scraper.pipeline.audiences import TARGET_FILTERS
+
+
+def postings(n: int):
+    return [
+        make_record(source="greenhouse", source_job_id=str(i), title="Software Engineer Intern",
+                    company="Acme", location="Paris, France", apply_url=f"https://boards.example/acme/{i}",
+                    description_text="Python, SQL and Docker on our data platform. " * 20,
+                    internship_score=3, cs_score=3, is_france=True, language="en")
+        for i in range(n)
+    ]
+
+
+def reader(url: str, tuned: bool, stop: threading.Event, out: dict):
+    engine = storage.make_engine(url, readonly=True, tuned=tuned)
+    stmt = select(func.count(Job.id)).where(*filter_clauses(TARGET_FILTERS))
+    while not stop.is_set():
+        try:
+            with engine.connect() as conn:
+                conn.execute(stmt).scalar()
+            out["queries"] += 1
+        except OperationalError:
+            out["locked"] += 1
+    engine.dispose()
+
+
+def run(profile: str, jobs: list, batch: int, readers: int) -> dict:
+    tuned = profile == "tuned"
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        storage.init_engine(url, tuned=tuned)
+        stop = threading.Event()
+        rstats = {"queries": 0, "locked": 0}
+        threads = [threading.Thread(target=reader, args=(url, tuned, stop, rstats)) for _ in range(readers)]
+        for t in threads:
+            t.start()
+        locked = 0
+        t0 = time.perf_counter()
+        for i in range(0, len(jobs), batch):
+            try:
+                with storage.get_session() as s:
+                    for job in jobs[i:i + batch]:
+                        storage.upsert_job(s, job)
+            except OperationalError:
+                locked += 1
+        elapsed = time.perf_counter() - t0
+        stop.set()
+        for t in threads:
+            t.join()
+        storage.get_engine().dispose()
+    return {
+        "rate": len(jobs) / elapsed,
+        "reads": rstats["queries"] / elapsed,
+        "locked": locked + rstats["locked"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=5000, help="postings per run")
+    parser.add_argument("--batches", type=int, nargs="+", default=[1, 100])
+    parser.add_argument("--readers", type=int, default=1, help="concurrent reader threads")
+    args = parser.parse_args()
+
+    jobs = postings(args.n)
+    print(f"{'profile':8s} {'batch':>6s} {'postings/s':>11s} {'reads/s':>9s} {'locked':>7s}")
+    for batch in args.batches:
+        for profile in ("default", "tuned"):
+            r = run(profile, jobs, batch, args.readers)
+            print(f"{profile:8s} {batch:6d} {r['rate']:11,.0f} {r['reads']:9,.0f} {r['locked']:7d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# scripts/build_facet_index.py
+"""
+Build or update the facet bitsets (scraper/pipeline/facets.py) and show counts.
+
+    python scripts/build_facet_index.py                    # incremental update
+    python scripts/build_facet_index.py --full             # rebuild from scratch
+    python scripts/build_facet_index.py --facet tag --country FR --remote
+
+run_once/run_staged already refresh the index after each run.
+"""
+import argparse
+import time
+
+from scraper.pipeline import storage
+from scraper.pipeline.facets import FACETS, FacetIndex
+from scraper.settings import settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build/update the facet bitset index.")
+    parser.add_argument("--full", action="store_true", help="ignore the saved index and rebuild it")
+    parser.add_argument("--facet", choices=FACETS, default="tag", help="facet to count")
+    parser.add_argument("--tag", action="append", default=[], help="restrict to postings with any of these tags")
+    parser.add_argument("--source", action="append", default=[])
+    parser.add_argument("--country", action="append", default=[])
+    parser.add_argument("--remote", action="store_true", help="remote postings only")
+    args = parser.parse_args()
+
+    storage.init_engine(settings.DB_URL)
+    t0 = time.perf_counter()
+    idx = None if args.full else FacetIndex.open()
+    idx = idx or FacetIndex()
+    with storage.get_session(write=False) as s:
+        n = idx.update(s)
+    path = idx.save()
+    print(f"[facets] {n} postings re-indexed in {time.perf_counter() - t0:.2f}s, "
+          f"{idx.all.bit_count()} postings in {len(idx.keys())} bitsets ({path})")
+
+    idx = FacetIndex.open()
+    t0 = time.perf_counter()
+    bits = idx.match({"tag": args.tag, "source": args.source, "country": args.country,
+                      "remote": True if args.remote else None})
+    counts = idx.counts(args.facet, within=bits)
+    elapsed = (time.perf_counter() - t0) * 1e6
+    print(f"[facets] {bits.bit_count()} matching postings, {len(counts)} {args.facet} values in {elapsed:.0f} µs "
+          f"(cold: includes decoding the bitsets used)")
+    for value, count in counts.items():
+        print(f"{count:7d}  {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# scripts/build_ranking_index.py
+"""
+Build or update the relevance-ranking index (scraper/pipeline/ranking.py) and try a
+profile against it.
+
+    python scripts/build_ranking_index.py                      # incremental update
+    python scripts/build_ranking_index.py --full               # rebuild from scratch
+    python scripts/build_ranking_index.py --query "python ml stage paris" --top 20
+
+The Streamlit app updates the index itself on each load; running this after a scrape
+just keeps that first load fast.
+"""
+import argparse
+import time
+
+from sqlalchemy import select
+
+from db.schemas import Job
+from scraper.pipeline import storage
+from scraper.pipeline.ranking import RankingIndex
+from scraper.settings import settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build/update the relevance-ranking index.")
+    parser.add_argument("--full", action="store_true", help="ignore the saved index and rebuild it")
+    parser.add_argument("--query", help="profile text to rank postings against")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    storage.init_engine(settings.DB_URL)
+    t0 = time.perf_counter()
+    idx = None if args.full else RankingIndex.load()
+    idx = idx or RankingIndex()
+    with storage.get_session(write=False) as s:
+        added, changed, removed = idx.update(s)
+    path = idx.save()
+    print(f"[rank] +{added} ~{changed} -{removed} → {len(idx)} postings, "
+          f"{idx.matrix.nnz} terms in {time.perf_counter() - t0:.1f}s ({path})")
+
+    if args.query:
+        timings = []
+        for _ in range(2):  # the first query also computes IDF and row norms
+            t0 = time.perf_counter()
+            ranked = idx.rank(args.query, limit=args.top)
+            timings.append((time.perf_counter() - t0) * 1000)
+        print(f"[rank] scored {len(idx)} postings in {timings[1]:.1f} ms ({timings[0]:.1f} ms cold)")
+        with storage.get_session(write=False) as s:
+            titles = dict(s.execute(select(Job.id, Job.title).where(Job.id.in_([i for i, _ in ranked]))).all())
+        for job_id, score in ranked:
+            print(f"{score:6.3f}  {job_id:8d}  {titles.get(job_id, '')}")
+
+
+if __name__ == "__main__":
+    main()
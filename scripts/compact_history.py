@@ -0,0 +1,30 @@
+# scripts/compact_history.py
+"""
+Compact the job_versions change log (see scraper/pipeline/history.py).
+
+    python scripts/compact_history.py                          # versions older than 90 days → weekly
+    python scripts/compact_history.py --older-than-days 30 --bucket day
+"""
+import argparse
+from datetime import timedelta
+
+from scraper.pipeline.history import compact_versions, utcnow
+from scraper.pipeline.storage import get_session, init_engine
+from scraper.settings import settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep first + last version per posting per bucket before a cutoff.")
+    parser.add_argument("--older-than-days", type=float, default=90.0)
+    parser.add_argument("--bucket", choices=["day", "week"], default="week")
+    args = parser.parse_args()
+
+    init_engine(settings.DB_URL)
+    before = utcnow() - timedelta(days=args.older_than_days)
+    with get_session() as s:
+        n = compact_versions(s, before, bucket=args.bucket)
+    print(f"[compact] removed {n} versions older than {before:%Y-%m-%d} ({args.bucket}ly buckets)")
+
+
+if __name__ == "__main__":
+    main()
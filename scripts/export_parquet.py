@@ -0,0 +1,29 @@
+# scripts/export_parquet.py
+"""
+Export the jobs table to partitioned Parquet (see scraper/pipeline/export.py).
+
+    python scripts/export_parquet.py                      # incremental, into ./exports/jobs
+    python scripts/export_parquet.py --out /data/jobs --chunk-size 100000
+    python scripts/export_parquet.py --full               # ignore the state file, re-export all
+"""
+import argparse
+
+from scraper.pipeline.export import export_jobs
+from scraper.pipeline.storage import get_engine, init_engine
+from scraper.settings import settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream jobs into a partitioned Parquet dataset.")
+    parser.add_argument("--out", default="exports/jobs")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--full", action="store_true", help="re-export everything (new files alongside old ones)")
+    args = parser.parse_args()
+
+    init_engine(settings.DB_URL)
+    stats = export_jobs(get_engine(), args.out, chunk_size=args.chunk_size, full=args.full)
+    print(f"[export] {stats['rows']} rows → {args.out} (run {stats['run_id']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# scripts/migrate_synthetic_ids.py
+"""
+One-off: give stored postings without a source_job_id their synthetic id
+(scraper/pipeline/dedupe.py), so they are matched by the (source, source_job_id) index
+like the rows written since.
+
+    python scripts/migrate_synthetic_ids.py --dry-run     # count ids and merges only
+    python scripts/migrate_synthetic_ids.py
+    python scripts/migrate_synthetic_ids.py --source teamtailor
+
+Rows are processed in id order, in chunks, one transaction per chunk. Two rows can map
+to the same id: the same posting stored twice under URL variants (tracking parameters,
+locale prefix, trailing slash), or a legacy row whose posting was already re-scraped with
+its synthetic id. The row already holding the id (else the first one migrated) is kept;
+the other is merged into it — earliest scraped_at, latest last_seen_at, its job_versions
+and queued/delivered alerts moved over (unless the kept row already has an alert for
+that search), its job_profiles dropped (the kept row's follow its own classification) —
+and deleted. Running it again is a no-op.
+"""
+import argparse
+import time
+
+from sqlalchemy import delete, select, update
+
+from db.schemas import AlertOutbox, Job, JobProfile, JobVersion
+from scraper.pipeline import storage
+from scraper.pipeline.dedupe import synthetic_job_id
+from scraper.settings import settings
+
+
+def _earliest(a, b):
+    return a if b is None or (a is not None and a <= b) else b
+
+
+def _latest(a, b):
+    return a if b is None or (a is not None and a >= b) else b
+
+
+def merge_into(sess, keep: Job, dup: Job) -> None:
+    keep.scraped_at = _earliest(keep.scraped_at, dup.scraped_at)
+    keep.last_seen_at = _latest(keep.last_seen_at, dup.last_seen_at)
+    sess.execute(
+        update(JobVersion).where(JobVersion.job_id == dup.id).values(job_id=keep.id)
+        .execution_options(synchronize_session=False)
+    )
+    already = select(AlertOutbox.search_id).where(AlertOutbox.job_id == keep.id)
+    sess.execute(
+        delete(AlertOutbox).where(AlertOutbox.job_id == dup.id, AlertOutbox.search_id.in_(already))
+        .execution_options(synchronize_session=False)
+    )
+    sess.execute(
+        update(AlertOutbox).where(AlertOutbox.job_id == dup.id).values(job_id=keep.id)
+        .execution_options(synchronize_session=False)
+    )
+    sess.execute(delete(JobProfile).where(JobProfile.job_id == dup.id).execution_options(synchronize_session=False))
+    sess.delete(dup)
+
+
+def migrate_chunk(sess, after_id: int, chunk_size: int, source: str | None) -> tuple[int, int, int]:
+    """Returns (last id, ids assigned, rows merged); last id 0 when nothing is left."""
+    stmt = select(Job).where(Job.source_job_id.is_(None), Job.id > after_id).order_by(Job.id).limit(chunk_size)
+    if source:
+        stmt = stmt.where(Job.source == source)
+    rows = list(sess.scalars(stmt))
+    assigned = merged = 0
+    for row in rows:
+        sid = synthetic_job_id(row.apply_url, row.title)
+        keep = sess.scalars(
+            select(Job).where(Job.source == row.source, Job.source_job_id == sid)
+        ).one_or_none()
+        if keep is None:
+            row.source_job_id = sid
+            sess.flush()  # later rows of the chunk must see it
+            assigned += 1
+        else:
+            merge_into(sess, keep, row)
+            merged += 1
+    return (rows[-1].id if rows else 0), assigned, merged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Assign synthetic source_job_ids to stored postings.")
+    parser.add_argument("--source", help="only rows of this source (e.g. teamtailor)")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="report, then roll back")
+    args = parser.parse_args()
+
+    storage.init_engine(settings.DB_URL)
+    t0 = time.perf_counter()
+    assigned = merged = 0
+
+    def step(sess, after_id: int) -> int:
+        nonlocal assigned, merged
+        last, a, m = migrate_chunk(sess, after_id, args.chunk_size, args.source)
+        assigned += a
+        merged += m
+        return last
+
+    last = 0
+    if args.dry_run:
+        # everything in one transaction that is never committed
+        sess = storage._Session()
+        try:
+            while (last := step(sess, last)):
+                pass
+        finally:
+            sess.rollback()
+            sess.close()
+    else:
+        while True:
+            with storage.get_session() as s:
+                last = step(s, last)
+            if not last:
+                break
+            print(f"[migrate] id<={last}  assigned={assigned}  merged={merged}")
+
+    verb = "would assign" if args.dry_run else "assigned"
+    print(f"[migrate] {verb} {assigned} synthetic ids, merged {merged} duplicate rows "
+          f"in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# scripts/rebuild_profiles.py
+"""
+Recompute job_profiles for stored postings after FILTER_PROFILES changed (a profile was
+added, edited or removed), from the stored classification columns — no re-scrape, no
+re-classification.
+
+    python scripts/rebuild_profiles.py
+    python scripts/rebuild_profiles.py --chunk-size 10000
+
+Rows are read in id order, in chunks; each chunk's memberships (job_profiles and
+jobs.profiles) are replaced in one transaction. Memberships of profiles no longer configured are removed at the end.
+"""
+import argparse
+import time
+from collections import Counter
+
+from sqlalchemy import delete, insert, select, update
+
+from db.schemas import Job, JobProfile
+from scraper.pipeline import storage
+from scraper.pipeline.normalize import tags_to_mask
+from scraper.pipeline.audiences import PROFILES
+from scraper.settings import settings
+
+COLUMNS = (Job.id, Job.language, Job.internship_score, Job.cs_score, Job.is_france, Job.is_remote,
+           Job.country_code, Job.cs_mask, Job.tags)
+
+
+def memberships(rows) -> list[dict]:
+    out = []
+    for r in rows:
+        f = dict(r._mapping)
+        f["tag_mask"] = tags_to_mask([t for t in (f.pop("tags") or "").split(",") if t])
+        for name in PROFILES.names_of(PROFILES.match(f)):
+            out.append({"job_id": r.id, "profile": name})
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute filter-profile memberships of stored postings.")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    storage.init_engine(settings.DB_URL)
+    t0 = time.perf_counter()
+    counts: Counter = Counter()
+    last, done = 0, 0
+    while True:
+        with storage.get_session() as s:
+            rows = s.execute(select(*COLUMNS).where(Job.id > last).order_by(Job.id).limit(args.chunk_size)).all()
+            if not rows:
+                break
+            members = memberships(rows)
+            s.execute(delete(JobProfile).where(JobProfile.job_id.in_([r.id for r in rows])))
+            if members:
+                s.execute(insert(JobProfile), members)
+            names = {r.id: [] for r in rows}
+            for m in members:
+                names[m["job_id"]].append(m["profile"])
+            s.execute(update(Job), [{"id": jid, "profiles": ",".join(sorted(p))} for jid, p in names.items()])
+        last = rows[-1].id
+        done += len(rows)
+        counts.update(m["profile"] for m in members)
+        print(f"[profiles] id<={last}  rows={done}")
+
+    with storage.get_session() as s:
+        s.execute(delete(JobProfile).where(JobProfile.profile.not_in(PROFILES.names)))
+
+    summary = "  ".join(f"{name}={counts[name]}" for name in PROFILES.names)
+    print(f"[profiles] {done} postings in {time.perf_counter() - t0:.1f}s: {summary}")
+
+
+if __name__ == "__main__":
+    main()
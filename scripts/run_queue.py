@@ -0,0 +1,48 @@
+# scripts/run_queue.py
+"""
+Work-queue mode for large source lists.
+
+    python scripts/run_queue.py enqueue            # coordinator: one task per SOURCES entry
+    python scripts/run_queue.py work --workers 4   # N local worker processes drain the queue
+    python scripts/run_queue.py progress           # status of the latest batch
+    python scripts/run_queue.py run --workers 4    # enqueue + work + progress in one go
+
+Workers on other machines only need the same DB_URL (e.g. a shared Postgres). A worker
+that finds the queue drained delivers queued alerts and refreshes the facet index, as
+the end of a run_scrape_once run does.
+"""
+import argparse
+
+from scraper.pipeline.storage import init_engine
+from scraper.pipeline.workqueue import enqueue_sources, print_progress, run_workers, run_worker
+from scraper.settings import settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distribute SOURCES over worker processes.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("enqueue", help="enqueue one task per SOURCES entry")
+    for name in ("work", "run"):
+        p = sub.add_parser(name, help="process queued tasks" if name == "work" else "enqueue then process")
+        p.add_argument("--workers", type=int, default=1, help="local worker processes")
+        p.add_argument("--lease", type=int, default=settings.QUEUE_LEASE_SECONDS, help="lease seconds")
+        p.add_argument("--forever", action="store_true", help="keep polling instead of exiting when empty")
+    pp = sub.add_parser("progress", help="show batch progress")
+    pp.add_argument("--batch", default=None)
+    args = parser.parse_args()
+
+    init_engine(settings.DB_URL)
+    if args.cmd in ("enqueue", "run"):
+        batch = enqueue_sources()
+        print(f"[queue] enqueued batch {batch}")
+    if args.cmd in ("work", "run"):
+        if args.workers <= 1:
+            run_worker(lease_seconds=args.lease, exit_when_empty=not args.forever)
+        else:
+            run_workers(args.workers, lease_seconds=args.lease, exit_when_empty=not args.forever)
+    if args.cmd in ("progress", "run"):
+        print_progress(getattr(args, "batch", None))
+
+
+if __name__ == "__main__":
+    main()
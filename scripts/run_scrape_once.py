@@ -1,6 +1,61 @@
 # scripts/run_scrape_once.py
+"""
+    python scripts/run_scrape_once.py
+    python scripts/run_scrape_once.py --profile sampling            # per-adapter hotspots + run.folded
+    python scripts/run_scrape_once.py --profile cprofile --profile-top 10 --profile-out /tmp/prof
+    python scripts/run_scrape_once.py --staged                      # discover → enrich → classify → write
+    python scripts/run_scrape_once.py --no-probe                    # full fetch of every board
+    python scripts/run_scrape_once.py --budget-seconds 600          # best boards first, defer the rest
+
+Render the collapsed stacks with e.g. `flamegraph.pl run.folded > run.svg` or speedscope.
+"""
+import argparse
+import os
+
 from scraper.pipeline.orchestrator import run_once
+from scraper.pipeline.profiling import PROFILERS, default_out_dir, make_profiler
+from scraper.pipeline.schedule import budget_from_settings
+from scraper.pipeline.stages import run_staged
+from scraper.settings import settings
 
-if __name__ == "__main__":
-    total, kept = run_once()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run every configured source once.")
+    parser.add_argument("--staged", action="store_true",
+                        help="run as a bounded-queue pipeline (see scraper/pipeline/stages.py)")
+    parser.add_argument("--no-probe", action="store_true",
+                        help="skip the change probes, fetch every board (see scraper/pipeline/probes.py)")
+    parser.add_argument("--budget-seconds", type=float,
+                        help="wall-clock budget; boards that do not fit are deferred (default RUN_BUDGET_SECONDS)")
+    parser.add_argument("--budget-requests", type=int,
+                        help="HTTP request budget (default RUN_BUDGET_REQUESTS)")
+    parser.add_argument("--profile", choices=sorted(PROFILERS), help="profile each adapter")
+    parser.add_argument("--profile-out", help="directory for run.folded / *.prof (default .cache/profiles/<ts>)")
+    parser.add_argument("--profile-top", type=int, default=5, help="hotspots printed per source")
+    parser.add_argument("--sample-interval", type=float, default=5.0, help="sampling profiler interval, ms")
+    args = parser.parse_args()
+
+    if args.staged and args.profile == "cprofile":
+        parser.error("--staged runs in worker threads, which cProfile does not see: use --profile sampling")
+    if args.no_probe:
+        settings.PROBE_BOARDS = False
+
+    profiler = None
+    if args.profile:
+        kwargs = {"interval": args.sample_interval / 1000} if args.profile == "sampling" else {}
+        profiler = make_profiler(args.profile, **kwargs)
+
+    run = run_staged if args.staged else run_once
+    budget = budget_from_settings(args.budget_seconds, args.budget_requests)
+    total, kept = run(profiler=profiler, profile_top=args.profile_top, budget=budget)
     print(f"Scraped {total} postings, kept {kept}.")
+
+    if profiler:
+        out = args.profile_out or default_out_dir()
+        os.makedirs(out, exist_ok=True)
+        for path in profiler.write(out):
+            print(f"[profile] {path}")
+
+
+if __name__ == "__main__":
+    main()
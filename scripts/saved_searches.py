@@ -0,0 +1,79 @@
+# scripts/saved_searches.py
+"""
+Manage saved searches and deliver their alerts (scraper/pipeline/alerts.py).
+
+    python scripts/saved_searches.py add ml-paris --keywords "machine learning" --location "paris, remote" \
+        --profile default
+    python scripts/saved_searches.py add rust-anywhere --keywords rust --sources greenhouse,lever
+    python scripts/saved_searches.py list
+    python scripts/saved_searches.py remove ml-paris
+    python scripts/saved_searches.py deliver        # append queued alerts to ALERTS_OUTBOX_PATH
+
+Adding a search under an existing name replaces it. Searches only see postings stored
+after they were added.
+"""
+import argparse
+
+from sqlalchemy import delete, func, select
+
+from db.schemas import AlertOutbox, SavedSearch
+from scraper.pipeline import alerts, storage
+from scraper.pipeline.audiences import FILTER_PROFILES
+from scraper.settings import settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Saved searches matched against new postings.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    pa = sub.add_parser("add", help="add or replace a saved search")
+    pa.add_argument("name")
+    pa.add_argument("--keywords", help="comma-separated phrases, all required")
+    pa.add_argument("--location", help="comma-separated phrases, any of")
+    pa.add_argument("--tags", help="comma-separated tags, any of")
+    pa.add_argument("--sources", help="comma-separated sources, any of")
+    pa.add_argument("--profile", choices=list(FILTER_PROFILES), help="filter profile the posting must belong to")
+    pr = sub.add_parser("remove", help="delete a saved search and its alerts")
+    pr.add_argument("name")
+    sub.add_parser("list", help="list saved searches")
+    sub.add_parser("deliver", help="append queued alerts to the outbox file")
+    args = parser.parse_args()
+
+    storage.init_engine(settings.DB_URL)
+    if args.cmd == "add":
+        with storage.get_session() as s:
+            row = s.execute(select(SavedSearch).where(SavedSearch.name == args.name)).scalar_one_or_none()
+            row = row or SavedSearch(name=args.name)
+            row.keywords, row.location, row.tags = args.keywords, args.location, args.tags
+            row.sources, row.profile, row.active = args.sources, args.profile, True
+            s.add(row)
+            s.flush()
+            q = alerts.compile_search(row)
+        print(f"[alerts] saved {args.name}: required={sorted(q.required)} any_of={[sorted(map(sorted, a)) for a in q.any_of]}")
+    elif args.cmd == "remove":
+        with storage.get_session() as s:
+            row = s.execute(select(SavedSearch).where(SavedSearch.name == args.name)).scalar_one_or_none()
+            if row is None:
+                parser.error(f"no saved search named {args.name!r}")
+            s.execute(delete(AlertOutbox).where(AlertOutbox.search_id == row.id))
+            s.delete(row)
+        print(f"[alerts] removed {args.name}")
+    elif args.cmd == "list":
+        stmt = (
+            select(SavedSearch, func.count(AlertOutbox.id), func.count(AlertOutbox.delivered_at))
+            .outerjoin(AlertOutbox, AlertOutbox.search_id == SavedSearch.id)
+            .group_by(SavedSearch.id)
+            .order_by(SavedSearch.name)
+        )
+        with storage.get_session(write=False) as s:
+            for row, total, delivered in s.execute(stmt):
+                conditions = [f"{k}={v}" for k in ("keywords", "location", "tags", "sources", "profile")
+                              if (v := getattr(row, k))]
+                state = "" if row.active else "  (inactive)"
+                print(f"{row.name:25s} matches={total:5d} pending={total - delivered:4d}  "
+                      f"{'  '.join(conditions) or '(everything)'}{state}")
+    else:
+        print(alerts.deliver() or "[alerts] nothing to deliver")
+
+
+if __name__ == "__main__":
+    main()
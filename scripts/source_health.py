@@ -0,0 +1,57 @@
+# scripts/source_health.py
+"""
+Per-board health from the scrape_runs history (scraper/pipeline/health.py).
+
+    python scripts/source_health.py                          # every board, last 20 runs
+    python scripts/source_health.py --runs 50
+    python scripts/source_health.py --label greenhouse:Datadog   # that board run by run
+    python scripts/source_health.py --timeouts               # adaptive timeout per host
+
+Trend columns are the median of the newer half of the runs over the older half:
+p99× > 1 means the board got slower, kept× < 1 that it yields fewer postings.
+"""
+import argparse
+
+from scraper.pipeline import storage
+from scraper.pipeline.health import host_timeouts, run_series, source_health
+from scraper.settings import settings
+
+
+def _fmt(v, spec: str = "") -> str:
+    return "-" if v is None else format(v, spec)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Board health and latency trends from past runs.")
+    parser.add_argument("--runs", type=int, default=20, help="runs per board to look at")
+    parser.add_argument("--label", help="list the runs of one board")
+    parser.add_argument("--timeouts", action="store_true", help="show the adaptive per-host timeouts")
+    args = parser.parse_args()
+
+    storage.init_engine(settings.DB_URL)
+    with storage.get_session(write=False) as s:
+        if args.timeouts:
+            for host, t in sorted(host_timeouts(s).items()):
+                print(f"{host:45s} connect={t.connect:5.1f}s  read={t.read:5.1f}s")
+            return
+
+        if args.label:
+            print(f"{'started':19s} {'status':9s} {'secs':>7s} {'seen':>5s} {'kept':>5s} "
+                  f"{'reqs':>5s} {'p99 ms':>8s} {'t/o':>4s}")
+            for r in run_series(s, args.label, args.runs):
+                print(f"{r['started_at']:%Y-%m-%d %H:%M:%S} {r['status']:9s} {r['duration_s']:7.1f} "
+                      f"{r['seen']:5d} {r['kept']:5d} {r['requests']:5d} {_fmt(r['p99_ms'], '8.0f'):>8s} "
+                      f"{r['timeouts']:4d}")
+            return
+
+        print(f"{'board':40s} {'runs':>4s} {'ok':>5s} {'last':9s} {'secs':>6s} {'p99 ms':>7s} {'p99×':>5s} "
+              f"{'kept':>6s} {'kept×':>5s} {'kept/s':>7s} {'t/o':>4s}")
+        for h in source_health(s, args.runs):
+            print(f"{h['label'][:40]:40s} {h['runs']:4d} {_fmt(h['ok_rate'], '5.0%'):>5s} {h['last_status']:9s} "
+                  f"{_fmt(h['duration_s'], '6.1f'):>6s} {_fmt(h['p99_ms'], '7.0f'):>7s} "
+                  f"{_fmt(h['p99_trend'], '5.2f'):>5s} {_fmt(h['kept'], '6.1f'):>6s} "
+                  f"{_fmt(h['kept_trend'], '5.2f'):>5s} {_fmt(h['kept_per_s'], '7.3f'):>7s} {h['timeouts']:4d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import httpx
+import pytest
+
+from scraper.client import http
+from scraper.pipeline import storage
+from scraper.settings import settings
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Fresh SQLite database for the pipeline modules (storage.get_session)."""
+    url = f"sqlite:///{tmp_path / 'jobs.db'}"
+    monkeypatch.setattr(settings, "DB_URL", url)
+    storage.init_engine(url)
+    yield storage.get_engine()
+    storage.get_engine().dispose()
+
+
+@pytest.fixture
+def mock_http(monkeypatch):
+    """Route the shared HTTP clients through `handler(request) -> httpx.Response`."""
+    def install(handler):
+        monkeypatch.setattr(http, "_transport", lambda asynchronous=False: httpx.MockTransport(handler))
+    return install
@@ -0,0 +1,68 @@
+import json
+
+import httpx
+
+from scraper.adapters.ashby import AshbyAdapter
+
+BASE = "https://jobs.ashbyhq.com/acme"
+
+
+def _discover(mock_http, html):
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        return httpx.Response(200, text=html)
+
+    mock_http(handler)
+    jobs = list(AshbyAdapter("acme", "Acme").discover())
+    assert requested == [BASE]
+    return jobs
+
+
+def _page(head="", body=""):
+    return f"<html><head>{head}</head><body>{body}</body></html>"
+
+
+def test_next_data_jobs_and_sections(mock_http):
+    data = {"props": {"pageProps": {
+        "jobs": [{"id": "j1", "title": " Data Intern ", "location": "Paris, France",
+                  "jobUrl": "https://jobs.ashbyhq.com/acme/j1", "descriptionText": "Python",
+                  "publishedAt": "2026-10-01T00:00:00Z"}],
+        "sections": [{"jobs": [{"slug": "ml-intern", "name": "ML Intern", "office": {"name": "Berlin"},
+                                "canonicalPath": "/acme/ml-intern"}]}],
+    }}}
+    blob = f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(data)}</script>'
+    # LD+JSON and anchors on the same page are ignored once __NEXT_DATA__ has jobs
+    ld = '<script type="application/ld+json">{"@type": "JobPosting", "title": "Other"}</script>'
+    jobs = _discover(mock_http, _page(blob + ld, '<a href="/acme/jobs/x">Anchor Job</a>'))
+    assert [(j.source_job_id, j.title) for j in jobs] == [("j1", "Data Intern"), ("ml-intern", "ML Intern")]
+    assert jobs[0].description_text == "Python" and str(jobs[0].posted_at).startswith("2026-10-01")
+    assert jobs[1].apply_url == "https://jobs.ashbyhq.com/acme/ml-intern"
+    assert jobs[1].location == "Berlin"
+
+
+def test_ldjson_job_postings_when_next_data_has_none(mock_http):
+    postings = [
+        {"@type": "JobPosting", "title": "Data Intern", "identifier": {"value": 42},
+         "jobLocation": [{"address": {"addressLocality": "Paris", "addressCountry": "FR"}}],
+         "url": "https://jobs.ashbyhq.com/acme/42", "description": "<p>SQL</p>", "datePosted": "2026-09-30"},
+        {"@type": "Organization", "name": "Acme"},
+    ]
+    head = ('<script id="__NEXT_DATA__">{"props": {"pageProps": {}}}</script>'
+            f'<script type="application/ld+json">{json.dumps(postings)}</script>')
+    jobs = _discover(mock_http, _page(head))
+    assert [(j.source_job_id, j.title, j.location, j.apply_url) for j in jobs] == [
+        ("42", "Data Intern", "Paris, FR", "https://jobs.ashbyhq.com/acme/42"),
+    ]
+
+
+def test_anchor_fallback(mock_http):
+    body = ('<a href="/acme/jobs/1">Data Intern</a><a href="/acme/job/2">ML Intern</a>'
+            '<a href="/acme/jobs/1">Data Intern</a><a href="/acme/about">About</a>')
+    jobs = _discover(mock_http, _page('<script id="__NEXT_DATA__">not json</script>', body))
+    assert [(j.title, j.apply_url) for j in jobs] == [
+        ("Data Intern", "https://jobs.ashbyhq.com/acme/jobs/1"),
+        ("ML Intern", "https://jobs.ashbyhq.com/acme/job/2"),
+    ]
+    assert all(j.source_job_id and j.description_text is None for j in jobs)  # synthetic ids
@@ -0,0 +1,70 @@
+import httpx
+from sqlalchemy import select
+
+from db.schemas import Job, JobVersion
+from scraper.adapters.greenhouse import GreenhouseAdapter
+from scraper.pipeline import storage
+
+JOBS = [
+    {"id": 1, "title": "Data Science Intern", "absolute_url": "https://boards.greenhouse.io/acme/jobs/1",
+     "location": {"name": "Paris"}, "updated_at": "2026-10-01", "content": "Python, SQL"},
+    {"id": 2, "title": "Account Executive", "absolute_url": "https://boards.greenhouse.io/acme/jobs/2",
+     "location": {"name": "London"}, "updated_at": "2026-10-01", "content": "Sales"},
+]
+
+
+def _handler(request):
+    path = request.url.path
+    if path.endswith("/jobs"):
+        content = request.url.params.get("content") == "true"
+        return httpx.Response(200, json={"jobs": [
+            j if content else {k: v for k, v in j.items() if k != "content"} for j in JOBS
+        ]})
+    job_id = int(path.rsplit("/", 1)[1])
+    return httpx.Response(200, json=next(j for j in JOBS if j["id"] == job_id))
+
+
+def _scrape(two_phase):
+    adapter = GreenhouseAdapter("acme", "Acme", two_phase=two_phase)
+    jobs = list(adapter.discover())
+    with storage.get_session() as s:
+        for job in jobs:
+            storage.upsert_job(s, job)
+    return adapter, jobs
+
+
+def test_two_phase_fetches_details_only_for_prefiltered_titles(db, mock_http):
+    mock_http(_handler)
+    adapter, jobs = _scrape(two_phase=True)
+    assert {j.title: j.description_text for j in jobs} == {"Data Science Intern": "Python, SQL",
+                                                          "Account Executive": None}
+    assert adapter.stats["requests"] == 2 and adapter.stats["bytes"] > 0
+
+
+def test_two_phase_run_keeps_descriptions_and_records_no_change(db, mock_http):
+    mock_http(_handler)
+    _scrape(two_phase=False)  # full content once
+    _scrape(two_phase=True)   # the sales posting comes without a description now
+    with storage.get_session() as s:
+        descriptions = dict(s.execute(select(Job.title, Job.description_text)).all())
+        kinds = s.execute(select(JobVersion.kind)).scalars().all()
+    assert descriptions["Account Executive"] == "Sales"
+    assert kinds == ["created", "created"]
+
+
+def test_failed_details_cost_their_description_not_the_board(mock_http):
+    board = [dict(JOBS[0], id=i, absolute_url=f"https://boards.greenhouse.io/acme/jobs/{i}") for i in (1, 2, 3)]
+
+    def handler(request):
+        if request.url.path.endswith("/jobs"):
+            return httpx.Response(200, json={"jobs": board})
+        job_id = int(request.url.path.rsplit("/", 1)[1])
+        if job_id == 1:
+            raise httpx.ReadTimeout("slow", request=request)
+        if job_id == 2:
+            return httpx.Response(200, text="<html>maintenance</html>")
+        return httpx.Response(200, json=board[2])
+
+    mock_http(handler)
+    jobs = list(GreenhouseAdapter("acme", "Acme", two_phase=True).discover())
+    assert {j.source_job_id: j.description_text for j in jobs} == {"1": None, "2": None, "3": "Python, SQL"}
@@ -0,0 +1,56 @@
+import httpx
+import pytest
+from sqlalchemy import select
+
+from db.schemas import Job
+from scraper.adapters.lever import LeverAdapter
+from scraper.pipeline import storage
+from scraper.pipeline.orchestrator import scrape_adapter
+from scraper.settings import settings
+
+
+def _board(n):
+    return [{"id": f"p{i}", "text": f"Intern {i}", "hostedUrl": f"https://jobs.lever.co/acme/p{i}",
+             "categories": {"location": "Paris"}, "createdAt": 1760000000000} for i in range(n)]
+
+
+@pytest.fixture
+def lever(mock_http, monkeypatch):
+    monkeypatch.setattr(settings, "LEVER_PAGE_SIZE", 10)
+    monkeypatch.setattr(settings, "ADAPTER_CONCURRENCY", 4)
+
+    def install(n):
+        requested = []
+
+        def handler(request):
+            skip, limit = int(request.url.params["skip"]), int(request.url.params["limit"])
+            requested.append(skip)
+            return httpx.Response(200, json=_board(n)[skip:skip + limit])
+
+        mock_http(handler)
+        return requested
+    return install
+
+
+def test_small_board_is_one_request(lever):
+    requested = lever(7)
+    assert len(list(LeverAdapter("acme").discover())) == 7
+    assert requested == [0]
+
+
+def test_large_board_fans_out_after_a_full_first_window(lever):
+    requested = lever(25)
+    jobs = list(LeverAdapter("acme").discover())
+    assert sorted(j.source_job_id for j in jobs) == sorted(f"p{i}" for i in range(25))
+    assert requested[0] == 0 and sorted(requested[1:]) == [10, 20, 30, 40]
+
+
+
+def test_invalid_posting_is_skipped_and_the_rest_of_the_board_stored(db, mock_http):
+    board = _board(3)
+    board[1]["text"] = "  "
+    mock_http(lambda request: httpx.Response(200, json=board))
+    stats = scrape_adapter(LeverAdapter("acme"), {})
+    assert (stats["seen"], stats["invalid"]) == (2, 1)
+    with storage.get_session(write=False) as s:
+        assert sorted(s.execute(select(Job.source_job_id)).scalars()) == ["p0", "p2"]
@@ -0,0 +1,34 @@
+import httpx
+
+from scraper.adapters.personio import PersonioAdapter
+
+
+def _run(mock_http, responses):
+    requested = []
+
+    def handler(request):
+        lang = request.url.params.get("language", "default")
+        requested.append(lang)
+        return responses[lang]
+
+    mock_http(handler)
+    jobs = list(PersonioAdapter("acme", "Acme").discover())
+    return [j.title for j in jobs], requested
+
+
+def test_english_feed_is_used_first(mock_http):
+    titles, requested = _run(mock_http, {
+        "en": httpx.Response(200, json=[{"id": 1, "name": "Data Intern"}]),
+        "fr": httpx.Response(200, json=[{"id": 1, "name": "Stagiaire Data"}]),
+        "default": httpx.Response(200, json=[{"id": 1, "name": "Stagiaire Data"}]),
+    })
+    assert titles == ["Data Intern"] and requested == ["en"]
+
+
+def test_other_feeds_are_tried_when_english_fails(mock_http):
+    titles, requested = _run(mock_http, {
+        "en": httpx.Response(404),
+        "fr": httpx.Response(200, json={"positions": [{"id": 1, "name": "Stagiaire Data"}]}),
+        "default": httpx.Response(500),
+    })
+    assert titles == ["Stagiaire Data"] and requested[0] == "en" and set(requested) == {"en", "fr", "default"}
@@ -0,0 +1,25 @@
+import httpx
+
+from scraper.adapters.smartrecruiters import SmartRecruitersAdapter
+
+LIST = {"totalFound": 2, "content": [
+    {"id": "1", "name": "Data Intern", "location": {"city": "Paris", "countryCode": "fr"}},
+    {"id": "2", "name": "ML Intern", "location": {"city": "Lyon", "countryCode": "fr"}},
+]}
+
+
+def test_failed_detail_keeps_list_data(mock_http):
+    def handler(request):
+        path = request.url.path
+        if path.endswith("/postings"):
+            return httpx.Response(200, json=LIST)
+        if path.endswith("/postings/1"):
+            raise httpx.ReadTimeout("slow", request=request)
+        return httpx.Response(200, json={"applyUrl": "https://jobs.example/2/apply",
+                                         "jobAd": {"sections": {"jobDescription": {"text": "Python"}}}})
+
+    mock_http(handler)
+    jobs = list(SmartRecruitersAdapter("acme", "Acme").discover())
+    assert [(j.title, j.description_text) for j in jobs] == [("Data Intern", None), ("ML Intern", "Python")]
+    assert jobs[0].apply_url == "https://jobs.smartrecruiters.com/acme/1"
+    assert jobs[1].apply_url == "https://jobs.example/2/apply"
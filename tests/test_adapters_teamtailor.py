@@ -0,0 +1,29 @@
+import httpx
+
+from scraper.adapters.teamtailor import TeamtailorAdapter
+
+PAGE = """<html><body><ul>
+<li><a href="/jobs/101-data-intern"><span class="title"> Data Intern </span></a></li>
+<li><a href="https://acme.teamtailor.com/jobs/102-ml-intern">ML Intern</a></li>
+<li><a href="/jobs/101-data-intern">Data Intern</a></li>
+<li><a href="/jobs/103">›</a></li>
+<li><a href="/job/104">Singular links are not job pages here</a></li>
+<li><a href="/departments/data">Data team</a></li>
+</ul></body></html>"""
+
+
+def test_job_anchors_of_the_jobs_page(mock_http):
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        return httpx.Response(200, text=PAGE)
+
+    mock_http(handler)
+    jobs = list(TeamtailorAdapter("acme", "Acme").discover())
+    assert requested == ["https://acme.teamtailor.com/jobs"]
+    assert [(j.title, j.apply_url) for j in jobs] == [
+        ("Data Intern", "https://acme.teamtailor.com/jobs/101-data-intern"),
+        ("ML Intern", "https://acme.teamtailor.com/jobs/102-ml-intern"),
+    ]
+    assert all(j.company == "Acme" and j.source_job_id for j in jobs)
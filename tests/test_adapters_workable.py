@@ -0,0 +1,48 @@
+import httpx
+import pytest
+
+from scraper.adapters.workable import WorkableAdapter
+
+API = "https://apply.workable.com/api/v3/accounts/acme/jobs"
+PAGE = """<html><body>
+<a href="/acme/jobs/AB12CD">Data Intern</a>
+<a href="https://apply.workable.com/acme/jobs/EF34GH">ML Intern</a>
+<a href="/acme/">All jobs</a>
+</body></html>"""
+
+
+def _discover(mock_http, api_response):
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url.copy_with(query=None)))
+        if request.url.path.startswith("/api/"):
+            assert request.url.params["state"] == "published"
+            return api_response
+        return httpx.Response(200, text=PAGE)
+
+    mock_http(handler)
+    return list(WorkableAdapter("acme", "Acme").discover()), requested
+
+
+def test_api_results(mock_http):
+    jobs, requested = _discover(mock_http, httpx.Response(200, json={"results": [
+        {"id": 7, "shortcode": "AB12CD", "title": " Data Intern ", "city": "Paris", "country": "France",
+         "url": "https://apply.workable.com/acme/j/AB12CD/", "published_on": "2026-10-02"},
+        {"shortcode": "EF34GH", "title": "ML Intern", "country": "Germany"},
+    ]}))
+    assert requested == [API]  # no HTML fallback
+    assert [(j.source_job_id, j.title, j.location) for j in jobs] == [
+        ("7", "Data Intern", "Paris, France"), ("EF34GH", "ML Intern", "Germany"),
+    ]
+    assert jobs[1].apply_url == "https://apply.workable.com/acme/"
+
+
+@pytest.mark.parametrize("status", [404, 429])
+def test_html_fallback_when_the_api_fails(mock_http, status):
+    jobs, requested = _discover(mock_http, httpx.Response(status))
+    assert requested == [API, "https://apply.workable.com/acme/"]
+    assert [(j.title, j.apply_url) for j in jobs] == [
+        ("Data Intern", "https://apply.workable.com/acme/jobs/AB12CD"),
+        ("ML Intern", "https://apply.workable.com/acme/jobs/EF34GH"),
+    ]
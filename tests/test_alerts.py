@@ -0,0 +1,80 @@
+import json
+
+from sqlalchemy import select
+
+from db.schemas import AlertOutbox, SavedSearch
+from scraper.models.record import make_record
+from scraper.pipeline import alerts, storage
+from scraper.settings import settings
+
+
+def _search(search_id, **fields):
+    return alerts.compile_search(SavedSearch(id=search_id, name=f"s{search_id}", **fields))
+
+
+def _job(title, description=None, location=None, **extra):
+    return make_record(source="lever", source_job_id=title, title=title, apply_url="https://x.test/1",
+                       description_text=description, location=location, **extra)
+
+
+def test_compile_search():
+    q = _search(1, keywords="Machine-Learning, python", location="Paris, Île-de-France", tags="Python",
+                sources="lever", profile="default")
+    assert q.required == {"machine learning", "python"}
+    assert q.any_of == (
+        (frozenset({"loc:paris"}), frozenset({"loc:ile de", "loc:de france"})),
+        (frozenset({"tag:python"}),), (frozenset({"src:lever"}),), (frozenset({"profile:default"}),),
+    )
+    # a longer phrase needs all of its word pairs
+    assert _search(2, keywords="deep reinforcement learning").required == {
+        "deep reinforcement", "reinforcement learning"}
+
+
+def test_anchors_pick_one_key_per_search():
+    assert _search(1, keywords="python, machine learning", tags="ml").anchors() == ["machine learning"]
+    assert _search(2, location="Paris, Lyon", tags="python, rust, go").anchors() == ["loc:paris", "loc:lyon"]
+    assert _search(3).anchors() == [alerts.ANY]
+
+
+def test_candidates_are_the_searches_filed_under_a_posting_key():
+    ml, paris, anything = _search(1, keywords="machine learning"), _search(2, location="Paris"), _search(3)
+    index = alerts.SearchIndex([ml, paris, anything])
+    assert set(index.candidates({"machine learning", "loc:lyon"})) == {1, 3}
+    assert set(index.candidates({"loc:paris"})) == {2, 3}
+    assert set(index.candidates(set())) == {3}
+
+
+def test_phrases_match_on_word_pairs_in_order():
+    index = alerts.SearchIndex([_search(1, keywords="machine learning", location="Paris, Lyon")])
+    hit = _job("Machine-Learning Intern", location="Paris, France")
+    assert [q.search_id for q in index.match(hit)] == [1]
+    assert index.match(_job("Learning Machine Intern", location="Paris")) == []
+    assert index.match(_job("Intern", "We do learning of machine models.", location="Paris")) == []
+    assert index.match(_job("Machine learning intern", location="Marseille")) == []
+
+
+def test_new_postings_are_queued_once_and_delivered(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ALERTS_ENABLED", True)
+    monkeypatch.setattr(alerts, "_index", None)  # restored after load()
+    with storage.get_session() as s:
+        s.add_all([SavedSearch(name="ml", keywords="machine learning"), SavedSearch(name="rust", keywords="rust")])
+    assert len(alerts.load()) == 2
+
+    job = _job("Machine Learning Intern", location="Paris")
+    for _ in range(2):  # the second upsert updates the row: no new alert
+        with storage.get_session() as s:
+            alerts.on_upsert(s, storage.upsert_job(s, job), job)
+
+    path = str(tmp_path / "alerts" / "outbox.jsonl")
+    assert alerts.deliver(path) == f"[alerts] 1 new matches → {path}: ml=1"
+    with open(path, encoding="utf-8") as fh:
+        (line,) = [json.loads(x) for x in fh]
+    assert (line["search"], line["title"], line["location"]) == ("ml", "Machine Learning Intern", "Paris")
+    assert alerts.deliver(path) is None  # already delivered
+    with storage.get_session(write=False) as s:
+        assert s.execute(select(AlertOutbox.delivered_at)).scalar_one() is not None
+
+
+def test_alerts_disabled(db, monkeypatch):
+    monkeypatch.setattr(settings, "ALERTS_ENABLED", False)
+    assert alerts.load() is None and alerts.deliver() is None
@@ -0,0 +1,35 @@
+from sqlalchemy import select
+
+from db.schemas import Job, JobProfile
+from scraper.pipeline import facets, storage
+from scraper.settings import settings
+from scripts.backfill_source import classify_chunk, iter_chunks, write_chunk
+
+
+def test_backfill_keeps_adapter_country_and_updates_profiles_and_facets(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "FACET_INDEX_PATH", str(tmp_path / "facets.bin"))
+    with storage.get_session() as s:
+        s.add(Job(source="workday", source_job_id="1", title="Data Engineer Intern", apply_url="https://x.test/1",
+                  description_text="Internship: build Python and SQL data pipelines with Spark.",
+                  location="Remote", country_code="DE", is_remote=False))
+        s.add(JobProfile(job_id=1, profile="fr_ml_interns"))  # stale membership
+    with db.connect() as conn:
+        idx = facets.load_or_build(conn)
+    assert not idx.match({"tag": ["python"]})
+
+    (rows,) = iter_chunks(db, None, 0, 100)
+    updates = classify_chunk(rows)
+    assert updates[0]["country_code"] == "DE" and updates[0]["is_remote"]
+    with storage.get_session() as s:
+        write_chunk(s, updates)
+
+    with storage.get_session(write=False) as s:
+        job = s.get(Job, 1)
+        members = s.execute(select(JobProfile.profile)).scalars().all()
+    assert job.country_code == "DE" and "python" in job.tags.split(",")
+    assert sorted(members) == sorted(job.profiles.split(",")) and "eu_data" in members
+    assert "fr_ml_interns" not in members
+    # the incremental facet update sees the re-classified row
+    with db.connect() as conn:
+        idx = facets.load_or_build(conn)
+    assert facets.to_ids(idx.match({"tag": ["python"], "country": ["DE"], "remote": True})) == [1]
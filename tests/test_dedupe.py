@@ -0,0 +1,29 @@
+import pytest
+
+from scraper.pipeline.dedupe import canonical_url, is_synthetic, synthetic_job_id
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://WWW.Acme.com:443/fr-FR/Jobs/42/?utm_source=x&b=2&a=1#apply", "https://acme.com/jobs/42?a=1&b=2"),
+    ("http://acme.com:8080/jobs/42", "http://acme.com:8080/jobs/42"),
+    ("https://acme.com/en/jobs/42?gh_src=abc&lever-origin=applied&gclid=1&fbclid=2", "https://acme.com/jobs/42"),
+    ("https://acme.com/en", "https://acme.com/en"),  # a lone segment is the path, not a locale
+    # generic names can be the job reference itself
+    ("https://acme.com/careers?ref=123", "https://acme.com/careers?ref=123"),
+    ("https://acme.com/careers?source=board&share=1", "https://acme.com/careers?share=1&source=board"),
+])
+def test_canonical_url(url, expected):
+    assert canonical_url(url) == expected
+
+
+def test_synthetic_job_id_is_stable_across_url_variants():
+    a = synthetic_job_id("https://www.acme.com/fr/jobs/42/?utm_medium=li", "Stage  Data ")
+    b = synthetic_job_id("https://acme.com/jobs/42", "stage data")
+    assert a == b and is_synthetic(a) and len(a) == 34
+
+
+def test_synthetic_job_id_keeps_distinct_postings_apart():
+    assert synthetic_job_id("https://acme.com/careers", "Data Intern") != \
+        synthetic_job_id("https://acme.com/careers", "ML Intern")
+    assert synthetic_job_id("https://acme.com/careers?ref=1", "Intern") != \
+        synthetic_job_id("https://acme.com/careers?ref=2", "Intern")
@@ -0,0 +1,103 @@
+import os
+import time
+
+import httpx
+import pytest
+
+from db.schemas import Job, JobVersion
+from scraper.client import http
+from scraper.models.record import make_record
+from scraper.pipeline import enrich, storage
+from scraper.pipeline.orchestrator import classify_job
+from scraper.settings import settings
+
+URL = "https://jobs.acme.example/stage-data"
+PAGE = """<html><head><script type="application/ld+json">
+{"@type": "JobPosting", "description": "<p>Stage data engineering, Python et SQL</p>", "datePosted": "2026-01-05"}
+</script></head><body></body></html>"""
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ENRICH_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(settings, "ENRICH_CACHE_TTL_HOURS", 1.0)
+    monkeypatch.setattr(settings, "HTTP_MODE", "live")
+    monkeypatch.setattr(enrich, "_cache", None)
+    return enrich.get_cache()
+
+
+def _job():
+    return make_record(source="teamtailor", source_job_id="1", title="Stage Data Engineer", apply_url=URL)
+
+
+def _expire(cache, url):
+    path = cache._url_path(url)
+    digest, _ = open(path).read().split()
+    with open(path, "w") as fh:
+        fh.write(f"{digest} {time.time() - 7200:.0f}")
+
+
+def test_failed_fetch_falls_back_to_expired_cache(cache, mock_http):
+    pages = iter([httpx.Response(200, text=PAGE, headers={"Content-Type": "text/html"}),
+                  httpx.Response(503)])
+    mock_http(lambda request: next(pages))
+    first = next(enrich.enrich_jobs([_job()]))
+    assert "Python et SQL" in first.description_text
+    _expire(cache, URL)
+    second = next(enrich.enrich_jobs([_job()]))
+    assert second.description_text == first.description_text
+
+
+def test_failed_fetch_without_cache_keeps_stored_description(db, cache, mock_http):
+    mock_http(lambda request: httpx.Response(200, text=PAGE, headers={"Content-Type": "text/html"}))
+    with storage.get_session() as s:
+        storage.upsert_job(s, next(enrich.enrich_jobs([_job()])))
+    os.remove(cache._url_path(URL))
+    mock_http(lambda request: httpx.Response(503))
+    job = next(enrich.enrich_jobs([_job()]))
+    assert job.description_text is None
+    with storage.get_session() as s:
+        storage.upsert_job(s, job)
+    with storage.get_session() as s:
+        assert "Python et SQL" in s.query(Job).one().description_text
+
+
+def test_detail_fetches_are_timed_in_the_callers_request_log(cache, mock_http):
+    mock_http(lambda request: httpx.Response(200, text=PAGE, headers={"Content-Type": "text/html"}))
+    with http.request_log() as log:
+        list(enrich.enrich_jobs([_job()]))
+    assert log.requests == 1 and "jobs.acme.example" in log.hosts()
+
+
+def test_rescrape_after_failed_enrichment_keeps_the_stored_details(db, cache, mock_http):
+    mock_http(lambda request: httpx.Response(200, text=PAGE.replace(
+        '"datePosted"', '"jobLocation": {"address": {"addressLocality": "Lyon", "addressCountry": "FR"}}, "datePosted"'),
+        headers={"Content-Type": "text/html"}))
+    first = next(enrich.enrich_jobs([_job()]))
+    classify_job(first)
+    with storage.get_session() as s:
+        storage.upsert_job(s, first)
+    os.remove(cache._url_path(URL))
+    mock_http(lambda request: httpx.Response(503))
+    bare = next(enrich.enrich_jobs([_job()]))  # detail fetch failed, nothing cached
+    classify_job(bare)
+    with storage.get_session() as s:
+        storage.upsert_job(s, bare)
+    with storage.get_session(write=False) as s:
+        row = s.query(Job).one()
+        assert (row.location, row.country_code, row.posted_at) == ("Lyon, FR", "FR", "2026-01-05")
+        assert (row.internship_score, row.cs_score, row.tags) == (
+            first.internship_score, first.cs_score, ",".join(first.tags))
+        assert s.query(JobVersion).count() == 1
+
+
+def test_stored_description_is_reused_instead_of_fetched(db, cache, mock_http):
+    mock_http(lambda request: httpx.Response(200, text=PAGE, headers={"Content-Type": "text/html"}))
+    with storage.get_session() as s:
+        storage.upsert_job(s, next(enrich.enrich_jobs([_job()])))
+    _expire(cache, URL)
+    requested = []
+    mock_http(lambda request: requested.append(request) or httpx.Response(503))
+    job = next(enrich.enrich_jobs(storage.fill_from_stored([_job()])))
+    assert "Python et SQL" in job.description_text and job.posted_at == "2026-01-05"
+    assert requested == []
@@ -0,0 +1,33 @@
+import pytest
+from sqlalchemy import text
+
+from db.schemas import Job
+from scraper.pipeline import storage
+from scraper.pipeline.export import export_jobs, load_state
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+
+def _add(*ids):
+    with storage.get_session() as s:
+        for i in ids:
+            s.add(Job(source="x", source_job_id=str(i), title=f"Job {i}", apply_url=f"https://x.test/{i}"))
+        s.flush()
+        # as written by the CURRENT_TIMESTAMP default: one-second precision, all in one second
+        s.execute(text("UPDATE jobs SET scraped_at = '2026-10-19 09:30:00'"))
+
+
+def _exported(out):
+    return sorted(pq.read_table(out, columns=["source_job_id"]).column("source_job_id").to_pylist())
+
+
+def test_incremental_export_keeps_rows_sharing_the_checkpoint_second(db, tmp_path):
+    out = str(tmp_path / "jobs")
+    _add(1, 2)
+    assert export_jobs(db, out, chunk_size=1)["rows"] == 2
+    _add(3, 4)  # same scraped_at second as the checkpoint row
+    assert export_jobs(db, out)["rows"] == 2
+    assert export_jobs(db, out)["rows"] == 0
+    assert _exported(out) == ["1", "2", "3", "4"]
+    assert load_state(out) == {"last_id": 4}
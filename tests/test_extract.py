@@ -0,0 +1,72 @@
+from scraper.adapters.extract import (
+    find_next_data, html_to_text, iter_job_anchors, iter_ldjson, meta_description, page_text, parse_html,
+)
+
+NEXT_DATA_PAGE = """<html><head>
+<script src="/app.js"></script>
+<SCRIPT type="application/json" data-x='1' id='__NEXT_DATA__' >{"props": {"pageProps": {"jobs": [
+  {"id": "a1", "title": "Data Intern", "note": "</b> is fine inside a string"}]}}}</script >
+<script>window.after = 1;</script>
+</head><body></body></html>"""
+
+LDJSON_PAGE = """<html><head>
+<script type="application/ld+json">{"@type": "Organization", "name": "Acme"}</script>
+<script type="application/ld+json">{not json</script>
+<script TYPE='application/ld+json'>
+[{"@type": "JobPosting", "title": "ML Intern"}]
+</script>
+</head><body></body></html>"""
+
+ANCHOR_PAGE = """<html><body>
+<a href="/jobs/1"><span> Data </span><b>Intern</b></a>
+<a href="https://acme.example/jobs/1">Data Intern (again)</a>
+<a href="/jobs/2">→</a>
+<a href="/job/3">Backend Intern</a>
+<a href="/about">About us</a>
+</body></html>"""
+
+DETAIL_PAGE = """<html><head><meta property="og:description" content=" Join the data team. ">
+<style>p { color: red }</style></head>
+<body><nav>Home Jobs</nav><main><h1>Data Intern</h1><p>Python,
+   SQL</p><script>track()</script></main><footer>© Acme</footer></body></html>"""
+
+
+def test_next_data_is_sliced_out_of_the_raw_text():
+    data = find_next_data(NEXT_DATA_PAGE)
+    assert data["props"]["pageProps"]["jobs"][0]["id"] == "a1"
+
+
+def test_next_data_missing_unclosed_or_invalid_is_none():
+    assert find_next_data("<html><script>var x = 1;</script></html>") is None
+    assert find_next_data('<script id="__NEXT_DATA__">{"a": 1}') is None
+    assert find_next_data('<script id="__NEXT_DATA__">{"a": </script>') is None
+    assert find_next_data('<script id="__NEXT_DATA__">[1, 2]</script>') is None
+
+
+def test_ldjson_skips_undecodable_blobs():
+    assert list(iter_ldjson(LDJSON_PAGE)) == [
+        {"@type": "Organization", "name": "Acme"},
+        [{"@type": "JobPosting", "title": "ML Intern"}],
+    ]
+
+
+def test_job_anchors_are_absolute_deduplicated_and_skip_icons():
+    doc = parse_html(ANCHOR_PAGE)
+    assert list(iter_job_anchors(doc, "https://acme.example/careers")) == [
+        ("https://acme.example/jobs/1", "DataIntern"),
+    ]
+    singular = list(iter_job_anchors(parse_html(ANCHOR_PAGE), "https://acme.example/", include_singular=True))
+    assert [url for url, _ in singular] == ["https://acme.example/jobs/1", "https://acme.example/job/3"]
+
+
+def test_page_text_prefers_main_and_drops_chrome():
+    doc = parse_html(DETAIL_PAGE)
+    assert meta_description(doc) == "Join the data team."
+    assert page_text(doc) == "Data Intern Python, SQL"
+    assert page_text(parse_html("<html><body><p>Only   body</p></body></html>")) == "Only body"
+
+
+def test_html_to_text_flattens_fragments():
+    assert html_to_text("<p>Python</p><ul><li>SQL</li></ul>") == "Python SQL"
+    assert html_to_text("  plain\n text ") == "plain text"
+    assert html_to_text(None) == ""
@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import update
+
+from db.schemas import Job
+from scraper.pipeline import facets, storage
+
+T1 = datetime(2026, 10, 1, tzinfo=timezone.utc)
+T2 = datetime(2026, 10, 2, tzinfo=timezone.utc)
+
+
+class PerStatement:
+    """Each statement in its own transaction (READ COMMITTED-like); `between` runs after the first."""
+
+    def __init__(self, engine, between):
+        self.engine, self.between = engine, between
+
+    def execute(self, stmt):
+        with self.engine.connect() as c:
+            result = c.execute(stmt).freeze()
+        if self.between:
+            self.between, between = None, self.between
+            between()
+        return result()
+
+
+def test_rows_written_during_an_update_are_picked_up(db):
+    with storage.get_session() as s:
+        s.add(Job(source="lever", source_job_id="1", title="Intern", apply_url="https://x.test/1", tags="python",
+                  last_seen_at=T1))
+    idx = facets.FacetIndex()
+    with storage.get_session(write=False) as s:
+        idx.update(s)
+    assert idx.counts("tag") == {"python": 1}
+
+    def rescrape():
+        with storage.get_session() as s:
+            s.execute(update(Job).values(tags="rust", change_seq=storage.change_seq(s)))
+
+    idx.update(PerStatement(db, rescrape))
+    with storage.get_session(write=False) as s:
+        idx.update(s)
+    assert idx.counts("tag") == {"rust": 1}
+
+
+def test_save_and_open_round_trip(db, tmp_path):
+    with storage.get_session() as s:
+        s.add_all(Job(source="lever", source_job_id=str(i), title="Intern", apply_url=f"https://x.test/{i}",
+                      tags="python" if i % 2 else "rust", country_code="FR", last_seen_at=T1) for i in range(10))
+    with storage.get_session(write=False) as s:
+        facets.load_or_build(s, str(tmp_path / "facets.bin"))
+    idx = facets.FacetIndex.open(str(tmp_path / "facets.bin"))
+    assert idx.counts("tag") == {"python": 5, "rust": 5}
+    assert idx.match({"country": ["FR"], "tag": "rust"}).bit_count() == 5
+    assert [f for f in tmp_path.iterdir() if f.suffix == ".tmp"] == []
+
+
+def test_change_seq_follows_commit_order_not_write_time(db):
+    """A posting written before a later one but committed after it is still picked up."""
+    idx = facets.FacetIndex()
+    slow = storage._Session()
+    slow.add(Job(source="lever", source_job_id="1", title="Intern", apply_url="https://x.test/1", tags="go",
+                 change_seq=storage.change_seq(slow), last_seen_at=T2))
+    slow.flush()  # stamped, holds the write lock, not committed
+    with storage.get_session(write=False) as s:
+        idx.update(s)
+    slow.commit()
+    slow.close()
+    with storage.get_session() as s:
+        s.add(Job(source="lever", source_job_id="2", title="Intern", apply_url="https://x.test/2", tags="go",
+                  change_seq=storage.change_seq(s), last_seen_at=T1))
+    with storage.get_session(write=False) as s:
+        idx.update(s)
+    with storage.get_session() as s:
+        s.execute(update(Job).where(Job.source_job_id == "1").values(tags="rust", change_seq=storage.change_seq(s)))
+    with storage.get_session(write=False) as s:
+        idx.update(s)
+    assert idx.counts("tag") == {"go": 1, "rust": 1}
@@ -0,0 +1,46 @@
+from sqlalchemy import select, text
+
+from db.base import Base
+from db.schemas import Job
+from scraper.pipeline import storage
+from scraper.pipeline.audiences import PROFILES, TARGET_FILTERS
+from scraper.pipeline.filters import filter_clauses, passes
+from scraper.pipeline.normalize import classify
+
+INTERN = classify("Data science intern", "Python, machine learning, SQL", "Paris, France")
+SENIOR = classify("Senior sales manager", "Sell software to enterprises", "Paris, France")
+UNCLASSIFIED = {"internship_score": None, "cs_score": None, "cs_mask": None, "is_france": None}
+
+
+def test_passes_and_profiles_agree():
+    assert passes(INTERN, TARGET_FILTERS) and not passes(SENIOR, TARGET_FILTERS)
+    assert "default" in PROFILES.names_of(PROFILES.match(INTERN))
+    assert "default" not in PROFILES.names_of(PROFILES.match(SENIOR))
+
+
+def test_unclassified_rows_are_not_filtered_out(db):
+    assert passes(UNCLASSIFIED, TARGET_FILTERS | {"france_only": True, "cs_buckets": ["data"]})
+    assert "default" in PROFILES.names_of(PROFILES.match(UNCLASSIFIED))
+    with storage.get_session() as s:
+        s.add(Job(source="x", source_job_id="1", title="Old row", apply_url="https://x.test/1"))
+        s.add(Job(source="x", source_job_id="2", title="Sales", apply_url="https://x.test/2",
+                  internship_score=SENIOR["internship_score"], cs_score=SENIOR["cs_score"],
+                  cs_mask=SENIOR["cs_mask"], is_france=True))
+    with storage.get_session() as s:
+        titles = s.execute(select(Job.title).where(*filter_clauses(TARGET_FILTERS))).scalars().all()
+    assert titles == ["Old row"]
+
+
+def test_added_columns_keep_their_default(tmp_path):
+    url = f"sqlite:///{tmp_path / 'old.db'}"
+    engine = storage.make_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE jobs (id INTEGER PRIMARY KEY, source VARCHAR(50) NOT NULL, "
+                          "title VARCHAR(300) NOT NULL, apply_url VARCHAR(1000) NOT NULL)"))
+        conn.execute(text("INSERT INTO jobs (source, title, apply_url) VALUES ('x', 'Old', 'https://x.test')"))
+    Base.metadata.create_all(engine)  # as init_engine: the other tables are new
+    storage._ensure_schema(engine)
+    with engine.connect() as conn:
+        row = conn.execute(text("SELECT is_remote, internship_score FROM jobs")).one()
+    engine.dispose()
+    assert tuple(row) == (0, None)
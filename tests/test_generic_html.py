@@ -0,0 +1,49 @@
+import httpx
+from lxml import etree
+
+from scraper.adapters.generic_html import ExtractionPlan, GenericHTMLAdapter
+from scraper.pipeline import orchestrator
+
+PAGE = """<html><body><ul>
+<li class="job"><h3>Stagiaire Data</h3><a href="/jobs/1">x</a><span class="loc">Paris</span></li>
+<li class="job"><h3>Backend Intern</h3><a href="/jobs/2">x</a><span class="loc">Lyon</span></li>
+</ul></body></html>"""
+
+CONFIG = {
+    "list_urls": ["https://acme.example/careers"],
+    "item": "//li[contains(@class, 'job')]",
+    "fields": {"title": ".//h3", "url": ".//a/@href", "location": ".//*[@class='loc']"},
+    "pagination": {"param": "page", "start": 1, "max_pages": 10},
+}
+
+
+def test_value_handles_number_and_boolean_results():
+    doc = etree.fromstring(PAGE, etree.HTMLParser())
+    assert ExtractionPlan._value(etree.XPath("count(//li)")(doc)) == "2"
+    assert ExtractionPlan._value(etree.XPath("boolean(//li)")(doc)) == "true"
+    assert ExtractionPlan._value(etree.XPath("count(//li) div 4")(doc)) == "0.5"
+    assert ExtractionPlan._value(etree.XPath("string(//h3)")(doc)) == "Stagiaire Data"
+
+
+def test_numbered_pagination_stops_when_page_repeats(mock_http):
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        return httpx.Response(200, text=PAGE)  # ignores ?page=
+
+    mock_http(handler)
+    jobs = list(GenericHTMLAdapter("acme", CONFIG, company="Acme").discover())
+    assert [j.title for j in jobs] == ["Stagiaire Data", "Backend Intern"]
+    assert [j.location for j in jobs] == ["Paris", "Lyon"]
+    # one concurrency window at most, not max_pages
+    assert len(requested) <= GenericHTMLAdapter("acme", CONFIG).concurrency
+
+
+def test_bad_config_skips_only_that_source(monkeypatch, capsys):
+    monkeypatch.setattr(orchestrator, "SOURCES", [
+        {"type": "generic_html", "slug": "broken", "config": dict(CONFIG, item="//li[")},
+        {"type": "generic_html", "slug": "acme", "config": CONFIG},
+    ])
+    assert [a.slug for a in orchestrator.iter_adapters()] == ["acme"]
+    assert "bad config for type='generic_html' slug='broken'" in capsys.readouterr().out
@@ -0,0 +1,28 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from db.schemas import ScrapeRun
+from scraper.pipeline import health, schedule, storage
+from scraper.settings import settings
+
+T0 = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+def _run(label, i, mode, p99, kept):
+    hosts = {"api.example": {"n": 20, "p50": p99 / 2, "p99": p99, "max": p99, "errors": 0, "timeouts": 0}}
+    return ScrapeRun(label=label, source="greenhouse", started_at=T0 + timedelta(hours=i), duration_s=p99 * 20,
+                     status="ok", kept=kept, requests=20, hosts=json.dumps(hosts), http_mode=mode)
+
+
+def test_replayed_runs_do_not_feed_timeouts_or_estimates(db, monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_MODE", "replay")
+    health.record_run("greenhouse:a", "greenhouse", T0, 0.01, "ok", {"kept": 3})
+    with storage.get_session() as s:
+        assert s.query(ScrapeRun).one().http_mode == "replay"
+        s.add(_run("greenhouse:a", 1, None, 2.0, 10))      # recorded before http_mode existed
+        s.add(_run("greenhouse:a", 2, "replay", 0.001, 10))
+    with storage.get_session(write=False) as s:
+        timeouts = health.host_timeouts(s)
+        est = schedule.estimates(s)["greenhouse:a"]
+    assert timeouts["api.example"].read == 2.0 * settings.TIMEOUT_P99_FACTOR
+    assert est.duration_s == 40.0 and est.kept_per_s == 10 / 40
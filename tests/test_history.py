@@ -0,0 +1,33 @@
+from sqlalchemy import select
+
+from db.schemas import Job, JobVersion
+from scraper.models.record import make_record
+from scraper.pipeline import storage
+
+
+def _upsert(**changes):
+    values = dict(source="lever", source_job_id="1", title="Data Intern", apply_url="https://x.test/1",
+                  description_text="Python and SQL")
+    with storage.get_session() as s:
+        storage.upsert_job(s, make_record(**(values | changes)))
+
+
+def _versions():
+    with storage.get_session() as s:
+        return s.execute(select(JobVersion.kind).order_by(JobVersion.id)).scalars().all()
+
+
+def test_posting_without_description_is_not_a_change(db):
+    _upsert()
+    _upsert(description_text=None)  # e.g. a run with ENRICH_DETAILS off
+    _upsert()
+    assert _versions() == ["created"]
+    with storage.get_session() as s:
+        assert s.execute(select(Job.description_text)).scalar_one() == "Python and SQL"
+
+
+def test_changed_content_appends_a_version(db):
+    _upsert()
+    _upsert(title="Data Science Intern")
+    _upsert(title="Data Science Intern", description_text=None)
+    assert _versions() == ["created", "changed"]
@@ -0,0 +1,81 @@
+import asyncio
+import gzip
+import json
+
+import httpx
+import pytest
+
+from scraper.client import http
+from scraper.settings import settings
+
+
+def _record(path):
+    """Record three exchanges through a mocked network; the second GET answers differently."""
+    calls = {"n": 0}
+
+    def handler(request):
+        if request.method == "POST":
+            return httpx.Response(201, json={"echo": json.loads(request.content)})
+        calls["n"] += 1
+        body = gzip.compress(f"page {calls['n']}".encode())
+        return httpx.Response(200, content=body, headers={"content-encoding": "gzip", "x-run": str(calls["n"])})
+
+    transport = http.RecordingTransport(http.Cassette(path), inner=httpx.MockTransport(handler))
+    with httpx.Client(transport=transport) as client:
+        assert client.get("https://jobs.test/list").text == "page 1"
+        assert client.get("https://jobs.test/list").text == "page 2"
+        assert client.post("https://jobs.test/search", json={"q": "intern"}).status_code == 201
+
+
+@pytest.fixture
+def replay(tmp_path, monkeypatch):
+    path = str(tmp_path / "cassette.jsonl.gz")
+    _record(path)
+    monkeypatch.setattr(settings, "HTTP_MODE", "replay")
+    monkeypatch.setattr(settings, "HTTP_CASSETTE", path)
+    monkeypatch.setattr(http, "_shared", {})
+    return path
+
+
+def test_recording_appends_one_decoded_entry_per_exchange(tmp_path):
+    path = str(tmp_path / "cassette.jsonl.gz")
+    _record(path)
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        entries = [json.loads(line) for line in fh]
+    assert [(e["method"], e["status"]) for e in entries] == [("GET", 200), ("GET", 200), ("POST", 201)]
+    assert all("content-encoding" not in dict(e["headers"]) for e in entries)  # bodies are stored decoded
+    assert len(http.ReplayIndex(path)) == 3
+
+
+def test_replay_serves_recorded_responses_in_order(replay):
+    with http.get_client() as client:
+        first, second, third = (client.get("https://jobs.test/list") for _ in range(3))
+        posted = client.post("https://jobs.test/search", json={"q": "intern"})
+    assert [r.text for r in (first, second, third)] == ["page 1", "page 2", "page 2"]  # last one repeats
+    assert second.headers["x-run"] == "2"
+    assert posted.status_code == 201 and posted.json() == {"echo": {"q": "intern"}}
+
+
+def test_async_replay_matches_the_sync_one(replay):
+    async def fetch():
+        async with http.get_async_client() as client:
+            pages = [(await client.get("https://jobs.test/list")).text for _ in range(2)]
+            posted = await client.post("https://jobs.test/search", json={"q": "intern"})
+            return pages, posted.json()
+
+    assert asyncio.run(fetch()) == (["page 1", "page 2"], {"echo": {"q": "intern"}})
+
+
+def test_unrecorded_request_is_a_connect_error(replay):
+    with http.get_client() as client:
+        with pytest.raises(httpx.ConnectError, match="not in cassette"):
+            client.get("https://jobs.test/other")
+        with pytest.raises(httpx.ConnectError):  # same URL, another body
+            client.post("https://jobs.test/search", json={"q": "senior"})
+
+    async def fetch():
+        async with http.get_async_client() as client:
+            await client.get("https://jobs.test/other")
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(fetch())
@@ -0,0 +1,31 @@
+import pytest
+
+from scraper.models.record import make_record
+from scraper.pipeline.location import parse_location
+from scraper.settings import settings
+
+
+@pytest.mark.parametrize("raw, city, country, remote", [
+    ("Paris, FR", "Paris", "FR", False),
+    ("Remote - France", None, "FR", True),
+    ("Greater London", "London", "GB", False),
+    ("Paris Area", "Paris", "FR", False),
+    ({"city": "Lyon", "country": "France"}, "Lyon", "FR", False),
+    (["Berlin", "Munich"], "Berlin", "DE", False),
+    ("Nice", "Nice", "FR", False),
+    # common words that are also city names only count as a location component
+    ("Nice team, remote", None, None, True),
+    ("Tours and travel", None, None, False),
+])
+def test_parse_location(raw, city, country, remote):
+    parsed = parse_location(raw)
+    assert (parsed.city, parsed.country_code, parsed.is_remote) == (city, country, remote)
+
+
+@pytest.mark.parametrize("validate", [True, False])
+def test_make_record_parses_location(monkeypatch, validate):
+    monkeypatch.setattr(settings, "VALIDATE_JOBS", validate)
+    rec = make_record(source="x", title="Intern", apply_url="https://x.test/1",
+                      location={"addressLocality": "Lyon", "addressCountry": "FR"})
+    assert (rec.location, rec.country_code, rec.is_remote) == ("Lyon, FR", "FR", False)
+
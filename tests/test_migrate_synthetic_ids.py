@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+from db.schemas import AlertOutbox, Job, JobProfile, SavedSearch
+from scraper.pipeline import storage
+from scraper.pipeline.dedupe import synthetic_job_id
+from scripts.migrate_synthetic_ids import migrate_chunk
+
+T0 = datetime(2026, 10, 1, tzinfo=timezone.utc)
+URL = "https://acme.example/jobs/42"
+
+
+def test_merged_duplicate_leaves_no_orphans(db):
+    with storage.get_session() as s:
+        keep = Job(source="teamtailor", source_job_id=synthetic_job_id(URL, "Data Intern"), title="Data Intern",
+                   apply_url=URL)
+        dup = Job(source="teamtailor", title="Data Intern", apply_url=URL + "/?utm_source=li")
+        searches = [SavedSearch(name="a"), SavedSearch(name="b")]
+        s.add_all([keep, dup, *searches])
+        s.flush()
+        s.add_all([JobProfile(job_id=keep.id, profile="default"), JobProfile(job_id=dup.id, profile="default"),
+                   JobProfile(job_id=dup.id, profile="paris"),
+                   AlertOutbox(search_id=searches[0].id, job_id=keep.id, created_at=T0),
+                   AlertOutbox(search_id=searches[0].id, job_id=dup.id, created_at=T0),
+                   AlertOutbox(search_id=searches[1].id, job_id=dup.id, created_at=T0)])
+        keep_id = keep.id
+
+    with storage.get_session() as s:
+        assert migrate_chunk(s, 0, 100, None)[1:] == (0, 1)
+    with storage.get_session() as s:
+        assert s.execute(select(Job.id)).scalars().all() == [keep_id]
+        assert s.execute(select(JobProfile.job_id, JobProfile.profile)).all() == [(keep_id, "default")]
+        alerts = s.execute(select(AlertOutbox.job_id, AlertOutbox.search_id).order_by(AlertOutbox.search_id)).all()
+        assert [a.job_id for a in alerts] == [keep_id, keep_id] and len({a.search_id for a in alerts}) == 2
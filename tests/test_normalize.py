@@ -0,0 +1,6 @@
+from scraper.pipeline.normalize import detect_lang
+
+
+def test_detect_lang_is_deterministic():
+    text = "Stage data engineer Paris python team"
+    assert len({detect_lang(text) for _ in range(20)}) == 1
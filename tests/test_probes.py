@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+import httpx
+import pytest
+from sqlalchemy import select, update
+
+from db.schemas import Job, SourceSignature
+from scraper.adapters.greenhouse import GreenhouseAdapter
+from scraper.pipeline import orchestrator, storage
+from scraper.pipeline.history import utcnow
+from scraper.settings import settings
+
+
+def _jobs(slug):
+    return [{"id": f"{slug}{i}", "title": "Account Executive", "updated_at": "2026-10-01",
+             "absolute_url": f"https://boards.greenhouse.io/{slug}/jobs/{i}"} for i in range(2)]
+
+
+@pytest.fixture
+def boards(db, mock_http, monkeypatch):
+    monkeypatch.setattr(settings, "PROBE_BOARDS", True)
+    monkeypatch.setattr(settings, "ENRICH_DETAILS", False)
+    requested = []
+
+    def handler(request):
+        requested.append(request.url.path)
+        slug = request.url.path.split("/")[3]
+        return httpx.Response(200, json={"jobs": _jobs(slug)})
+
+    mock_http(handler)
+    return requested
+
+
+def _scrape(slug):
+    return orchestrator.scrape_adapter(GreenhouseAdapter(slug, "Acme", two_phase=True), {})
+
+
+def _last_seen():
+    with storage.get_session() as s:
+        return dict(s.execute(select(Job.source_job_id, Job.last_seen_at)).all())
+
+
+def test_changed_board_reuses_the_probe_listing(boards):
+    _scrape("acme-fr")
+    assert boards == ["/v1/boards/acme-fr/jobs"]  # probe only; the fetch reused it
+
+
+def test_unchanged_board_bumps_only_its_own_postings(boards):
+    _scrape("acme-fr")
+    _scrape("acme-us")  # same company name, other board
+    with storage.get_session() as s:
+        assert sorted(s.execute(select(SourceSignature.label)).scalars()) == [
+            "greenhouse:acme-fr", "greenhouse:acme-us"]
+        s.execute(update(Job).values(last_seen_at=utcnow() - timedelta(minutes=5)))
+        s.execute(update(SourceSignature).values(fetched_at=utcnow() - timedelta(minutes=10)))
+    before = _last_seen()
+    stats = _scrape("acme-fr")
+    after = _last_seen()
+    assert stats.get("unchanged")
+    assert {k for k in after if after[k] != before[k]} == {"acme-fr0", "acme-fr1"}
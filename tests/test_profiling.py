@@ -0,0 +1,73 @@
+import os
+import time
+
+import pytest
+
+from scraper.adapters.base import BaseAdapter
+from scraper.pipeline import orchestrator
+from scraper.pipeline.profiling import make_profiler
+from scraper.settings import settings
+
+LABEL = "lever:Acme Corp"
+
+
+def busy_listing(seconds):
+    end = time.perf_counter() + seconds
+    n = 0
+    while time.perf_counter() < end:
+        n += sum(i * i for i in range(200))
+    return n
+
+
+class Board(BaseAdapter):
+    source_name = "lever"
+    company = "Acme Corp"
+
+    def discover(self):
+        busy_listing(0.15)
+        yield self.make_job(source="lever", source_job_id="1", title="Data Intern", company=self.company,
+                            apply_url="https://x.test/1")
+
+
+@pytest.fixture
+def run(db, monkeypatch, tmp_path):
+    for key, value in {"ENRICH_DETAILS": False, "PROBE_BOARDS": False, "FACET_INDEX": False,
+                       "ALERTS_ENABLED": False}.items():
+        monkeypatch.setattr(settings, key, value)
+    monkeypatch.setattr(orchestrator, "iter_adapters", lambda: iter([Board()]))
+
+    def profile(name, **kwargs):
+        profiler = make_profiler(name, **kwargs)
+        orchestrator.run_once(profiler=profiler, profile_top=3)
+        return profiler, profiler.write(str(tmp_path))
+    return profile
+
+
+def _folded(path):
+    with open(path, encoding="utf-8") as fh:
+        return [line.rsplit(" ", 1) for line in fh.read().splitlines()]
+
+
+@pytest.mark.parametrize("name,kwargs", [("sampling", {"interval": 0.002}), ("cprofile", {})])
+def test_adapter_run_is_profiled_under_its_label(run, capsys, name, kwargs):
+    profiler, paths = run(name, **kwargs)
+    assert os.path.basename(paths[0]) == "run.folded"
+    folded = _folded(paths[0])
+    assert folded and all(stack.startswith("lever_Acme_Corp;") and int(n) > 0 for stack, n in folded)
+    assert any("test_profiling.py:busy_listing" in stack for stack, _ in folded)
+
+    top = profiler.top(LABEL, 3)
+    assert 1 <= len(top) <= 3 and any("test_profiling.py:" in line for line in top)  # the busy loop
+    assert profiler.top("lever:Other", 3) == []
+    out = capsys.readouterr().out
+    assert all(line in out for line in top)  # printed under the [done] line
+
+
+def test_cprofile_also_writes_a_prof_file_per_label(run):
+    _, paths = run("cprofile")
+    assert [os.path.basename(p) for p in paths] == ["run.folded", "lever_Acme_Corp.prof"]
+
+
+def test_unknown_profiler_is_rejected():
+    with pytest.raises(ValueError, match="sampling"):
+        make_profiler("perf")
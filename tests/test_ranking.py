@@ -0,0 +1,30 @@
+import os
+import threading
+
+from db.schemas import Job
+from scraper.pipeline import ranking, storage
+
+
+def test_concurrent_saves_do_not_share_a_temporary_file(db, tmp_path):
+    with storage.get_session() as s:
+        s.add_all(Job(source="lever", source_job_id=str(i), title=f"Data Intern {i}", apply_url=f"https://x.test/{i}",
+                      content_hash=str(i)) for i in range(50))
+    with storage.get_session(write=False) as s:
+        idx = ranking.load_or_build(s, str(tmp_path / "rank.npz"))
+    errors = []
+
+    def save():
+        try:
+            for _ in range(20):
+                idx.save(str(tmp_path / "rank.npz"))
+        except Exception as e:  # pragma: no cover - the failure being tested
+            errors.append(e)
+
+    threads = [threading.Thread(target=save) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert not [f for f in os.listdir(tmp_path) if f.endswith(".tmp.npz")]
+    assert len(ranking.RankingIndex.load(str(tmp_path / "rank.npz"))) == 50
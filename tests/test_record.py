@@ -0,0 +1,13 @@
+import pytest
+
+from scraper.models.record import make_record
+from scraper.settings import settings
+
+
+@pytest.mark.parametrize("validate", [True, False])
+@pytest.mark.parametrize("title, url", [(" ", "https://x.test/1"), ("Intern", ""), ("Intern", "/jobs/1"),
+                                        ("Intern", "mailto:jobs@x.test")])
+def test_make_record_rejects_postings_without_title_or_url(monkeypatch, validate, title, url):
+    monkeypatch.setattr(settings, "VALIDATE_JOBS", validate)
+    with pytest.raises(ValueError):
+        make_record(source="x", title=title, apply_url=url)
@@ -0,0 +1,29 @@
+from datetime import datetime, timedelta, timezone
+
+from db.schemas import ScrapeRun
+from scraper.pipeline import schedule, storage
+
+T0 = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+def _runs(label, *runs):
+    with storage.get_session() as s:
+        for i, (status, duration, kept) in enumerate(runs):
+            s.add(ScrapeRun(label=label, source="lever", started_at=T0 + timedelta(hours=i), duration_s=duration,
+                            status=status, kept=kept, requests=4, http_mode="live"))
+
+
+def test_failing_boards_rank_after_productive_ones_and_new_boards_first(db):
+    _runs("lever:broken", ("error", 30.0, 0), ("error", 40.0, 0))
+    _runs("lever:slow", ("ok", 20.0, 2))
+    _runs("lever:fast", ("ok", 2.0, 4))
+    _runs("lever:queued", ("deferred", 0.0, 0))
+    labels = ["lever:broken", "lever:slow", "lever:new", "lever:fast", "lever:queued"]
+    order = [label for label, _, _ in schedule.plan([(label, None) for label in labels])]
+    assert order == ["lever:new", "lever:queued", "lever:fast", "lever:slow", "lever:broken"]
+
+    with storage.get_session(write=False) as s:
+        broken = schedule.estimates(s)["lever:broken"]
+    assert (broken.runs, broken.kept_per_s, broken.duration_s) == (2, None, 35.0)
+    budget = schedule.RunBudget(seconds=30)
+    assert not budget.admits(broken)  # its 35 s no longer slip through as 0 s
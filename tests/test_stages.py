@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import select
+
+from db.schemas import Job
+from scraper.adapters.base import BaseAdapter
+from scraper.pipeline import orchestrator, probes, stages, storage
+from scraper.pipeline.profiling import CProfileProfiler
+from scraper.settings import settings
+
+
+class Board(BaseAdapter):
+    source_name = "lever"
+
+    def __init__(self, n, company="Acme"):
+        self.n = n
+        self.company = company
+
+    def discover(self):
+        for i in range(self.n):
+            yield self.make_job(source="lever", source_job_id=f"{self.company}-{i}", title=f"Data Intern {i}",
+                                company=self.company, apply_url=f"https://x.test/{self.company}/{i}")
+
+
+@pytest.fixture
+def staged(db, tmp_path, monkeypatch):
+    for key, value in {"ENRICH_DETAILS": False, "PROBE_BOARDS": False, "FACET_INDEX": False,
+                       "ALERTS_ENABLED": False, "PIPELINE_WRITE_BATCH": 100}.items():
+        monkeypatch.setattr(settings, key, value)
+
+
+def test_failed_write_batch_is_retried_per_posting(staged, monkeypatch, capsys):
+    upsert = stages.upsert_job
+
+    def flaky(sess, job):
+        if job.source_job_id == "Acme-2":
+            raise ValueError("bad posting")
+        return upsert(sess, job)
+
+    monkeypatch.setattr(stages, "upsert_job", flaky)
+    seen, _ = stages.run_staged([Board(5)])
+    with storage.get_session() as s:
+        ids = s.execute(select(Job.source_job_id).order_by(Job.source_job_id)).scalars().all()
+    assert ids == ["Acme-0", "Acme-1", "Acme-3", "Acme-4"]
+    assert seen == 5  # counted at discovery
+    assert "not written=1" in capsys.readouterr().out
+
+
+def test_failed_batch_in_any_stage_counts_against_its_board(staged, monkeypatch, capsys):
+    classify = orchestrator.classify_job
+
+    def flaky(job):
+        if job.source_job_id == "Acme-1":
+            raise RuntimeError("classifier bug")
+        return classify(job)
+
+    recorded = []
+    monkeypatch.setattr(orchestrator, "classify_job", flaky)
+    monkeypatch.setattr(probes, "record", lambda label, probe: recorded.append(label))
+    stages.run_staged([Board(3), Board(2, company="Beta")])
+    with storage.get_session() as s:
+        ids = s.execute(select(Job.source_job_id).order_by(Job.source_job_id)).scalars().all()
+    assert ids == ["Acme-0", "Acme-2", "Beta-0", "Beta-1"]
+    out = capsys.readouterr().out
+    assert out.count("not written=1") == 1
+    assert len(recorded) == 1 and "Beta" in recorded[0]  # Acme is fetched in full again next run
+
+
+def test_cprofile_is_rejected(staged):
+    with pytest.raises(ValueError):
+        stages.run_staged([Board(1)], profiler=CProfileProfiler())
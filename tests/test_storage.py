@@ -0,0 +1,60 @@
+import threading
+
+from dataclasses import replace
+
+from sqlalchemy import event, func, select
+
+from db.schemas import Job, JobProfile
+from scraper.models.record import make_record
+from scraper.pipeline import storage
+
+
+def test_read_sessions_do_not_wait_for_the_write_lock(db):
+    writing, release = threading.Event(), threading.Event()
+
+    def writer():
+        with storage.get_session() as s:
+            s.add(Job(source="x", source_job_id="1", title="Intern", apply_url="https://x.test/1"))
+            writing.set()
+            release.wait(5)
+
+    t = threading.Thread(target=writer)
+    t.start()
+    try:
+        assert writing.wait(5)
+        done = threading.Event()
+
+        def reader():
+            with storage.get_session(write=False) as s:
+                s.execute(select(func.count(Job.id))).scalar_one()
+            done.set()
+
+        threading.Thread(target=reader, daemon=True).start()
+        assert done.wait(2), "read-only session queued behind the writer"
+    finally:
+        release.set()
+        t.join()
+
+
+def test_profile_memberships_are_only_read_and_written_when_they_change(db):
+    job = make_record(source="lever", source_job_id="1", title="Data Intern", apply_url="https://x.test/1")
+    with storage.get_session() as s:
+        storage.upsert_job(s, replace(job, profiles=("default", "paris")))
+    statements = []
+
+    def log(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db, "before_cursor_execute", log)
+    try:
+        with storage.get_session() as s:
+            storage.upsert_job(s, replace(job, profiles=("paris", "default")))
+    finally:
+        event.remove(db, "before_cursor_execute", log)
+    assert not any("job_profiles" in sql for sql in statements)
+
+    with storage.get_session() as s:
+        storage.upsert_job(s, replace(job, profiles=("default",)))
+    with storage.get_session() as s:
+        assert s.execute(select(JobProfile.profile)).scalars().all() == ["default"]
+        assert s.execute(select(Job.profiles)).scalar_one() == "default"
@@ -0,0 +1,63 @@
+import os
+
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from db.schemas import Job
+from scraper.pipeline import facets, ranking, storage
+from scraper.settings import settings
+
+HOME = os.path.join(os.path.dirname(__file__), "..", "apps", "streamlit_app", "Home.py")
+
+
+@pytest.fixture
+def app(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "RANK_INDEX_PATH", str(tmp_path / "rank.npz"))
+    monkeypatch.setattr(settings, "FACET_INDEX_PATH", str(tmp_path / "facets.bin"))
+    with storage.get_session() as s:
+        s.add(Job(source="lever", source_job_id="1", title="Data Intern", apply_url="https://x.test/1"))
+    st.cache_resource.clear()
+    yield AppTest.from_file(HOME, default_timeout=30)
+    st.cache_resource.clear()
+
+
+def _relevance(at):
+    at.run()
+    at.sidebar.selectbox[0].set_value("Relevance").run()
+    return at.sidebar.text_area[0].set_value("python data").run()
+
+
+def test_relevance_sort(app):
+    at = _relevance(app)
+    assert not at.exception and not at.warning
+    assert any("Relevance" in c.value for c in at.caption)
+
+
+def test_relevance_sort_without_numpy_warns(app, monkeypatch):
+    monkeypatch.setattr(ranking, "np", None)
+    at = _relevance(app)
+    assert not at.exception
+    assert "numpy and scipy" in at.warning[0].value
+
+
+def test_app_only_opens_the_facet_index(app):
+    at = app.run()
+    assert not at.exception
+    assert "build_facet_index.py" in at.sidebar.info[0].value
+    assert not os.path.exists(settings.FACET_INDEX_PATH)  # rebuilding is left to the scraper and the script
+
+
+def test_tag_filter_keeps_postings_newer_than_the_facet_index(app):
+    with storage.get_session() as s:
+        s.query(Job).update({"tags": "python"})
+    facets.refresh()
+    with storage.get_session() as s:  # stored after the index was refreshed
+        s.add(Job(source="lever", source_job_id="2", title="ML Intern", apply_url="https://x.test/2", tags="python,ml"))
+    at = app.run()
+    assert not at.exception and not at.sidebar.info
+    tags = next(m for m in at.sidebar.multiselect if m.label == "Tags (any of)")
+    assert tags.options == ["python (2)", "ml (1)"]
+    at = tags.set_value(["ml"]).run()
+    assert not at.exception
+    assert at.caption[0].value == "1 results"
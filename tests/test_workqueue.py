@@ -0,0 +1,91 @@
+from datetime import timedelta
+
+from sqlalchemy import select, update
+
+from db.schemas import ScrapeTask
+from scraper.pipeline import storage, workqueue
+from scraper.settings import settings
+
+SOURCES = [{"type": "greenhouse", "slug": "a", "company": "A"}, {"type": "lever", "slug": "b", "company": "B"}]
+
+
+def _task(task_id):
+    with storage.get_session() as s:
+        return s.get(ScrapeTask, task_id)
+
+
+def _expire(task_id):
+    with storage.get_session() as s:
+        s.execute(update(ScrapeTask).where(ScrapeTask.id == task_id)
+                  .values(lease_expires_at=workqueue._utcnow() - timedelta(seconds=1)))
+
+
+def test_claim_leases_oldest_task_once(db):
+    workqueue.enqueue_sources(SOURCES, batch_id="b1")
+    first = workqueue.claim_task("w1", lease_seconds=60)
+    second = workqueue.claim_task("w2", lease_seconds=60)
+    assert first["label"] == "greenhouse:A" and first["attempts"] == 1
+    assert second["label"] == "lever:B"
+    assert workqueue.claim_task("w3", lease_seconds=60) is None
+    assert _task(first["id"]).worker_id == "w1"
+
+
+def test_expired_lease_is_claimed_again(db):
+    workqueue.enqueue_sources(SOURCES[:1], batch_id="b1")
+    task = workqueue.claim_task("w1", lease_seconds=60)
+    assert workqueue.claim_task("w2", lease_seconds=60) is None
+    _expire(task["id"])
+    again = workqueue.claim_task("w2", lease_seconds=60)
+    assert again["id"] == task["id"] and again["attempts"] == 2
+    assert not workqueue.renew_lease(task["id"], "w1")  # w1 lost it
+    assert workqueue.renew_lease(task["id"], "w2")
+
+
+def test_failed_task_is_retried_then_parked(db, monkeypatch):
+    monkeypatch.setattr(settings, "QUEUE_MAX_ATTEMPTS", 2)
+    workqueue.enqueue_sources(SOURCES[:1], batch_id="b1")
+    task = workqueue.claim_task("w1", lease_seconds=60)
+    workqueue.fail_task(task["id"], "w1", "boom")
+    assert _task(task["id"]).status == "pending"
+    task = workqueue.claim_task("w1", lease_seconds=60)
+    workqueue.fail_task(task["id"], "w1", "boom again")
+    row = _task(task["id"])
+    assert (row.status, row.attempts, row.last_error) == ("failed", 2, "boom again")
+    assert workqueue.claim_task("w1", lease_seconds=60) is None
+
+
+def test_expired_lease_on_last_attempt_is_failed(db, monkeypatch):
+    monkeypatch.setattr(settings, "QUEUE_MAX_ATTEMPTS", 1)
+    workqueue.enqueue_sources(SOURCES[:1], batch_id="b1")
+    task = workqueue.claim_task("w1", lease_seconds=60)
+    _expire(task["id"])  # the worker died on its only attempt
+    assert workqueue.claim_task("w2", lease_seconds=60) is None
+    row = _task(task["id"])
+    assert row.status == "failed" and row.finished_at is not None
+    counts = workqueue.progress("b1")["counts"]
+    assert counts == {"failed": 1}
+
+
+def test_complete_task_records_counts(db):
+    workqueue.enqueue_sources(SOURCES[:1], batch_id="b1")
+    task = workqueue.claim_task("w1", lease_seconds=60)
+    workqueue.complete_task(task["id"], "w1", seen=5, kept=2)
+    with storage.get_session() as s:
+        row = s.execute(select(ScrapeTask)).scalar_one()
+    assert (row.status, row.seen, row.kept, row.lease_expires_at) == ("done", 5, 2, None)
+
+
+def test_worker_delivers_alerts_and_refreshes_facets_once_drained(db, monkeypatch, capsys):
+    from scraper.pipeline import alerts, facets, orchestrator
+
+    calls = []
+    monkeypatch.setattr(orchestrator, "build_adapter", lambda config: None)
+    monkeypatch.setattr(alerts, "deliver", lambda: calls.append("deliver") or "[alerts] 1 new matches")
+    monkeypatch.setattr(facets, "refresh", lambda: calls.append("facets"))
+    assert workqueue.run_worker("w1") == 0
+    assert calls == []  # nothing processed, nothing to deliver
+
+    workqueue.enqueue_sources(SOURCES, batch_id="b1")
+    assert workqueue.run_worker("w1") == 2
+    assert calls == ["deliver", "facets"]
+    assert "[alerts] 1 new matches" in capsys.readouterr().out